@@ -0,0 +1,206 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for the packed archive of the game's
+pictures. Building the archive packs the pictures of each folder into one
+atlas, with an index of where each picture is. The game maps the archive
+into memory and cuts each picture out of its atlas, instead of opening and
+decoding every file. Pictures missing from the archive are still loaded
+from their own files, as are pictures with their own alpha channel, which
+the atlases do not keep.
+Usage: python archive.py [--workers N] [--pictures DIR] [--output FILE] [--index FILE] [--check]
+"""
+import os, sys, json, mmap, argparse, pygame
+from concurrent.futures import ProcessPoolExecutor
+
+# Files the archive and its index are kept in
+ARCHIVE = "./data/assets.pack"
+INDEX = "./data/assets.json"
+
+# Folder the pictures are read from, and the kinds of files packed
+PICTURES = "./pictures"
+EXTENSIONS = (".gif", ".jpg", ".png", ".bmp")
+
+# Version of the archive's layout, raised when it changes
+VERSION = 1
+
+# Narrowest atlas, so small pictures are packed into rows
+ATLAS_WIDTH = 1024
+
+def normalize(image):
+    """This function takes the pathname of a picture as a parameter, and
+    returns the name it is kept under in the index."""
+    return os.path.relpath(image).replace(os.sep, "/")
+
+def find_groups(pictures = PICTURES):
+    """This function takes the pictures folder as a parameter, and returns a
+    sorted list of pairs of a folder and the pictures in it. Each folder's
+    pictures are packed into one atlas."""
+    groups = []
+    for folder, names, files in os.walk(pictures):
+        names.sort()
+        images = [normalize(os.path.join(folder, name)) for name in sorted(files) \
+                  if name.lower().endswith(EXTENSIONS)]
+        if images:
+            groups.append((normalize(folder), images))
+    return groups
+
+def pack_atlas(images):
+    """This function takes a list of pathnames as a parameter. It decodes the
+    pictures, packs them into rows of an atlas from tallest to shortest, and
+    returns the atlas's width, height and RGB pixels with a list of each
+    picture's name, rectangle and colorkey. Pictures with their own alpha
+    channel are left out. It is run by the build's worker processes."""
+    surfaces = []
+    for image in images:
+        surface = pygame.image.load(image)
+        if not surface.get_flags() & pygame.SRCALPHA:
+            surfaces.append((image, surface))
+    width = max([ATLAS_WIDTH] + [surface.get_width() for image, surface in surfaces])
+    surfaces.sort(key = lambda pair: (-pair[1].get_height(), pair[0]))
+
+    # Lay the pictures out in rows, starting a new row when one is full
+    places = []
+    x = y = row = 0
+    for image, surface in surfaces:
+        if x + surface.get_width() > width:
+            x = 0
+            y += row
+            row = 0
+        places.append((image, surface, x, y))
+        x += surface.get_width()
+        row = max(row, surface.get_height())
+    height = y + row
+
+    atlas = pygame.Surface((width, height), 0, 24)
+    entries = []
+    for image, surface, x, y in places:
+        # Copy the colorkey's pixels too, so the picture is still see-through
+        # when the colorkey is set on it again
+        colorkey = surface.get_colorkey()
+        surface.set_colorkey(None)
+        atlas.blit(surface, (x, y))
+        if colorkey is not None:
+            colorkey = list(colorkey[:3])
+        entries.append((image, [x, y, surface.get_width(), surface.get_height()], colorkey))
+    return width, height, pygame.image.tostring(atlas, "RGB"), entries
+
+def build(pictures = PICTURES, output = ARCHIVE, index = INDEX, workers = None):
+    """This function takes the pictures folder, the archive and index files
+    and the number of worker processes, which defaults to one for each
+    processor, as parameters. It packs each folder of pictures into an atlas
+    on its own process, writes the atlases to the archive and their
+    rectangles to the index, and returns the index."""
+    groups = find_groups(pictures)
+    with ProcessPoolExecutor(workers) as pool:
+        atlases = list(pool.map(pack_atlas, [images for folder, images in groups]))
+
+    contents = {"version": VERSION, "atlases": [], "images": {}}
+    offset = 0
+    with open(output, "wb") as archive_file:
+        for number in range(len(atlases)):
+            width, height, pixels, entries = atlases[number]
+            archive_file.write(pixels)
+            contents["atlases"].append({"folder": groups[number][0], "offset": offset, \
+                                        "width": width, "height": height})
+            offset += len(pixels)
+            for image, rect, colorkey in entries:
+                contents["images"][image] = [number, rect, colorkey]
+    contents["size"] = offset
+    with open(index, "w") as index_file:
+        json.dump(contents, index_file, indent = 1, sort_keys = True)
+    return contents
+
+class Archive(object):
+    """This class defines an archive of pictures mapped into memory. Each
+    atlas is converted the first time one of its pictures is used, and each
+    picture is a subsurface of its atlas."""
+    def __init__(self, filename = ARCHIVE, index = INDEX):
+        """This initializer takes the archive and index files as parameters.
+        It reads the index and maps the archive into memory, and raises
+        IOError or ValueError if either is missing or they do not match."""
+        with open(index) as index_file:
+            self.__index = json.load(index_file)
+        if self.__index.get("version") != VERSION:
+            raise ValueError("%s is not a version %i index" % (index, VERSION))
+        with open(filename, "rb") as archive_file:
+            self.__map = mmap.mmap(archive_file.fileno(), 0, access = mmap.ACCESS_READ)
+        if len(self.__map) != self.__index["size"]:
+            self.__map.close()
+            raise ValueError("%s does not match %s" % (filename, index))
+        self.__atlases = {}
+
+    def __contains__(self, image):
+        """This method accepts the pathname of a picture as a parameter, and
+        returns whether it is in the archive."""
+        return normalize(image) in self.__index["images"]
+
+    def get_images(self):
+        """This method accepts no parameters, and returns a sorted list of the
+        pathnames of the pictures in the archive."""
+        return sorted(self.__index["images"])
+
+    def load(self, image):
+        """This method accepts the pathname of a picture as a parameter. It
+        returns the converted picture cut out of its atlas, or None if the
+        picture is not in the archive."""
+        entry = self.__index["images"].get(normalize(image))
+        if entry is None:
+            return None
+        number, rect, colorkey = entry
+        surface = self.__get_atlas(number).subsurface(rect)
+        if colorkey is not None:
+            surface.set_colorkey(colorkey)
+        return surface
+
+    def __get_atlas(self, number):
+        """This method accepts the number of an atlas as a parameter, and
+        returns the atlas converted for the screen."""
+        atlas = self.__atlases.get(number)
+        if atlas is None:
+            place = self.__index["atlases"][number]
+            size = place["width"] * place["height"] * 3
+            pixels = memoryview(self.__map)[place["offset"]:place["offset"] + size]
+            atlas = pygame.image.frombuffer(pixels, (place["width"], place["height"]), "RGB").convert()
+            self.__atlases[number] = atlas
+        return atlas
+
+def check(filename = ARCHIVE, index = INDEX):
+    """This function takes the archive and index files as parameters. It
+    cuts every picture out of the archive and loads it from its own file the
+    way the game does without the archive, and returns a list of the
+    pictures whose size, colorkey or pixels are not the same. It must be
+    called after the screen is made."""
+    pictures = Archive(filename, index)
+    different = []
+    for image in pictures.get_images():
+        packed = pictures.load(image)
+        loose = pygame.image.load(image).convert()
+        if packed.get_size() != loose.get_size() or packed.get_colorkey() != loose.get_colorkey() or \
+           pygame.image.tostring(packed, "RGB") != pygame.image.tostring(loose, "RGB"):
+            different.append(image)
+    return different
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Pack the Land Raider pictures into an archive")
+    parser.add_argument("--workers", type = int, help = "worker processes, one for each processor by default")
+    parser.add_argument("--pictures", default = PICTURES, help = "folder of pictures to pack")
+    parser.add_argument("--output", default = ARCHIVE, help = "archive file to write")
+    parser.add_argument("--index", default = INDEX, help = "index file to write")
+    parser.add_argument("--check", action = "store_true", \
+                        help = "check that every picture in the archive matches its own file")
+    args = parser.parse_args()
+    if args.check:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+        different = check(args.output, args.index)
+        for image in different:
+            print("%s does not match its own file" % image)
+        print("%i pictures do not match" % len(different))
+        if different:
+            sys.exit(1)
+    else:
+        contents = build(args.pictures, args.output, args.index, args.workers)
+        print("%i pictures in %i atlases, %i bytes" % (len(contents["images"]), len(contents["atlases"]), \
+                                                       contents["size"]))
@@ -0,0 +1,327 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for caching the game's images. Each image
+is loaded from disk, converted and colorkeyed once, and the same surface is
+shared by every sprite that uses it. Explosion animations are decoded once
+into tuples of frames, rotated images are kept in lookup tables, and text
+is rendered once and reused.
+"""
+import pygame, math, archive
+from collections import OrderedDict
+
+# Number of frames in each explosion animation
+CLIPS = {"death": 16, "player": 15, "drop": 23, "bomb": 21, "bullet": 5, "end": 5}
+
+# Default angle between the rotated copies of an image, in degrees
+ROTATION_STEP = 1
+
+# Colorkeys used by the game's pictures
+MAGENTA = (255, 0, 255)
+WHITE = (255, 255, 255)
+
+class ImageCache(object):
+    """This class defines a shared cache for converted images and the
+    variants made from them. Entries are kept in least recently used order
+    and the oldest ones are dropped once the cache is over its memory limit."""
+    def __init__(self, limit = 32 * 1024 * 1024):
+        """This initializer takes the memory limit in bytes as a parameter.
+        Initializes the cache and its hit, miss and eviction counters."""
+        self.__surfaces = OrderedDict()
+        self.__sizes = {}
+        self.__bytes = 0
+        self.__limit = limit
+
+        # Counters used to check how often the disk is touched
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load(self, image, colorkey = None):
+        """This method accepts an image name and an optional colorkey as
+        parameters. It returns the converted surface for the image, loading
+        it from disk only if it is not cached."""
+        return self.get((image, colorkey), lambda: self.__load(image, colorkey))
+
+    def flipped(self, image, colorkey = None, xflip = True, yflip = False):
+        """This method accepts an image name, an optional colorkey and which
+        axes to flip as parameters. It returns the cached flipped copy of the
+        image."""
+        return self.get((image, colorkey, "flip", xflip, yflip), lambda: \
+                        pygame.transform.flip(self.load(image, colorkey), xflip, yflip))
+
+    def wrapped(self, image, width, colorkey = None):
+        """This method accepts an image name, a width and an optional colorkey
+        as parameters. It returns the cached copy of the image followed by
+        its start, so any part of the given width can be cut out in one piece
+        while the image wraps around."""
+        return self.get((image, colorkey, "wrap", width), lambda: \
+                        self.__wrap(self.load(image, colorkey), width))
+
+    def get(self, key, create):
+        """This method accepts a key and a function that builds the surface
+        as parameters. It returns the cached surface for the key, calling the
+        function and storing its result if the key is missing."""
+        surface = self.__surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.__surfaces.move_to_end(key)
+            return surface
+
+        # Build the surface and store it as the newest entry
+        self.misses += 1
+        surface = create()
+        self.__surfaces[key] = surface
+        # Pictures cut out of an atlas share its pitch, so the pitch is not used
+        self.__sizes[key] = surface.get_width() * surface.get_bytesize() * surface.get_height()
+        self.__bytes += self.__sizes[key]
+
+        # Drop the oldest entries until the cache is back under its limit
+        while self.__bytes > self.__limit and len(self.__surfaces) > 1:
+            old_key, old_surface = self.__surfaces.popitem(last = False)
+            self.__bytes -= self.__sizes.pop(old_key)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        """This method accepts no parameters, and empties the cache."""
+        self.__surfaces.clear()
+        self.__sizes.clear()
+        self.__bytes = 0
+
+    def set_limit(self, limit):
+        """This method accepts the memory limit in bytes as a parameter and
+        stores it. Entries over the new limit are dropped on the next miss."""
+        self.__limit = limit
+
+    def get_stats(self):
+        """This method accepts no parameters, and returns a dictionary of the
+        cache's counters and memory use."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, \
+                "entries": len(self.__surfaces), "bytes": self.__bytes, "limit": self.__limit}
+
+    def __wrap(self, surface, width):
+        """This method accepts a surface and a width as parameters. It returns
+        a copy of the surface that repeats it for the given width past its
+        end."""
+        size = surface.get_width()
+        strip = pygame.Surface((size + width, surface.get_height()), 0, surface)
+        colorkey = surface.get_colorkey()
+        if colorkey is not None:
+            strip.fill(colorkey)
+            strip.set_colorkey(colorkey)
+        for x in range(0, size + width, size):
+            strip.blit(surface, (x, 0))
+        return strip
+
+    def __load(self, image, colorkey):
+        """This method accepts an image name and colorkey as parameters. It
+        loads, converts and colorkeys the image and returns it."""
+        surface = load_picture(image)
+        if colorkey is not None:
+            surface.set_colorkey(colorkey)
+        return surface
+
+# The packed archive of pictures, opened by open_archive()
+pictures = None
+
+def open_archive(filename = archive.ARCHIVE, index = archive.INDEX):
+    """This function takes the archive and index files as parameters. It
+    opens the archive, so pictures are cut out of it instead of loaded from
+    their own files, and returns whether it could be opened. It must be
+    called after the screen is made."""
+    global pictures
+    try:
+        pictures = archive.Archive(filename, index)
+    except (IOError, OSError, ValueError):
+        pictures = None
+    return pictures is not None
+
+def load_picture(image):
+    """This function takes the pathname of a picture as a parameter, and
+    returns it converted for the screen, from the archive if it is there and
+    from its own file if it is not."""
+    if pictures is not None:
+        surface = pictures.load(image)
+        if surface is not None:
+            return surface
+    return pygame.image.load(image).convert()
+
+# The cache shared by every sprite
+images = ImageCache()
+
+# The explosion animations, decoded once and shared by every explosion
+clips = {}
+
+def load_clip(image, number):
+    """This function takes the pathname of an explosion animation and its
+    number of frames as parameters. It returns the animation's frames as a
+    tuple, decoding them only the first time the animation is used."""
+    key = (image, number)
+    if key not in clips:
+        clips[key] = tuple([load_picture("./pictures/explosion/" + image + str(frame) + ".gif") \
+                            for frame in range(1, max(number, 2))])
+    return clips[key]
+
+def preload_clips():
+    """This function takes no parameters. It decodes every explosion
+    animation so the first explosion of each kind does not stall a frame."""
+    for name in CLIPS:
+        load_clip(name + "/explosion", CLIPS[name])
+
+class RotationTable(object):
+    """This class defines a lookup table of rotated copies of an image. The
+    angle is rounded to the table's step, and each copy is made the first
+    time it is asked for."""
+    def __init__(self, surface, step = ROTATION_STEP):
+        """This initializer takes a surface and the angle step in degrees as
+        parameters. Initializes the empty table."""
+        self.__surface = surface
+        self.__count = max(1, int(round(360.0 / step)))
+        self.__step = 360.0 / self.__count
+        self.__frames = [None] * self.__count
+
+        # The cosine and sine of the edge half a step below each step, so the
+        # nearest step can be found without inverse trig
+        self.__edges = [(math.cos(math.radians((index - 0.5) * self.__step)), \
+                         math.sin(math.radians((index - 0.5) * self.__step))) for index in range(self.__count)]
+
+    def get(self, angle):
+        """This method accepts an angle as a parameter, and returns the copy
+        of the image rotated to the nearest step."""
+        index = int(round(angle / self.__step)) % self.__count
+        frame = self.__frames[index]
+        if frame is None:
+            frame = pygame.transform.rotate(self.__surface, index * self.__step)
+            self.__frames[index] = frame
+        return frame
+
+    def find_index(self, dx, dy):
+        """This method accepts the x and y parts of a direction, with y
+        pointing up, as parameters. It returns the index of the step nearest
+        the direction's angle."""
+        return int(round(math.degrees(math.atan2(dy, dx)) / self.__step)) % self.__count
+
+    def find_nearest(self, dx, dy, index):
+        """This method accepts the x and y parts of a direction, with y
+        pointing up, and the index of the step it was nearest before as
+        parameters. It returns the index of the step nearest the direction.
+        The steps are checked with products against their edges, starting
+        with the step it was nearest and working outward on both sides, so a
+        direction that turned a little is found in one or two checks and the
+        angle is never worked out. A direction of no length keeps its step."""
+        count = self.__count
+        edges = self.__edges
+        for distance in range(count // 2 + 1):
+            for near in ((index - distance) % count, (index + distance) % count):
+                low = edges[near]
+                high = edges[(near + 1) % count]
+                if low[0] * dy - low[1] * dx >= 0 and dx * high[1] - dy * high[0] > 0:
+                    return near
+        return index
+
+    def get_edges(self, index):
+        """This method accepts the index of a step as a parameter, and returns
+        the cosine and sine of its lower and upper edges."""
+        return self.__edges[index], self.__edges[(index + 1) % self.__count]
+
+    def get_frame(self, index):
+        """This method accepts the index of a step as a parameter, and returns
+        the copy of the image rotated to that step."""
+        return self.get(index * self.__step)
+
+    def get_rect(self, angle, center):
+        """This method accepts an angle and a center point as parameters, and
+        returns the rect of the rotated image centered on the point."""
+        rect = self.get(angle).get_rect()
+        rect.center = center
+        return rect
+
+    def fill(self):
+        """This method accepts no parameters, and makes every copy in the
+        table ahead of time."""
+        for index in range(self.__count):
+            self.get(index * self.__step)
+
+    def get_step(self):
+        """This method accepts no parameters, and returns the angle step."""
+        return self.__step
+
+    def get_memory(self):
+        """This method accepts no parameters, and returns the number of steps,
+        the number of copies made and the bytes they use."""
+        frames = [frame for frame in self.__frames if frame is not None]
+        return self.__count, len(frames), sum([frame.get_pitch() * frame.get_height() for frame in frames])
+
+# The rotation tables, one for each image, colorkey and step
+rotations = {}
+
+def load_rotations(image, colorkey = None, step = None):
+    """This function takes an image name, an optional colorkey and angle step
+    as parameters. It returns the shared rotation table for the image."""
+    if step is None:
+        step = ROTATION_STEP
+    key = (image, colorkey, step)
+    if key not in rotations:
+        rotations[key] = RotationTable(images.load(image, colorkey), step)
+    return rotations[key]
+
+def rotation_report():
+    """This function takes no parameters. It returns a list with the image,
+    step, number of steps, copies made and bytes used for each table."""
+    report = []
+    for (image, colorkey, step), table in sorted(rotations.items(), key = lambda item: item[0][0]):
+        count, filled, used = table.get_memory()
+        report.append({"image": image, "step": table.get_step(), "steps": count, \
+                       "filled": filled, "bytes": used})
+    return report
+
+class TextCache(object):
+    """This class defines a cache of rendered text for one font."""
+    def __init__(self, font):
+        """This initializer takes a font as a parameter, and initializes the
+        empty cache."""
+        self.__font = font
+        self.__surfaces = {}
+
+    def render(self, text, color):
+        """This method accepts a string and color as parameters, and returns
+        the rendered text, rendering it only the first time it is used."""
+        key = (text, color)
+        if key not in self.__surfaces:
+            self.__surfaces[key] = self.__font.render(text, 1, color)
+        return self.__surfaces[key]
+
+class GlyphAtlas(object):
+    """This class defines an atlas of fixed width characters, used to draw
+    numbers that change often without rendering them with the font."""
+    def __init__(self, font, color, characters = "0123456789-"):
+        """This initializer takes a font, a color and the characters to put in
+        the atlas as parameters. Renders every character once into its own
+        cell of the atlas."""
+        glyphs = [font.render(character, 1, color) for character in characters]
+        self.__width = max([glyph.get_width() for glyph in glyphs])
+        self.__height = max([glyph.get_height() for glyph in glyphs])
+        self.__surface = pygame.Surface((self.__width * len(glyphs), self.__height), pygame.SRCALPHA)
+        self.__cells = {}
+        for index in range(len(glyphs)):
+            cell = pygame.Rect(index * self.__width, 0, self.__width, self.__height)
+            # Copy the glyph into the empty cell without blending it
+            self.__surface.blit(glyphs[index], (cell.centerx - glyphs[index].get_width() // 2, 0), \
+                                None, pygame.BLEND_RGBA_MAX)
+            self.__cells[characters[index]] = cell
+
+    def get_size(self, text):
+        """This method accepts a string as a parameter, and returns the width
+        and height it takes up when drawn."""
+        return self.__width * len(text), self.__height
+
+    def render_to(self, surface, text, position):
+        """This method accepts a surface, a string and a position as
+        parameters. It draws the string onto the surface one cell at a time
+        and returns the rect it covers."""
+        x, y = position
+        for character in text:
+            surface.blit(self.__surface, (x, y), self.__cells[character])
+            x += self.__width
+        return pygame.Rect(position, self.get_size(text))
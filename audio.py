@@ -0,0 +1,110 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for the game's sound effects. Each kind of
+sound gets its own few mixer channels, so a burst of shots or explosions
+cannot take every channel. A sound played again too soon is dropped, and a
+sound with nowhere to play takes the channel of a less important one, so
+the player's death is always heard.
+"""
+import pygame, runtime
+
+# Priorities of sounds, from least to most important. Sounds that must
+# always play are still played while the other sound effects are off.
+LOW, NORMAL, HIGH, ALWAYS = range(4)
+
+class SoundManager(object):
+    """This class defines the manager that plays the game's sound effects on
+    the channels reserved for their categories, and counts the plays it
+    drops."""
+    def __init__(self, categories):
+        """This initializer takes a list of pairs of a category name and its
+        number of channels as a parameter. Reserves the channels, so nothing
+        else plays over them."""
+        total = sum([count for name, count in categories])
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        self.__channels = {}
+        first = 0
+        for name, count in categories:
+            self.__channels[name] = [pygame.mixer.Channel(first + i) for i in range(count)]
+            first += count
+
+        # The priority and start time of the sound on each channel
+        self.__playing = {}
+        self.__sounds = {}
+        self.__last = {}
+        self.__enabled = True
+
+        # Counters of the plays made and of the plays dropped for each reason
+        self.counts = {"played": 0, "stolen": 0, "rate limited": 0, "no channel": 0, "muted": 0}
+
+    def add(self, name, sound, category, priority = NORMAL, interval = 0):
+        """This method accepts a name, a mixer sound, the category it plays
+        in, its priority and the fewest milliseconds between two of its plays
+        as parameters, and stores the sound under the name."""
+        self.__sounds[name] = (sound, category, priority, interval)
+        self.__last[name] = None
+
+    def set_enabled(self, enabled):
+        """This method accepts whether to play sound effects as a parameter.
+        While they are off only sounds that must always play are played."""
+        self.__enabled = enabled
+
+    def get_dropped(self):
+        """This method accepts no parameters, and returns the number of plays
+        dropped for any reason."""
+        return self.counts["rate limited"] + self.counts["no channel"] + self.counts["muted"]
+
+    def play(self, name):
+        """This method accepts the name of a sound as a parameter. It plays the
+        sound on a free channel of its category, or on the channel of the
+        oldest sound that is not more important, and returns whether it was
+        played."""
+        sound, category, priority, interval = self.__sounds[name]
+        if not self.__enabled and priority < ALWAYS:
+            self.counts["muted"] += 1
+            return False
+        now = runtime.get_ticks()
+        last = self.__last[name]
+        if last is not None and now - last < interval:
+            self.counts["rate limited"] += 1
+            return False
+
+        # Take a free channel, or steal the least important and oldest one
+        chosen = None
+        for channel in self.__channels[category]:
+            if not channel.get_busy():
+                chosen = channel
+                break
+            playing = self.__playing.get(channel)
+            if playing is not None and playing[0] <= priority and \
+               (chosen is None or playing < self.__playing[chosen]):
+                chosen = channel
+        if chosen is None:
+            self.counts["no channel"] += 1
+            return False
+        if chosen.get_busy():
+            self.counts["stolen"] += 1
+        chosen.play(sound)
+        self.__playing[chosen] = (priority, now)
+        self.__last[name] = now
+        self.counts["played"] += 1
+        return True
+
+    def reset(self):
+        """This method accepts no parameters. It stops every channel, forgets
+        when each sound was last played and turns sound effects back on, so
+        the manager can be used for a new game."""
+        self.stop()
+        for name in self.__last:
+            self.__last[name] = None
+        self.__playing.clear()
+        self.__enabled = True
+
+    def stop(self):
+        """This method accepts no parameters, and stops every channel."""
+        for channels in self.__channels.values():
+            for channel in channels:
+                channel.stop()
@@ -0,0 +1,315 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for players that play the game by
+themselves. An autopilot is given a snapshot of the game on every tick,
+asks its policy what to do, and hands the game the same keys the keyboard
+would. The time the policy takes to decide is kept apart from the game's
+own timings.
+"""
+import math, time, random, pygame
+import controls
+
+# Where each gun fires from, measured from the centre of the player
+LASER_OFFSET = (11, 6)
+TURRET_OFFSET = (-26, -30)
+
+# Most and fewest degrees the guns can point at
+HIGHEST_ANGLE = 180
+LOWEST_ANGLE = 0
+
+class Snapshot(object):
+    """This class defines what an autopilot can see of the game. It keeps the
+    game's sprites and groups, and only reads their positions when asked,
+    so a policy pays for what it looks at."""
+    def __init__(self, screen, player, gun, turret, stats_keeper, enemies, projectiles):
+        """This initializer takes the screen, the player, the laser gun, the
+        turret, the statskeeper, and the groups of enemies and enemy
+        projectiles as parameters, and stores them."""
+        self.__screen = screen
+        self.__player = player
+        self.__gun = gun
+        self.__turret = turret
+        self.__stats_keeper = stats_keeper
+        self.__enemies = enemies
+        self.__projectiles = projectiles
+        self.__las_gun = True
+        self.__tick = 0
+
+    def update(self, las_gun, tick):
+        """This method accepts whether the laser gun is chosen and the number
+        of the tick as parameters, stores them, and returns the snapshot."""
+        self.__las_gun = las_gun
+        self.__tick = tick
+        return self
+
+    def get_tick(self):
+        """This method accepts no parameters, and returns the number of the
+        tick."""
+        return self.__tick
+
+    def get_size(self):
+        """This method accepts no parameters, and returns the width and height
+        of the screen."""
+        return self.__screen.get_size()
+
+    def get_player(self):
+        """This method accepts no parameters, and returns the x and y
+        coordinates of the centre of the player."""
+        return self.__player.rect.center
+
+    def get_muzzle(self):
+        """This method accepts no parameters, and returns the x and y
+        coordinates the chosen gun fires from."""
+        x, y = self.__player.rect.center
+        if self.__las_gun:
+            return x + LASER_OFFSET[0], y + LASER_OFFSET[1]
+        return x + TURRET_OFFSET[0], y + TURRET_OFFSET[1]
+
+    def get_enemies(self):
+        """This method accepts no parameters, and returns a list of the x and
+        y coordinates of every enemy."""
+        return [enemy.rect.center for enemy in self.__enemies]
+
+    def get_projectiles(self):
+        """This method accepts no parameters, and returns a list of the x and
+        y coordinates of every enemy projectile."""
+        return [projectile.rect.center for projectile in self.__projectiles]
+
+    def get_stats(self):
+        """This method accepts no parameters, and returns a dictionary of the
+        score, distance, health, armour and turret ammo."""
+        keeper = self.__stats_keeper
+        return {"score": keeper.get_score(), "distance": keeper.get_distance(), \
+                "health": keeper.get_health(), "armour": keeper.get_armour(), "turret": keeper.get_turret()}
+
+    def get_angles(self):
+        """This method accepts no parameters, and returns the angles of the
+        laser gun and the turret."""
+        return self.__gun.get_angle(), self.__turret.get_angle()
+
+    def uses_laser(self):
+        """This method accepts no parameters, and returns whether the laser
+        gun is chosen."""
+        return self.__las_gun
+
+class Action(object):
+    """This class defines what a policy decides to do in one tick: the way to
+    move, -1 for left and 1 for right, the way to turn the chosen gun, 1 to
+    raise it and -1 to lower it, whether to fire and whether to switch
+    weapons."""
+    __slots__ = ("move", "aim", "fire", "switch")
+
+    def __init__(self, move = 0, aim = 0, fire = False, switch = False):
+        """This initializer takes the way to move, the way to aim, whether to
+        fire and whether to switch weapons as parameters, and stores them."""
+        self.move = move
+        self.aim = aim
+        self.fire = fire
+        self.switch = switch
+
+    def get_keys(self):
+        """This method accepts no parameters, and returns the keys held down
+        and the keys pressed that do the action."""
+        held = []
+        if self.move < 0:
+            held.append(pygame.K_LEFT)
+        elif self.move > 0:
+            held.append(pygame.K_RIGHT)
+        if self.aim > 0:
+            held.append(pygame.K_a)
+        elif self.aim < 0:
+            held.append(pygame.K_d)
+        if self.fire:
+            held.append(pygame.K_SPACE)
+        pressed = []
+        if self.switch:
+            pressed.append(pygame.K_c)
+        return held, pressed
+
+def find_nearest(x, y, places):
+    """This function takes x and y coordinates and a list of places as
+    parameters, and returns the nearest place, or None if there are none."""
+    nearest = None
+    best = None
+    for place in places:
+        distance = (place[0] - x) ** 2 + (place[1] - y) ** 2
+        if best is None or distance < best:
+            nearest = place
+            best = distance
+    return nearest
+
+class RandomPolicy(object):
+    """This class defines a policy that does random things, keeping each
+    choice for a few ticks like a person would."""
+    def __init__(self, seed = None, hold = 10):
+        """This initializer takes a seed and the ticks to keep each choice
+        for as parameters. The policy has its own random numbers, so the
+        game's are not changed."""
+        self.__rng = random.Random(seed)
+        self.__hold = hold
+        self.__action = Action()
+
+    def decide(self, snapshot):
+        """This method accepts a snapshot of the game as a parameter, and
+        returns the action for this tick."""
+        if snapshot.get_tick() % self.__hold == 0:
+            rng = self.__rng
+            self.__action = Action(rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1)), rng.random() < 0.7, \
+                                   rng.random() < 0.05)
+            return self.__action
+        return Action(self.__action.move, self.__action.aim, self.__action.fire)
+
+class DodgePolicy(object):
+    """This class defines a policy that moves away from the nearest enemy
+    projectile coming down near the player, and back towards the middle of
+    the screen when nothing is close."""
+    def __init__(self, reach = 120, margin = 60):
+        """This initializer takes the distance from the player a projectile
+        must be inside to be dodged, and the closest the player goes to the
+        edges of the screen, as parameters."""
+        self.__reach = reach
+        self.__margin = margin
+
+    def decide(self, snapshot):
+        """This method accepts a snapshot of the game as a parameter, and
+        returns the action for this tick."""
+        return Action(self.get_move(snapshot))
+
+    def get_move(self, snapshot):
+        """This method accepts a snapshot of the game as a parameter, and
+        returns the way to move."""
+        x, y = snapshot.get_player()
+        width = snapshot.get_size()[0]
+        above = [place for place in snapshot.get_projectiles() \
+                 if place[1] < y + 20 and abs(place[0] - x) < self.__reach]
+        nearest = find_nearest(x, y, above)
+        if nearest is not None:
+            move = 1 if nearest[0] <= x else -1
+            # Turn back rather than run into the edge of the screen
+            if (move < 0 and x < self.__margin) or (move > 0 and x > width - self.__margin):
+                move = -move
+            return move
+        if x < width // 2 - self.__reach:
+            return 1
+        if x > width // 2 + self.__reach:
+            return -1
+        return 0
+
+class AimPolicy(object):
+    """This class defines a policy that turns the chosen gun towards the
+    nearest enemy and fires when it points close to it. It uses the turret
+    while it has plenty of ammo, and the laser gun otherwise."""
+    def __init__(self, tolerance = 4, turret_ammo = 100):
+        """This initializer takes the most degrees off the enemy to still
+        fire at it, and the turret ammo needed to switch to the turret, as
+        parameters."""
+        self.__tolerance = tolerance
+        self.__turret_ammo = turret_ammo
+
+    def decide(self, snapshot):
+        """This method accepts a snapshot of the game as a parameter, and
+        returns the action for this tick."""
+        aim, fire = self.get_aim(snapshot)
+        turret = snapshot.get_stats()["turret"]
+        if snapshot.uses_laser():
+            switch = turret >= self.__turret_ammo
+        else:
+            switch = turret < 1
+        return Action(0, aim, fire, switch)
+
+    def get_aim(self, snapshot):
+        """This method accepts a snapshot of the game as a parameter, and
+        returns the way to turn the chosen gun and whether to fire."""
+        x, y = snapshot.get_muzzle()
+        nearest = find_nearest(x, y, [place for place in snapshot.get_enemies() if place[1] < y])
+        if nearest is None:
+            return 0, False
+        target = math.degrees(math.atan2(y - nearest[1], nearest[0] - x))
+        target = max(LOWEST_ANGLE, min(HIGHEST_ANGLE, target))
+        laser, turret = snapshot.get_angles()
+        angle = laser if snapshot.uses_laser() else turret
+        if angle < target - 1:
+            aim = 1
+        elif angle > target + 1:
+            aim = -1
+        else:
+            aim = 0
+        return aim, abs(angle - target) <= self.__tolerance
+
+class PilotPolicy(object):
+    """This class defines a policy that dodges like the dodge policy while it
+    aims and fires like the aim policy."""
+    def __init__(self):
+        """This initializer takes no parameters, and makes the two policies."""
+        self.__dodge = DodgePolicy()
+        self.__aim = AimPolicy()
+
+    def decide(self, snapshot):
+        """This method accepts a snapshot of the game as a parameter, and
+        returns the action for this tick."""
+        action = self.__aim.decide(snapshot)
+        action.move = self.__dodge.get_move(snapshot)
+        return action
+
+# Names of the policies an autopilot can fly with
+POLICIES = {"random": RandomPolicy, "dodge": DodgePolicy, "aim": AimPolicy, "pilot": PilotPolicy}
+
+class Autopilot(object):
+    """This class defines controls that play the game with a policy. The game
+    shows it a snapshot before each tick, and it answers with the keys its
+    policy chose. It keeps the time the policy takes to decide."""
+    def __init__(self, policy, frames = None):
+        """This initializer takes the policy, and the number of ticks to play
+        before telling the game to quit, or None to play until the game
+        ends, as parameters."""
+        self.__policy = policy
+        self.__frames = frames
+        self.__snapshot = None
+        self.__frame = 0
+
+        # The number of decisions and the total and longest seconds they took
+        self.decisions = 0
+        self.decide_time = 0.0
+        self.longest = 0.0
+
+    def observe(self, snapshot):
+        """This method accepts a snapshot of the game as a parameter, and
+        keeps it for the next poll."""
+        self.__snapshot = snapshot
+
+    def poll(self):
+        """This method accepts no parameters. It asks the policy what to do,
+        and returns the keys held down and the events of this tick."""
+        frame = self.__frame
+        self.__frame += 1
+        if self.__snapshot is None or (self.__frames is not None and frame >= self.__frames):
+            return controls.KeyState(), [pygame.event.Event(pygame.QUIT)]
+        start = time.perf_counter()
+        action = self.__policy.decide(self.__snapshot)
+        taken = time.perf_counter() - start
+        self.decisions += 1
+        self.decide_time += taken
+        self.longest = max(self.longest, taken)
+        held, pressed = action.get_keys()
+        return controls.KeyState(held), [pygame.event.Event(pygame.KEYDOWN, key = key) for key in pressed]
+
+    def get_frame(self):
+        """This method accepts no parameters, and returns the number of ticks
+        played so far."""
+        return self.__frame
+
+    def get_average(self):
+        """This method accepts no parameters, and returns the average
+        milliseconds a decision took."""
+        if not self.decisions:
+            return 0.0
+        return self.decide_time * 1000.0 / self.decisions
+
+def make_autopilot(name, frames = None, seed = None):
+    """This function takes the name of a policy, the number of ticks to play
+    and a seed for a random policy as parameters, and returns an autopilot
+    flying with that policy."""
+    if name == "random":
+        return Autopilot(RandomPolicy(seed), frames)
+    return Autopilot(POLICIES[name](), frames)
@@ -0,0 +1,225 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for playing many headless games at once, to
+balance the game and to see how it holds up under load. Every combination
+of the parameters given is played with every seed, spread over a pool of
+worker processes, and the results of each game are written to a file as a
+line of JSON as soon as it finishes.
+Usage: python batch.py [--param NAME=V1,V2 ...] [--grid FILE] [--seeds 1-8] [--frames N]
+                       [--script FILE | --autopilot POLICY] [--render-rate N] [--workers N] [--output FILE]
+"""
+import sys, copy, json, time, argparse, itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import main, sprites, waves, controls, runtime, autopilot
+
+# File the results are written to
+RESULTS = "./batch_results.jsonl"
+
+# Constants of the main module a parameter can set
+CONSTANTS = ("ARMOUR_TIME", "TURRET_TIME", "DISTANCE_TIME")
+
+# What each game in a worker starts from, set by start_worker()
+script = None
+policy = None
+render_rate = main.RENDER_RATE
+defaults = None
+
+def parse_values(text):
+    """This function takes a comma separated list of values as a parameter,
+    and returns the values. Each value is read as JSON, and anything that is
+    not JSON is kept as a string."""
+    values = []
+    for value in text.split(","):
+        try:
+            values.append(json.loads(value))
+        except ValueError:
+            values.append(value)
+    return values
+
+def parse_seeds(text):
+    """This function takes a comma separated list of seeds and ranges of
+    seeds, such as "1-4,9", as a parameter, and returns the list of seeds."""
+    seeds = []
+    for part in text.split(","):
+        first, dash, last = part.partition("-")
+        if dash:
+            seeds.extend(range(int(first), int(last) + 1))
+        else:
+            seeds.append(int(first))
+    return seeds
+
+def make_grid(params, grid_file = None):
+    """This function takes a list of "name=value,value" parameters and the
+    name of a JSON file of parameter names and their lists of values as
+    parameters, and returns a list with a dictionary of parameter values for
+    every combination."""
+    grid = {}
+    if grid_file:
+        with open(grid_file) as grid_handle:
+            grid.update(json.load(grid_handle))
+    for param in params:
+        name, equals, values = param.partition("=")
+        if not equals:
+            raise ValueError("%s is not NAME=VALUE,VALUE" % param)
+        grid[name] = parse_values(values)
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*[grid[name] for name in names])]
+
+def apply(params, settings):
+    """This function takes a dictionary of parameter values and the wave
+    settings as parameters, and sets each value. Names starting with "waves."
+    are a path into the wave settings, such as "waves.caps.jet" or
+    "waves.waves.0.target", names starting with an enemy's name set one of
+    its stats, such as "jet.health", and names starting with "main." set one
+    of the main module's timers."""
+    for name in params:
+        value = params[name]
+        group, dot, path = name.partition(".")
+        if group == "waves":
+            keys = path.split(".")
+            place = settings
+            for key in keys[:-1]:
+                place = place[int(key) if isinstance(place, list) else key]
+            place[int(keys[-1]) if isinstance(place, list) else keys[-1]] = value
+        elif group in waves.ENEMIES and path in sprites.ENEMY_STATS:
+            enemy = waves.ENEMIES[group]
+            stats = list(enemy.STATS)
+            stats[sprites.ENEMY_STATS.index(path)] = value
+            enemy.STATS = tuple(stats)
+        elif group == "main" and path in CONSTANTS:
+            setattr(main, path, value)
+        else:
+            raise ValueError("%s is not a parameter" % name)
+
+def check(params):
+    """This function takes a dictionary of parameter values as a parameter,
+    and raises ValueError if any of them cannot be set, before any game is
+    played."""
+    settings = waves.load()
+    stats = dict([(name, waves.ENEMIES[name].STATS) for name in waves.ENEMIES])
+    constants = dict([(name, getattr(main, name)) for name in CONSTANTS])
+    try:
+        apply(params, settings)
+    except (KeyError, IndexError, TypeError) as error:
+        raise ValueError("cannot set %s: %r" % (" ".join(sorted(params)), error))
+    finally:
+        for name in stats:
+            waves.ENEMIES[name].STATS = stats[name]
+        for name in constants:
+            setattr(main, name, constants[name])
+
+def start_worker(game_script, game_policy, game_render_rate):
+    """This function takes the script of controls, the name of the policy of
+    the autopilot that plays instead of the script and the frames to draw
+    for every 30 ticks as parameters. It is run once in each worker process,
+    and makes the screen, loads the game's resources and keeps the default
+    values every game starts from."""
+    global script, policy, render_rate, defaults
+    script = game_script
+    policy = game_policy
+    render_rate = game_render_rate
+    main.setup(True)
+    main.load_resources().wait()
+    defaults = (waves.load(), dict([(name, waves.ENEMIES[name].STATS) for name in waves.ENEMIES]), \
+                dict([(name, getattr(main, name)) for name in CONSTANTS]))
+
+def play(params, seed):
+    """This function takes a dictionary of parameter values and a seed as
+    parameters. It puts back the default values, sets the parameters and
+    plays one game, and returns the results of the game. It is run by the
+    worker processes."""
+    settings, stats, constants = defaults
+    settings = copy.deepcopy(settings)
+    for name in stats:
+        waves.ENEMIES[name].STATS = stats[name]
+    for name in constants:
+        setattr(main, name, constants[name])
+    apply(params, settings)
+
+    runtime.configure(seed, True)
+    if policy:
+        inputs = autopilot.make_autopilot(policy, len(script), seed)
+    else:
+        inputs = controls.ScriptedInput(script)
+    start = time.perf_counter()
+    outcome = main.game(inputs, False, render_rate, main.MAX_SKIP, None, settings)
+    elapsed = time.perf_counter() - start
+    outcome["params"] = params
+    outcome["seed"] = seed
+    outcome["survival"] = outcome["end_ticks"] / 1000.0
+    outcome["seconds"] = elapsed
+    # The autopilot's time is kept apart from the frames' time
+    if policy:
+        elapsed -= inputs.decide_time
+        outcome["decide_ms"] = inputs.get_average()
+    outcome["frame_ms"] = elapsed * 1000.0 / max(outcome["frames"], 1)
+    return outcome
+
+def run(grid, seeds, game_script, output = RESULTS, workers = None, game_render_rate = main.RENDER_RATE, \
+        game_policy = None):
+    """This function takes the list of parameter combinations, the seeds, the
+    script of controls, the results file, the number of worker processes,
+    which defaults to one for each processor, the frames to draw for every
+    30 ticks and the name of the policy of the autopilot that plays instead
+    of the script as parameters. It plays every combination with every seed
+    and writes each game's results to the file as it finishes. A game that
+    fails is written with its error. It returns the number of games played
+    and the number that failed."""
+    for params in grid:
+        check(params)
+    played = failed = 0
+    with open(output, "w") as results_file:
+        with ProcessPoolExecutor(workers, initializer = start_worker, \
+                                 initargs = (game_script, game_policy, game_render_rate)) as pool:
+            futures = {}
+            for params in grid:
+                for seed in seeds:
+                    futures[pool.submit(play, params, seed)] = (params, seed)
+            for future in as_completed(futures):
+                try:
+                    outcome = future.result()
+                except Exception as error:
+                    params, seed = futures[future]
+                    outcome = {"params": params, "seed": seed, "error": repr(error)}
+                    failed += 1
+                played += 1
+                results_file.write(json.dumps(outcome, sort_keys = True) + "\n")
+                results_file.flush()
+    return played, failed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Play many headless games of Land Raider at once")
+    parser.add_argument("--param", action = "append", default = [], \
+                        help = "a parameter and its values, such as jet.health=10,20 or waves.total=20,30")
+    parser.add_argument("--grid", help = "JSON file of parameter names and their lists of values")
+    parser.add_argument("--seeds", default = "1-8", help = "seeds to play each combination with, such as 1-4,9")
+    parser.add_argument("--frames", type = int, default = 3000, \
+                        help = "frames to play in each game without a script")
+    parser.add_argument("--script", help = "file of controls for every game")
+    parser.add_argument("--autopilot", choices = sorted(autopilot.POLICIES), \
+                        help = "policy that plays every game instead of a script, for --frames ticks")
+    parser.add_argument("--render-rate", type = int, default = main.RENDER_RATE, \
+                        help = "frames drawn each second, 0 to draw nothing")
+    parser.add_argument("--workers", type = int, help = "worker processes, one for each processor by default")
+    parser.add_argument("--output", default = RESULTS, help = "file to write the results to")
+    args = parser.parse_args()
+    try:
+        grid = make_grid(args.param, args.grid)
+        seeds = parse_seeds(args.seeds)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.script:
+        game_script = controls.load_script(args.script)
+    else:
+        game_script = controls.idle_script(args.frames)
+    start = time.perf_counter()
+    try:
+        played, failed = run(grid, seeds, game_script, args.output, args.workers, args.render_rate, \
+                             args.autopilot)
+    except ValueError as error:
+        parser.error(str(error))
+    elapsed = time.perf_counter() - start
+    print("%i games in %.1f seconds, %.2f games per second, %i failed" % (played, elapsed, played / elapsed, failed))
+    if failed:
+        sys.exit(1)
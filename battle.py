@@ -0,0 +1,120 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for the fighting in each tick of the game.
+Enemies shoot, the player's bullets hit enemies and projectiles, projectiles
+hit the player and the ground, and every sprite is moved. The game and the
+scenario benchmarks both run their ticks through it, so a benchmark does the
+same work as a game.
+"""
+import sprites, runtime, collision
+
+class Battle(object):
+    """This class defines the fighting between the player and the enemies. It
+    keeps the groups the sprites of a game are in, and the collision grids
+    used to find their collisions without testing every pair."""
+    def __init__(self, player, player_group, stats_keeper, player_bullets, enemy_projectiles, enemies, \
+                 explosions, sounds = None):
+        """This initializer takes the player, the group the player is in while
+        alive, the statskeeper, the groups of the player's bullets, the enemy
+        projectiles, the enemies and the explosions, and the sound effects,
+        which are not played when there are none, as parameters."""
+        self.__player = player
+        self.__player_group = player_group
+        self.__stats_keeper = stats_keeper
+        self.__player_bullets = player_bullets
+        self.__enemy_projectiles = enemy_projectiles
+        self.__enemies = enemies
+        self.__explosions = explosions
+        self.__sounds = sounds
+        self.__bullet_grid = collision.SpatialHash()
+        self.__projectile_grid = collision.SpatialHash()
+
+    def fight(self, timer, projectile_cap = None):
+        """This method accepts the profiler that times the phases of the tick
+        and the most enemy projectiles alive at once, which is not capped when
+        it is None, as parameters. Enemies shoot and are hit by the player's
+        bullets, then projectiles hit the player, the ground and the player's
+        bullets."""
+        player = self.__player
+        stats_keeper = self.__stats_keeper
+        player_bullets = self.__player_bullets
+        enemy_projectiles = self.__enemy_projectiles
+        explosions = self.__explosions
+        sounds = self.__sounds
+
+        #Enemies actions
+        self.__bullet_grid.build(player_bullets)
+        for enemy in self.__enemies:
+            #Get player x and y
+            enemy.store_player_xy(player.rect.centerx, player.rect.centery)
+
+            #Enemy shooting
+            if enemy.is_shooting() and (projectile_cap is None or \
+                                        len(enemy_projectiles) < projectile_cap):
+                bullet = enemy.get_bullet()
+                enemy_projectiles.add(bullet)
+
+            #Enemy collisions
+            for bullet in self.__bullet_grid.spritecollide(enemy, player_bullets, True):
+                #Adjust enemy health, if below 0, kill sprite and add explosion
+                enemy.take_damage(bullet.get_damage())
+                if enemy.get_health() < 0:
+                    stats_keeper.set_statistics(score = enemy.get_points())
+                    enemy.kill()
+                    explosion = sprites.explosion_pool.acquire("death/explosion",16, enemy.rect.centerx,enemy.rect.bottom)
+                    explosions.add(explosion)
+                    sound = runtime.rng.randrange(0,5)
+                    if sounds:
+                        sounds.play("explosion" + str(sound))
+        timer.mark("enemies")
+
+        #Find the projectiles that hit the player
+        self.__projectile_grid.build(enemy_projectiles)
+        player_hits = set()
+        for target in self.__player_group:
+            player_hits.update(self.__projectile_grid.spritecollide(target, enemy_projectiles, False))
+
+        #Adjust all projectiles
+        for projectile in enemy_projectiles:
+            explosion_y = None
+            #If projectile hits player, adjust damage on player and
+            #place explosion for projectile on the player
+            if projectile in player_hits:
+                stats_keeper.take_damage(projectile.get_damage())
+                explosion_y = projectile.rect.centery + 40
+                if sounds:
+                    sounds.play("hit")
+            #If projectile is exploding due to hitting ground, place
+            #explosion for projectile on the ground
+            if projectile.is_exploding():
+                explosion_y = projectile.rect.centery
+            #If there is explosions, add to explosions group
+            if explosion_y is not None:
+                explosion = sprites.explosion_pool.acquire(projectile.get_death()+"/explosion",\
+                                                           projectile.get_frames(),projectile.rect.centerx, explosion_y)
+                explosions.add(explosion)
+                projectile.kill()
+
+        #Checks if enemy projectiles hits player's bullets, adjust score
+        #and the bullet's health for the player. Each projectile is
+        #destroyed by the first bullet that hits it.
+        bullet_hits = self.__projectile_grid.groupcollide(player_bullets, enemy_projectiles, True)
+        for hits in bullet_hits.values():
+            for projectile in hits:
+                stats_keeper.set_statistics(projectile.get_points())
+        for bullet in bullet_hits:
+            bullet.set_health()
+        timer.mark("collision")
+
+    def move(self, renderer):
+        """This method accepts the renderer as a parameter. It brings the
+        renderer's layers up to date with the groups, moves the projectiles
+        with the bullet engine and the missile guidance, and updates every
+        other sprite."""
+        player = self.__player
+        renderer.sync()
+        if sprites.bullet_engine:
+            sprites.bullet_engine.step()
+        sprites.missile_guidance.step(player.rect.centerx, player.rect.centery, runtime.get_ticks())
+        renderer.update()
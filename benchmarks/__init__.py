@@ -0,0 +1,15 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the package for the game's benchmarks. Each module is
+run from the game's folder, for example: python -m benchmarks.image_cache
+"""
+import os, pygame
+
+def init_display(size = (800, 600)):
+    """This function takes the size of the screen as a parameter. It starts
+    pygame without a window or sound card and returns the screen surface."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    return pygame.display.set_mode(size)
@@ -0,0 +1,51 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This benchmark moves a large number of straight bullets, once
+with each bullet updating itself and once with the numpy bullet engine,
+and checks that both leave the bullets in the same places. As in the game,
+bullets the engine moves are not updated one by one.
+Usage: python -m benchmarks.bullets [bullets] [frames]
+"""
+import sys, time, random, pygame
+from benchmarks import init_display
+
+def run(screen, engine, count, frames):
+    """This function takes the screen, a bullet engine or None, the number of
+    bullets and frames as parameters. It returns the average frame time in
+    milliseconds and where the bullets ended up."""
+    import sprites
+    sprites.bullet_engine = engine
+    rng = random.Random(1)
+    bullets = pygame.sprite.Group()
+    for i in range(count):
+        bullets.add(sprites.Bullet("./pictures/bullet/bullet.gif", rng.randrange(800), rng.randrange(600), \
+                                   rng.uniform(0, 360), rng.uniform(1, 4), screen, 1, 5, "bullet", 5))
+    start = time.perf_counter()
+    for frame in range(frames):
+        if engine:
+            engine.step()
+        else:
+            bullets.update()
+    elapsed = (time.perf_counter() - start) * 1000.0 / frames
+    state = sorted([(bullet.rect.center, bullet.is_exploding()) for bullet in bullets])
+    sprites.bullet_engine = None
+    return elapsed, state
+
+def main(count = 10000, frames = 100):
+    """This function takes the number of bullets and frames as parameters, and
+    prints the frame time of both versions."""
+    screen = init_display()
+    import projectiles
+    if projectiles.numpy is None:
+        print("numpy is not installed, the bullet engine is not available")
+        return
+    before, expected = run(screen, None, count, frames)
+    after, state = run(screen, projectiles.BulletEngine(screen), count, frames)
+    print("%i bullets, %i frames, %i still alive" % (count, frames, len(state)))
+    print("per bullet update: %.3f ms/frame" % before)
+    print("bullet engine:     %.3f ms/frame" % after)
+    print("same results: %s" % (state == expected))
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,56 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This benchmark starts a new process for each run and loads
+every picture the game needs before its first game, once from the packed
+archive and once from the loose files, and prints the median time of each.
+Each run starts with empty caches in a new process, but the files may
+still be in the system's disk cache. Build the archive first with
+python archive.py.
+Usage: python -m benchmarks.cold_start [runs]
+"""
+import sys, time, subprocess
+
+def child(source):
+    """This function takes where to load the pictures from, "archive" or
+    "loose", as a parameter. It loads the pictures and prints the
+    milliseconds it took."""
+    import main, assets
+    main.setup(True)
+    start = time.perf_counter()
+    if source == "archive":
+        if not assets.open_archive():
+            print("-1")
+            return
+    else:
+        assets.pictures = None
+    assets.load_picture("./pictures/menus/game_menu.gif")
+    assets.load_picture("./pictures/menus/instructions_menu.gif")
+    main.load_images()
+    print("%.3f" % ((time.perf_counter() - start) * 1000.0))
+
+def run(source):
+    """This function takes where to load the pictures from as a parameter. It
+    loads them in a new process and returns the milliseconds it took."""
+    output = subprocess.check_output([sys.executable, "-m", "benchmarks.cold_start", "--child", source])
+    return float(output.split()[-1])
+
+def main(runs = 5):
+    """This function takes the number of runs as a parameter. It runs both
+    ways of loading, taking turns, and prints the median of each."""
+    times = {"archive": [], "loose": []}
+    for number in range(runs):
+        for source in ("loose", "archive"):
+            times[source].append(run(source))
+    if times["archive"][0] < 0:
+        print("No archive, run python archive.py first")
+        return
+    for source in ("loose", "archive"):
+        times[source].sort()
+        print("%-8s %8.2f ms" % (source, times[source][len(times[source]) // 2]))
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(sys.argv[2])
+    else:
+        main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,113 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This benchmark runs the game's collision checks with a growing
+number of projectiles, once with pygame's pairwise checks and once with the
+spatial hash, and checks that both give the same results.
+Usage: python -m benchmarks.collisions [projectiles] [projectiles] ...
+Add --all to run the pairwise checks past PAIRWISE_LIMIT projectiles.
+"""
+import sys, time, random, pygame
+from benchmarks import init_display
+
+# The pairwise checks take minutes past this many projectiles
+PAIRWISE_LIMIT = 1000
+
+def make_world(screen, count, seed):
+    """This function takes the screen, number of projectiles and a seed as
+    parameters. It returns the player, enemies, player bullets and enemy
+    projectiles placed at random."""
+    import sprites
+    rng = random.Random(seed)
+    player = sprites.Player(screen)
+    enemies = pygame.sprite.Group()
+    for i in range(20):
+        enemy = sprites.Enemy_Chopper(screen)
+        enemy.rect.center = (rng.randrange(800), rng.randrange(92, 226))
+        enemies.add(enemy)
+    bullets = pygame.sprite.Group()
+    projectiles = pygame.sprite.Group()
+    for i in range(count):
+        bullets.add(sprites.Bullet("./pictures/bullet/plasma_bullet.gif", rng.randrange(800), \
+                                   rng.randrange(600), rng.randrange(360), 15, screen, 40, None, None, None, 3))
+        projectiles.add(sprites.Bullet("./pictures/bullet/bullet.gif", rng.randrange(800), \
+                                       rng.randrange(600), rng.randrange(360), 7, screen, 1, 5, "bullet", 5))
+    return player, enemies, bullets, projectiles
+
+def pairwise(player, enemies, bullets, projectiles):
+    """This function takes the sprites of a world as parameters and runs the
+    collision checks the way game() used to. It returns the score."""
+    score = 0
+    for enemy in enemies:
+        for bullet in pygame.sprite.spritecollide(enemy, bullets, True):
+            enemy.take_damage(bullet.get_damage())
+            if enemy.get_health() < 0:
+                score += enemy.get_points()
+                enemy.kill()
+    for projectile in projectiles:
+        if pygame.sprite.spritecollide(projectile, pygame.sprite.GroupSingle(player), False):
+            projectile.kill()
+    for projectile in pygame.sprite.groupcollide(projectiles, bullets, False, False):
+        score += projectile.get_points()
+        for bullet in pygame.sprite.groupcollide(bullets, projectiles, False, True):
+            bullet.set_health()
+    return score
+
+def hashed(player, enemies, bullets, projectiles):
+    """This function takes the sprites of a world as parameters and runs the
+    collision checks the way game() does with the spatial hash. It returns
+    the score."""
+    import collision
+    score = 0
+    bullet_grid = collision.SpatialHash()
+    projectile_grid = collision.SpatialHash()
+    bullet_grid.build(bullets)
+    for enemy in enemies:
+        for bullet in bullet_grid.spritecollide(enemy, bullets, True):
+            enemy.take_damage(bullet.get_damage())
+            if enemy.get_health() < 0:
+                score += enemy.get_points()
+                enemy.kill()
+    projectile_grid.build(projectiles)
+    player_hits = set(projectile_grid.spritecollide(player, projectiles, False))
+    for projectile in projectiles:
+        if projectile in player_hits:
+            projectile.kill()
+    bullet_hits = projectile_grid.groupcollide(bullets, projectiles, True)
+    for hits in bullet_hits.values():
+        for projectile in hits:
+            score += projectile.get_points()
+    for bullet in bullet_hits:
+        bullet.set_health()
+    return score
+
+def run(screen, check, count, seed):
+    """This function takes the screen, a collision function, the number of
+    projectiles and a seed as parameters. It returns the time taken in
+    milliseconds and the outcome of the checks."""
+    player, enemies, bullets, projectiles = make_world(screen, count, seed)
+    start = time.perf_counter()
+    score = check(player, enemies, bullets, projectiles)
+    elapsed = (time.perf_counter() - start) * 1000.0
+    return elapsed, (score, len(enemies), len(bullets), len(projectiles))
+
+def main(counts = (), limit = PAIRWISE_LIMIT):
+    """This function takes the numbers of projectiles to try and the most
+    projectiles to run the pairwise checks with as parameters. It prints the
+    time of both versions for each number."""
+    screen = init_display()
+    counts = counts or (10, 50, 100, 250, 500, 1000, 2000)
+    print("%11s %14s %14s %8s" % ("projectiles", "pairwise ms", "hashed ms", "same"))
+    for count in counts:
+        after, outcome = run(screen, hashed, count, count)
+        if limit is None or count <= limit:
+            before, expected = run(screen, pairwise, count, count)
+            print("%11i %14.2f %14.2f %8s" % (count, before, after, outcome == expected))
+        else:
+            print("%11i %14s %14.2f %8s" % (count, "-", after, "-"))
+
+if __name__ == "__main__":
+    limit = PAIRWISE_LIMIT
+    if "--all" in sys.argv:
+        limit = None
+    main([int(arg) for arg in sys.argv[1:] if arg != "--all"], limit)
@@ -0,0 +1,69 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This benchmark keeps a number of explosions on screen at once
+and compares the frame time of the old explosion, which decoded a GIF on
+every frame, against the explosion that plays back shared frames.
+Usage: python -m benchmarks.explosions [frames] [explosions]
+"""
+import sys, time, random, pygame
+from benchmarks import init_display
+
+def make_legacy(sprites):
+    """This function takes the sprites module as a parameter, and returns an
+    explosion class that decodes its frames from disk like the old one did."""
+    class LegacyExplosion(sprites.Explosion):
+        """This class defines an explosion that loads every frame from disk."""
+        def __init__(self, image, number, x, y):
+            """This initializer takes the same parameters as Explosion."""
+            sprites.Explosion.__init__(self, image, number, x, y)
+            self.__image = "./pictures/explosion/" + image
+            self.__frame = 1
+            self.__number = number
+
+        def update(self):
+            """This method changes the explosion's image by loading the next
+            frame from disk."""
+            self.__frame += 1
+            if self.__frame < self.__number:
+                self.image = pygame.image.load(self.__image + str(self.__frame) + ".gif").convert()
+            else:
+                self.kill()
+    return LegacyExplosion
+
+def run(screen, explosion_class, frames, count):
+    """This function takes the screen, an explosion class, the number of frames
+    and number of explosions as parameters. It returns the average frame time
+    in milliseconds."""
+    import assets
+    background = pygame.Surface(screen.get_size())
+    explosions = pygame.sprite.Group()
+    rng = random.Random(1)
+    names = sorted(assets.CLIPS)
+    start = time.perf_counter()
+    for frame in range(frames):
+        # Replace finished explosions so the count stays the same
+        while len(explosions) < count:
+            name = rng.choice(names)
+            explosions.add(explosion_class(name + "/explosion", assets.CLIPS[name], \
+                                           rng.randrange(800), rng.randrange(100, 600)))
+        explosions.clear(screen, background)
+        explosions.update()
+        explosions.draw(screen)
+    return (time.perf_counter() - start) * 1000.0 / frames
+
+def main(frames = 300, count = 50):
+    """This function takes the number of frames and explosions as parameters.
+    It runs both versions and prints the results."""
+    screen = init_display()
+    import assets, sprites
+    assets.preload_clips()
+    before = run(screen, make_legacy(sprites), frames, count)
+    after = run(screen, sprites.Explosion, frames, count)
+    print("%i explosions, %i frames" % (count, frames))
+    print("before (decode every frame): %.3f ms/frame" % before)
+    print("after (shared frames):       %.3f ms/frame" % after)
+    print("speedup: %.1fx" % (before / after))
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
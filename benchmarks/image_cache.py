@@ -0,0 +1,46 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This benchmark spawns waves of enemies that shoot every frame
+and reports the image cache counters. After the first wave every image
+comes from the cache, so the number of misses stays flat.
+Usage: python -m benchmarks.image_cache [frames] [enemies per frame]
+"""
+import sys, time, pygame
+from benchmarks import init_display
+
+def main(frames = 300, per_frame = 25):
+    """This function takes the number of frames and enemies spawned per frame
+    as parameters. It runs the benchmark and prints the results."""
+    screen = init_display()
+    import assets, sprites
+    enemy_types = [sprites.Enemy_Jet, sprites.Enemy_Chopper, sprites.Enemy_Hover_Chopper, \
+                   sprites.Enemy_Helicopter, sprites.Enemy_Gunner]
+    player_x, player_y = screen.get_width() / 2, screen.get_height() - 75
+    enemies = pygame.sprite.Group()
+    projectiles = pygame.sprite.Group()
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        misses = assets.images.misses
+        for i in range(per_frame):
+            enemy = enemy_types[i % len(enemy_types)](screen)
+            enemy.store_player_xy(player_x, player_y)
+            enemies.add(enemy)
+            bullet = enemy.get_bullet()
+            if isinstance(bullet, sprites.Missile):
+                bullet.store_player_xy(player_x, player_y)
+            projectiles.add(bullet)
+        enemies.update()
+        projectiles.update()
+        if frame == 0 or assets.images.misses != misses:
+            print("frame %i: %i new disk loads" % (frame, assets.images.misses - misses))
+    elapsed = time.perf_counter() - start
+
+    stats = assets.images.get_stats()
+    print("%i frames, %i sprites created in %.3f s" % (frames, frames * per_frame * 2, elapsed))
+    print("hits: %(hits)i  misses: %(misses)i  evictions: %(evictions)i  " \
+          "entries: %(entries)i  bytes: %(bytes)i / %(limit)i" % stats)
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
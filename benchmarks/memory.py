@@ -0,0 +1,97 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This benchmark fills groups with thousands of live projectiles
+and prints the memory each kind of sprite takes and the memory the whole
+set takes, measured with tracemalloc. Each is measured before, with copies
+of the sprite classes that keep their own state in the instance's __dict__,
+and after, with the classes' __slots__. pygame's DirtySprite has no
+__slots__, so both keep its fields in a __dict__. The bullet engine and the
+missile guidance are left off, so only the sprites themselves are measured.
+Usage: python -m benchmarks.memory [count]
+"""
+import sys, gc, types, tracemalloc, pygame
+from benchmarks import init_display
+
+def measure(make, count):
+    """This function takes a function that makes one live sprite and the
+    number of sprites as parameters. It makes that many sprites and returns
+    the bytes allocated for each and in total, with the group holding them."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    group = pygame.sprite.Group()
+    for number in range(count):
+        group.add(make(number))
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    return used / float(count), used, group
+
+def without_slots(sprite_class, bases = None):
+    """This function takes a sprite class and the bases to give its copy,
+    which are its own bases when None, as parameters. It returns a copy of
+    the class without its __slots__, so the state the slots held goes into
+    the instance's __dict__."""
+    namespace = {}
+    for name, value in sprite_class.__dict__.items():
+        if name not in ("__slots__", "__dict__", "__weakref__") and \
+           not isinstance(value, types.MemberDescriptorType):
+            namespace[name] = value
+    return type(sprite_class.__name__, bases or sprite_class.__bases__, namespace)
+
+def make_kinds(classes, screen):
+    """This function takes something holding the Bullet, Missile, Explosion
+    and Enemy_Gunner classes, and the screen, as parameters. It returns a
+    dictionary of functions that each make one live sprite of a kind."""
+    return {"bullet": lambda n: classes.Bullet("./pictures/bullet/bullet.gif", n % 800, 300, 0, 7, screen, \
+                                               1, 5, "bullet", 5), \
+            "plasma bullet": lambda n: classes.Bullet("./pictures/bullet/plasma_bullet.gif", n % 800, 300, 90, \
+                                                      15, screen, 40, None, None, None, 3), \
+            "missile": lambda n: classes.Missile(screen, "./pictures/bullet/homing_missile.gif", -90, 5, \
+                                                 n % 800, 150, 400, 525, 20, 10, "bomb", 21), \
+            "explosion": lambda n: classes.Explosion("death/explosion", 16, n % 800, 300), \
+            "enemy gunner": lambda n: classes.Enemy_Gunner(screen)}
+
+def main(count = 5000):
+    """This function takes the number of live projectiles as a parameter. It
+    measures each kind of sprite on its own, then a mix of projectiles, with
+    the state in a __dict__ and in __slots__, and prints the results."""
+    screen = init_display()
+    import sprites, runtime, assets
+    runtime.rng.seed(1)
+    sprites.bullet_engine = None
+    sprites.missile_guidance = None
+    assets.preload_clips()
+
+    # The same classes with their own state in a __dict__, the gunner on top
+    # of a copy of Enemy
+    enemy = without_slots(sprites.Enemy)
+    before = types.SimpleNamespace(Bullet = without_slots(sprites.Bullet), Missile = without_slots(sprites.Missile), \
+                                   Explosion = without_slots(sprites.Explosion), \
+                                   Enemy_Gunner = without_slots(sprites.Enemy_Gunner, (enemy,)))
+    ways = [("__dict__", make_kinds(before, screen)), ("__slots__", make_kinds(sprites, screen))]
+
+    # Make the images and rotations first, so only the sprites are measured
+    for way, kinds in ways:
+        for name in kinds:
+            kinds[name](0)
+
+    tracemalloc.start()
+    print("%-14s %10s %10s" % ("bytes each", ways[0][0], ways[1][0]))
+    for name in sorted(ways[0][1]):
+        results = []
+        for way, kinds in ways:
+            each, used, group = measure(kinds[name], 1000)
+            results.append(each)
+            group.empty()
+        print("%-14s %10.1f %10.1f" % (name, results[0], results[1]))
+
+    # A mix of projectiles like the ones in a busy game
+    for way, kinds in ways:
+        mix = [kinds["bullet"], kinds["plasma bullet"], kinds["missile"]]
+        each, used, group = measure(lambda n: mix[n % len(mix)](n), count)
+        print("%i live projectiles with %s: %.1f bytes each, %i bytes in all" % (count, way, each, used))
+        group.empty()
+    tracemalloc.stop()
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
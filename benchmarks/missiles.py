@@ -0,0 +1,65 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This benchmark keeps hundreds of homing missiles in the air
+and compares the time to steer them one sprite at a time, with each missile
+given the player's location, against steering them all in one step of the
+homing guidance and of the numpy missile engine, and checks that every way
+leaves the missiles in the same places.
+Usage: python -m benchmarks.missiles [frames] [count] [count] ...
+"""
+import sys, time, pygame
+from benchmarks import init_display
+
+def run(screen, guidance, count, frames):
+    """This function takes the screen, the homing guidance, or None to move
+    each missile on its own, the number of missiles and the number of frames
+    as parameters. It returns the average time to steer every missile once
+    in milliseconds and where the missiles ended up."""
+    import sprites, runtime
+    runtime.rng.seed(1)
+    runtime.start_game_clock()
+    sprites.missile_guidance = guidance
+    missiles = pygame.sprite.Group()
+    px, py = screen.get_width() // 2, screen.get_height() - 75
+    elapsed = 0.0
+    for frame in range(frames):
+        runtime.clock.advance(33)
+        while len(missiles) < count:
+            missiles.add(sprites.missile_pool.acquire(screen, "./pictures/bullet/homing_missile.gif", -90, 5, \
+                         runtime.rng.randrange(screen.get_width()), runtime.rng.randrange(92, 226), \
+                         px, py, 20, 10, "bomb", 21))
+        start = time.perf_counter()
+        if guidance is None:
+            for missile in missiles:
+                missile.store_player_xy(px, py)
+            missiles.update()
+        else:
+            guidance.step(px, py, runtime.get_ticks())
+        elapsed += time.perf_counter() - start
+        # Missiles that reach the ground are replaced, as they would explode
+        for missile in missiles.sprites():
+            if missile.is_exploding():
+                missile.kill()
+    state = sorted([(missile.rect.center, missile.rect.size) for missile in missiles])
+    missiles.empty()
+    sprites.missile_guidance = None
+    return elapsed * 1000.0 / frames, state
+
+def main(frames = 300, *counts):
+    """This function takes the number of frames and the numbers of missiles
+    to try as parameters. It runs both ways of steering and prints the
+    results."""
+    screen = init_display()
+    import projectiles
+    for count in counts or (100, 300, 1000):
+        each, expected = run(screen, None, count, frames)
+        batched, state = run(screen, projectiles.HomingGuidance(screen), count, frames)
+        print("%5i missiles: each sprite %.3f ms, guidance %.3f ms per frame, same results: %s" % \
+              (count, each, batched, state == expected))
+        if projectiles.numpy is not None:
+            engine, state = run(screen, projectiles.MissileEngine(screen), count, frames)
+            print("               missile engine %.3f ms per frame, same results: %s" % (engine, state == expected))
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
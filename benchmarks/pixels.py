@@ -0,0 +1,56 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This benchmark plays each scenario pushing only the changed
+rects to the display like the game does, and again flipping the whole screen
+every frame, and compares the pixels pushed and the frame times. While the
+terrain scrolls it covers the screen with changes and every frame is a flip,
+so both ways are also played with the terrain stopped.
+Usage: python -m benchmarks.pixels [frames] [scenario] ...
+"""
+import sys, time
+from benchmarks import init_display
+from benchmarks.scenarios import SCENARIOS, make_world
+import assets
+
+# Ways of pushing each frame: name, whether to flip the whole screen every
+# frame and whether the terrain scrolls
+WAYS = [("dirty rects", False, True), ("full flips", True, True), \
+        ("dirty, still", False, False), ("full, still", True, False)]
+
+def run(screen, scenario, frames, full, scroll):
+    """This function takes the screen, a scenario function, the number of
+    frames, whether to flip the whole screen every frame and whether the
+    terrain scrolls as parameters. It plays the scenario and returns the
+    renderer's stats and the average frame time in milliseconds."""
+    world = make_world(screen)
+    if not scroll:
+        world.terrain.stop()
+    start = time.perf_counter()
+    for frame in range(frames):
+        scenario(world, frame)
+        if full:
+            world.renderer.redraw()
+        world.frame()
+    elapsed = time.perf_counter() - start
+    stats = world.renderer.get_stats()
+    world.close()
+    return stats, elapsed * 1000.0 / frames
+
+def main(frames = 300, names = ()):
+    """This function takes the number of frames and the names of the
+    scenarios to run as parameters. It plays each scenario every way and
+    prints the results."""
+    screen = init_display()
+    assets.preload_clips()
+    print("%-22s %-12s %12s %8s %8s %9s" % ("scenario", "display", "pixels/frame", "screen", "flips", "ms/frame"))
+    for name, scenario in SCENARIOS:
+        if names and name not in names:
+            continue
+        for way, full, scroll in WAYS:
+            stats, frame_time = run(screen, scenario, frames, full, scroll)
+            print("%-22s %-12s %12i %7.1f%% %8i %9.3f" % (name, way, stats["average"], \
+                  stats["average"] * 100.0 / stats["screen"], stats["flips"], frame_time))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300, sys.argv[2:])
@@ -0,0 +1,45 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This benchmark fills the rotation tables of every image the
+game rotates at several angle steps, and prints the memory used by each
+table next to the cost of rotating the image on every frame.
+Usage: python -m benchmarks.rotations [step] [step] ...
+"""
+import sys, time, pygame
+from benchmarks import init_display
+
+# Images that are rotated while the game is running
+IMAGES = ["./pictures/player/land_raider_side.gif", "./pictures/player/turret.gif", \
+          "./pictures/bullet/plasma_bullet.gif", "./pictures/bullet/plasma_shot.gif", \
+          "./pictures/bullet/bomb.gif", "./pictures/bullet/bullet.gif", \
+          "./pictures/bullet/homing_missile.gif"]
+
+def main(*steps):
+    """This function takes the angle steps to try as parameters. It fills a
+    table for each image and step and prints the results."""
+    init_display()
+    import assets
+    steps = steps or (1, 2, 3, 5)
+    angles = [angle * 0.7 for angle in range(2000)]
+    for image in IMAGES:
+        source = assets.images.load(image, assets.MAGENTA)
+        start = time.perf_counter()
+        for angle in angles:
+            pygame.transform.rotate(source, angle)
+        rotate = (time.perf_counter() - start) * 1e6 / len(angles)
+        print("%s: rotate every frame %.2f us" % (image, rotate))
+        for step in steps:
+            table = assets.load_rotations(image, assets.MAGENTA, step)
+            table.fill()
+            start = time.perf_counter()
+            for angle in angles:
+                table.get(angle)
+            lookup = (time.perf_counter() - start) * 1e6 / len(angles)
+            count, filled, used = table.get_memory()
+            print("  step %4.1f: %3i copies, %8i bytes, lookup %.2f us" % (table.get_step(), count, used, lookup))
+    total = sum([entry["bytes"] for entry in assets.rotation_report()])
+    print("all tables: %i bytes" % total)
+
+if __name__ == "__main__":
+    main(*[float(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,266 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This benchmark plays named scenarios with the game's real
+sprites for a fixed number of frames. Each frame runs the fighting and
+moving of a tick of game() through the same battle the game uses, and the
+renderer draws the frame. It reports the frames per second, the 50th, 95th
+and 99th percentile frame times, the memory allocated in a frame, measured
+with tracemalloc over a few more frames after the timed ones, and the memory
+blocks still allocated at the end that were not at the start, and compares
+them with the baselines saved in a JSON file.
+Usage: python -m benchmarks.scenarios [--frames N] [--save] [--threshold T]
+                                      [--baselines FILE] [scenario] ...
+"""
+import sys, gc, json, time, argparse, tracemalloc, pygame
+from benchmarks import init_display
+import sprites, runtime, render, battle, profiler, projectiles, assets, parallax, waves
+import main as land_raider
+
+# File the baselines are kept in
+BASELINES = "./benchmarks/baselines.json"
+
+# Part a result may get worse than its baseline before it is a regression
+THRESHOLD = 0.15
+
+# Frames played with tracemalloc on after the timed frames, to measure the
+# memory allocated in a frame without slowing the timed ones
+TRACED = 30
+
+class World(object):
+    """This class defines the sprites of a scenario, laid out the way game()
+    lays them out, and runs one frame of the game's work on them with the
+    game's battle."""
+    def __init__(self, screen, wave_settings):
+        """This initializer takes the screen and the settings of the enemy
+        waves as parameters. Makes the player, the terrain, the groups, the
+        renderer and the battle."""
+        self.screen = screen
+        self.wave_settings = wave_settings
+        background = pygame.Surface(screen.get_size())
+        background.fill((255, 255, 255))
+        screen.blit(background, (0, 0))
+
+        self.player = sprites.Player(screen)
+        self.player_group = pygame.sprite.GroupSingle(self.player)
+        self.turret = sprites.Gun(screen, "./pictures/player/turret.gif", \
+                                  self.player.rect.centerx - 26, self.player.rect.centery - 30, 90)
+        self.stats_keeper = sprites.StatsKeeper(pygame.font.Font("./fonts/digital.TTF", 20))
+        self.player_bullets = pygame.sprite.Group()
+        self.enemy_projectiles = pygame.sprite.Group()
+        self.enemies = pygame.sprite.Group()
+        self.explosions = pygame.sprite.Group()
+
+        self.renderer = render.Renderer(screen, background)
+        self.terrain = parallax.Parallax(screen, background, land_raider.TERRAIN)
+        self.renderer.add(render.TERRAIN, *self.terrain.get_sprites())
+        self.renderer.add(render.HUD, self.stats_keeper)
+        self.renderer.track(render.PLAYER, self.player_group)
+        self.renderer.track(render.ENEMIES, self.enemies)
+        self.renderer.track(render.PROJECTILES, self.player_bullets, self.enemy_projectiles, \
+                            update = sprites.bullet_engine is None)
+        self.renderer.track(render.GUNS, pygame.sprite.Group(self.turret))
+        self.renderer.track(render.EXPLOSIONS, self.explosions)
+
+        self.battle = battle.Battle(self.player, self.player_group, self.stats_keeper, self.player_bullets, \
+                                    self.enemy_projectiles, self.enemies, self.explosions)
+        self.timer = profiler.Profiler()
+        self.cool_down = 0
+        self.made = 0
+
+    def add_enemy(self, enemy_class):
+        """This method accepts an enemy class as a parameter. It makes an enemy
+        of the class, adds it to the enemies and returns it."""
+        enemy = enemy_class(self.screen)
+        self.enemies.add(enemy)
+        self.made += 1
+        return enemy
+
+    def frame(self):
+        """This method accepts no parameters, and runs one frame of the game."""
+        runtime.clock.advance(land_raider.TICK_TIME)
+        player = self.player
+        x, y = player.rect.centerx, player.rect.centery
+
+        # The player holds the turret's trigger down the whole time
+        if runtime.get_ticks() - self.cool_down > 120:
+            self.player_bullets.add(sprites.bullet_pool.acquire("./pictures/bullet/plasma_bullet.gif", \
+                                    x - 26, y - 30, self.turret.get_angle(), 15, self.screen, 40, \
+                                    None, None, None, 3))
+            self.cool_down = runtime.get_ticks()
+
+        # The game's tick, without the player's controls and the statskeeper
+        self.battle.fight(self.timer)
+        self.battle.move(self.renderer)
+        self.renderer.draw()
+        self.renderer.present()
+
+    def explode(self, image, number, x, y):
+        """This method accepts an explosion animation, its number of frames
+        and a location as parameters, and adds the explosion to the world."""
+        self.explosions.add(sprites.explosion_pool.acquire(image, number, x, y))
+
+    def close(self):
+        """This method accepts no parameters. It empties every group, which
+        gives the pooled sprites back to their pools."""
+        for group in (self.player_bullets, self.enemy_projectiles, self.enemies, self.explosions):
+            group.empty()
+        self.renderer.sync()
+
+def wave_one(world, frame):
+    """This function takes the world and the frame number as parameters. It
+    spawns enemies the way game() does at the start, one of each kind."""
+    if len(world.enemies) < 1:
+        for enemy_class in (sprites.Enemy_Jet, sprites.Enemy_Chopper, sprites.Enemy_Hover_Chopper, \
+                            sprites.Enemy_Helicopter, sprites.Enemy_Gunner):
+            world.add_enemy(enemy_class)
+
+def max_spawn(world, frame):
+    """This function takes the world and the frame number as parameters. It
+    keeps as many enemies alive as the waves ever allow, of every kind."""
+    while len(world.enemies) < world.wave_settings["total"]:
+        world.add_enemy(waves.ENEMIES[waves.MIX[world.made % len(waves.MIX)]])
+
+def missile_storm(world, frame):
+    """This function takes the world and the frame number as parameters. It
+    keeps 200 homing missiles in the air, fired from across the sky."""
+    missiles = 0
+    for projectile in world.enemy_projectiles:
+        if isinstance(projectile, sprites.Missile):
+            missiles += 1
+    for i in range(200 - missiles):
+        world.enemy_projectiles.add(sprites.missile_pool.acquire(world.screen, \
+                                    "./pictures/bullet/homing_missile.gif", -90, 5, \
+                                    runtime.rng.randrange(800), runtime.rng.randrange(92, 226), \
+                                    world.player.rect.centerx, world.player.rect.centery, 20, 10, "bomb", 21))
+
+def explosions(world, frame):
+    """This function takes the world and the frame number as parameters. It
+    keeps 50 explosions of every kind on screen."""
+    names = sorted(assets.CLIPS)
+    while len(world.explosions) < 50:
+        name = runtime.rng.choice(names)
+        world.explode(name + "/explosion", assets.CLIPS[name], runtime.rng.randrange(800), \
+                      runtime.rng.randrange(100, 600))
+
+def chopper_spray(world, frame):
+    """This function takes the world and the frame number as parameters. It
+    keeps 10 hovering choppers firing their spread over the player."""
+    while len(world.enemies) < 10:
+        world.add_enemy(sprites.Enemy_Hover_Chopper)
+
+# The scenarios, in the order they are run
+SCENARIOS = [("wave 1", wave_one), ("max spawn_factor", max_spawn), \
+             ("homing missile storm", missile_storm), ("50 explosions", explosions), \
+             ("hover-chopper spray", chopper_spray)]
+
+def percentile(times, part):
+    """This function takes a sorted list of frame times and a part between 0
+    and 1 as parameters, and returns the frame time at that part."""
+    return times[min(len(times) - 1, int(part * len(times)))]
+
+def make_world(screen, seed = 1):
+    """This function takes the screen and a seed as parameters. It seeds the
+    game, starts its clock, sets up the projectile engines the way game()
+    does and returns a new world."""
+    runtime.rng.seed(seed)
+    runtime.start_game_clock()
+    sprites.bullet_engine = None
+    if projectiles.numpy is not None:
+        sprites.bullet_engine = projectiles.BulletEngine(screen)
+    if projectiles.numpy is not None:
+        sprites.missile_guidance = projectiles.MissileEngine(screen)
+    else:
+        sprites.missile_guidance = projectiles.HomingGuidance(screen)
+    # The waves file is read before the timed frames, not in them
+    return World(screen, waves.load())
+
+def run(screen, scenario, frames, seed = 1):
+    """This function takes the screen, a scenario function, the number of
+    frames and a seed as parameters. It plays the scenario and returns a
+    dictionary of its results."""
+    world = make_world(screen, seed)
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    times = []
+    start = time.perf_counter()
+    for frame in range(frames):
+        before = time.perf_counter()
+        scenario(world, frame)
+        world.frame()
+        times.append((time.perf_counter() - before) * 1000.0)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    blocks = sys.getallocatedblocks() - blocks
+
+    # Keep playing with tracemalloc on, and add up the most memory each frame
+    # allocated above what was allocated when it started
+    allocated = 0
+    tracemalloc.start()
+    for frame in range(frames, frames + TRACED):
+        scenario(world, frame)
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        world.frame()
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    world.close()
+    times.sort()
+    return {"fps": frames / elapsed, "p50": percentile(times, 0.5), "p95": percentile(times, 0.95), \
+            "p99": percentile(times, 0.99), "allocated": allocated / 1024.0 / TRACED, "blocks": blocks, \
+            "frames": frames}
+
+def compare(result, baseline, threshold):
+    """This function takes a result, its baseline and the threshold as
+    parameters, and returns a list of the measurements that got worse by
+    more than the threshold."""
+    worse = []
+    if result["fps"] < baseline["fps"] * (1 - threshold):
+        worse.append("fps")
+    for key in ("p50", "p95", "p99", "allocated"):
+        if result[key] > baseline[key] * (1 + threshold):
+            worse.append(key)
+    return worse
+
+def main(names = (), frames = 600, save = False, threshold = THRESHOLD, filename = BASELINES):
+    """This function takes the names of the scenarios to run, the number of
+    frames, whether to save the results as the new baselines, the threshold
+    and the baselines file as parameters. It prints the results of each
+    scenario and returns the number of regressions."""
+    screen = init_display()
+    assets.preload_clips()
+    try:
+        baselines = json.load(open(filename))
+    except (IOError, ValueError):
+        baselines = {}
+    regressions = 0
+    print("%-22s %8s %8s %8s %8s %9s %7s  %s" % ("scenario", "fps", "p50 ms", "p95 ms", "p99 ms", \
+                                                 "KB/frame", "blocks", "regressions"))
+    for name, scenario in SCENARIOS:
+        if names and name not in names:
+            continue
+        result = run(screen, scenario, frames)
+        worse = []
+        if name in baselines:
+            worse = compare(result, baselines[name], threshold)
+            regressions += len(worse)
+        print("%-22s %8.1f %8.2f %8.2f %8.2f %9.1f %7i  %s" % (name, result["fps"], result["p50"], \
+              result["p95"], result["p99"], result["allocated"], result["blocks"], " ".join(worse) or "-"))
+        if save:
+            baselines[name] = result
+    if save:
+        with open(filename, "w") as baseline_file:
+            json.dump(baselines, baseline_file, indent = 2, sort_keys = True)
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Land Raider scenario benchmarks")
+    parser.add_argument("names", nargs = "*", help = "scenarios to run, all of them by default")
+    parser.add_argument("--frames", type = int, default = 600, help = "frames to play in each scenario")
+    parser.add_argument("--save", action = "store_true", help = "save the results as the baselines")
+    parser.add_argument("--threshold", type = float, default = THRESHOLD, \
+                        help = "part a result may get worse before it is a regression")
+    parser.add_argument("--baselines", default = BASELINES, help = "file the baselines are kept in")
+    args = parser.parse_args()
+    if main(args.names, args.frames, args.save, args.threshold, args.baselines):
+        sys.exit(1)
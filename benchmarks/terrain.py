@@ -0,0 +1,67 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This benchmark scrolls the game's terrain layers and compares
+the frame time of the old terrain, which blitted its whole image and moved
+its rect, against the terrain that blits only the part on screen.
+Usage: python -m benchmarks.terrain [frames]
+"""
+import sys, time, pygame
+from benchmarks import init_display
+
+def make_legacy(sprites):
+    """This function takes the sprites module as a parameter, and returns a
+    terrain class that moves its whole image like the old one did."""
+    class LegacyTerrain(pygame.sprite.DirtySprite):
+        """This class defines the terrain that blits its whole image."""
+        def __init__(self, screen, image, speed, bottom = None):
+            """This initializer takes the same parameters as Terrain."""
+            pygame.sprite.DirtySprite.__init__(self)
+            self.image = pygame.image.load(image).convert()
+            self.rect = self.image.get_rect()
+            self.rect.bottom = screen.get_height()
+            self.__dx = speed
+            self.__screen = screen
+
+        def update(self):
+            """This method moves the image left and jumps back at its end."""
+            if self.rect.right < self.__screen.get_width() + self.__dx:
+                self.rect.left = 0
+            else:
+                self.rect.left -= self.__dx
+            self.dirty = 1
+    return LegacyTerrain
+
+def run(screen, terrain_class, frames):
+    """This function takes the screen, a terrain class, or None to use the
+    game's parallax layers, and the number of frames as parameters. It draws
+    the game's terrain for that many frames and returns the average frame
+    time in milliseconds."""
+    import main, render, parallax
+    background = pygame.Surface(screen.get_size())
+    background.fill((255, 255, 255))
+    renderer = render.Renderer(screen, background)
+    if terrain_class is None:
+        renderer.add(render.TERRAIN, *parallax.Parallax(screen, background, main.TERRAIN).get_sprites())
+    else:
+        for layer in main.TERRAIN:
+            renderer.add(render.TERRAIN, terrain_class(screen, layer[0], layer[1]))
+    start = time.perf_counter()
+    for frame in range(frames):
+        renderer.update()
+        renderer.draw()
+        renderer.present()
+    return (time.perf_counter() - start) * 1000.0 / frames
+
+def main(frames = 600):
+    """This function takes the number of frames as a parameter. It runs both
+    versions and prints the results."""
+    screen = init_display()
+    import sprites
+    before = run(screen, make_legacy(sprites), frames)
+    after = run(screen, None, frames)
+    print("whole image:   %.3f ms per frame" % before)
+    print("visible part:  %.3f ms per frame" % after)
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,85 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for collision checks. Sprites are put into
+a grid of cells each frame, so a sprite is only tested against the sprites
+that share a cell with it instead of every sprite in a group.
+"""
+
+class SpatialHash(object):
+    """This class defines a uniform grid of cells that holds sprites by their
+    rects. It gives the same results as pygame's spritecollide and
+    groupcollide, in the same order."""
+    def __init__(self, cell_size = 64):
+        """This initializer takes the size of each cell in pixels as a
+        parameter. Initializes the empty grid."""
+        self.__size = cell_size
+        self.__cells = {}
+        self.__order = {}
+
+    def build(self, sprites):
+        """This method accepts a group or list of sprites as a parameter. It
+        empties the grid and puts each sprite into the cells its rect covers."""
+        self.__cells = {}
+        self.__order = {}
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def insert(self, sprite):
+        """This method accepts a sprite as a parameter, and adds it to the
+        cells its rect covers."""
+        self.__order[sprite] = len(self.__order)
+        cells = self.__cells
+        for cell in self.__cells_for(sprite.rect):
+            if cell in cells:
+                cells[cell].append(sprite)
+            else:
+                cells[cell] = [sprite]
+
+    def candidates(self, rect):
+        """This method accepts a rect as a parameter, and returns the sprites
+        that share a cell with it, in the order they were added."""
+        cells = self.__cells
+        found = set()
+        for cell in self.__cells_for(rect):
+            if cell in cells:
+                found.update(cells[cell])
+        if len(found) > 1:
+            return sorted(found, key = self.__order.__getitem__)
+        return list(found)
+
+    def spritecollide(self, sprite, group, dokill):
+        """This method accepts a sprite, the group the grid was built from and
+        whether to kill the sprites that are hit as parameters. It returns the
+        sprites still in the group that collide with the sprite."""
+        rect = sprite.rect
+        hits = [other for other in self.candidates(rect) \
+                if other in group and rect.colliderect(other.rect)]
+        if dokill:
+            for other in hits:
+                other.kill()
+        return hits
+
+    def groupcollide(self, group, other_group, dokill):
+        """This method accepts a group, the group the grid was built from and
+        whether to kill the sprites of the grid that are hit as parameters. It
+        returns a dictionary of the sprites in the first group and the list of
+        sprites each one hit."""
+        hits = {}
+        for sprite in group:
+            collided = self.spritecollide(sprite, other_group, dokill)
+            if collided:
+                hits[sprite] = collided
+        return hits
+
+    def __cells_for(self, rect):
+        """This method accepts a rect as a parameter, and returns the cells it
+        covers."""
+        size = self.__size
+        left = rect.left // size
+        right = (rect.right - 1) // size
+        top = rect.top // size
+        bottom = (rect.bottom - 1) // size
+        if left == right and top == bottom:
+            return ((left, top),)
+        return [(x, y) for x in range(left, right + 1) for y in range(top, bottom + 1)]
@@ -0,0 +1,84 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for the game's controls. The game loop asks
+its controls for the keys held down and the events of each frame, which
+come from the keyboard or from a script.
+"""
+import pygame
+
+# Names of the keys the game reads
+KEYS = {"left": pygame.K_LEFT, "right": pygame.K_RIGHT, "a": pygame.K_a, \
+        "d": pygame.K_d, "space": pygame.K_SPACE, "c": pygame.K_c}
+
+class KeyState(object):
+    """This class defines the keys held down in one frame. It is read the
+    same way as the list from pygame.key.get_pressed()."""
+    def __init__(self, held = ()):
+        """This initializer takes the keys held down as a parameter, and
+        stores them."""
+        self.__held = frozenset(held)
+
+    def __getitem__(self, key):
+        """This method accepts a key as a parameter, and returns whether it is
+        held down."""
+        return key in self.__held
+
+class Keyboard(object):
+    """This class defines the controls read from the keyboard."""
+    def poll(self):
+        """This method accepts no parameters, and returns the keys held down
+        and the events of this frame."""
+        return pygame.key.get_pressed(), pygame.event.get()
+
+class ScriptedInput(object):
+    """This class defines controls that play back a script. Each frame of the
+    script is a pair of the keys held down and the keys pressed that frame.
+    When the script runs out, the game is told to quit."""
+    def __init__(self, script):
+        """This initializer takes the script as a list of frames, or as a
+        function that takes a frame number and returns that frame or None
+        when the script is over."""
+        self.__script = script
+        self.__frame = 0
+
+    def poll(self):
+        """This method accepts no parameters, and returns the keys held down
+        and the events of the next frame of the script."""
+        step = self.__next()
+        self.__frame += 1
+        if step is None:
+            return KeyState(), [pygame.event.Event(pygame.QUIT)]
+        held, pressed = step
+        events = [pygame.event.Event(pygame.KEYDOWN, key = key) for key in pressed]
+        return KeyState(held), events
+
+    def get_frame(self):
+        """This method accepts no parameters, and returns the number of frames
+        played so far."""
+        return self.__frame
+
+    def __next(self):
+        """This method accepts no parameters, and returns the next frame of the
+        script or None if it is over."""
+        if callable(self.__script):
+            return self.__script(self.__frame)
+        if self.__frame < len(self.__script):
+            return self.__script[self.__frame]
+        return None
+
+def load_script(filename):
+    """This function takes the name of a script file as a parameter. Each
+    line of the file is one frame: the names of the keys held down, then a
+    bar and the names of the keys pressed, for example "left space | c".
+    It returns the script as a list of frames."""
+    script = []
+    for line in open(filename):
+        held, bar, pressed = line.partition("|")
+        script.append(([KEYS[name] for name in held.split()], [KEYS[name] for name in pressed.split()]))
+    return script
+
+def idle_script(frames):
+    """This function takes a number of frames as a parameter, and returns a
+    script that presses nothing for that many frames."""
+    return [((), ())] * frames
@@ -0,0 +1,111 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for keeping the game smooth on slow
+machines. The governor watches how long each frame takes. When frames run
+over their budget it steps down through levels of quality that each shed
+some work, and when there is time to spare again it steps back up. A game
+being recorded only uses the levels that change how it looks and sounds,
+so its replay plays out the same.
+"""
+from collections import deque
+
+# Settings at full quality
+DEFAULTS = {"explosion_step": 1, "projectile_cap": None, "sounds": True, "parallax": True}
+
+# Levels of quality from best to cheapest. Each level keeps the settings of
+# the levels before it and changes some of its own.
+LEVELS = ({"name": "full"}, \
+          {"name": "half explosion frames", "explosion_step": 2}, \
+          {"name": "projectile cap", "projectile_cap": 60}, \
+          {"name": "no sound effects", "sounds": False}, \
+          {"name": "front terrain only", "parallax": False})
+
+# Settings that change how the game plays out, not only how it looks or sounds
+GAMEPLAY = ("projectile_cap",)
+
+def cosmetic(levels = LEVELS):
+    """This function takes levels of quality as a parameter, and returns them
+    without the settings that change how the game plays out. Levels with
+    nothing left to change are left out."""
+    kept = []
+    for level in levels:
+        settings = dict([(key, level[key]) for key in level if key not in GAMEPLAY])
+        if len(settings) > 1 or not kept:
+            kept.append(settings)
+    return tuple(kept)
+
+class Governor(object):
+    """This class defines the governor that picks the level of quality from
+    the rolling average of the frame times."""
+    def __init__(self, budget = 1000.0 / 30, levels = LEVELS, high = 1.0, low = 0.6, \
+                 window = 30, wait = 60, log = None):
+        """This initializer takes the budget of a frame in milliseconds, the
+        levels of quality, the parts of the budget the average must go over
+        to step down and under to step up, the frames averaged, the frames to
+        wait after a change before changing again, and a function that is
+        given a message for each change as parameters. Starts at full
+        quality."""
+        self.__budget = budget
+        self.__levels = levels
+        self.__high = high
+        self.__low = low
+        self.__times = deque(maxlen = window)
+        self.__wait = wait
+        self.__since = 0
+        self.__log = log
+        self.__level = 0
+        self.__settings = self.__merge(0)
+
+        # Every change of level, as the frame, the level and the average
+        self.frames = 0
+        self.transitions = []
+
+    def record(self, frame_time):
+        """This method accepts the milliseconds a frame took as a parameter.
+        It returns whether the level of quality changed."""
+        self.frames += 1
+        self.__since += 1
+        self.__times.append(frame_time)
+        if self.__since < self.__wait or len(self.__times) < self.__times.maxlen:
+            return False
+        average = sum(self.__times) / len(self.__times)
+        if average > self.__budget * self.__high and self.__level < len(self.__levels) - 1:
+            self.__change(self.__level + 1, average)
+            return True
+        if average < self.__budget * self.__low and self.__level > 0:
+            self.__change(self.__level - 1, average)
+            return True
+        return False
+
+    def get(self, setting):
+        """This method accepts the name of a setting as a parameter, and
+        returns its value at the current level."""
+        return self.__settings[setting]
+
+    def get_level(self):
+        """This method accepts no parameters, and returns the current level
+        and its name."""
+        return self.__level, self.__levels[self.__level]["name"]
+
+    def __change(self, level, average):
+        """This method accepts the new level and the average frame time as
+        parameters. It moves to the level and logs the change."""
+        self.__level = level
+        self.__settings = self.__merge(level)
+        self.__since = 0
+        self.__times.clear()
+        self.transitions.append((self.frames, level, average))
+        if self.__log is not None:
+            self.__log("Quality level %i (%s) at frame %i, average frame %.1f ms of %.1f ms" % \
+                       (level, self.__levels[level]["name"], self.frames, average, self.__budget))
+
+    def __merge(self, level):
+        """This method accepts a level as a parameter, and returns the settings
+        of every level up to it merged together."""
+        settings = dict(DEFAULTS)
+        for index in range(level + 1):
+            for key in self.__levels[index]:
+                if key != "name":
+                    settings[key] = self.__levels[index][key]
+        return settings
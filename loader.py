@@ -0,0 +1,74 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for loading the game's resources in the
+background. A loader runs a list of jobs on its own thread while the menu
+is showing, reports how many are done and can be waited on before a game
+starts.
+"""
+import time, threading
+
+class Loader(object):
+    """This class defines a loader that runs its jobs one after another on a
+    background thread and keeps what each job returns."""
+    def __init__(self, jobs):
+        """This initializer takes a list of jobs as a parameter. Each job is a
+        name, a function and a tuple of the function's arguments."""
+        self.__jobs = list(jobs)
+        self.__results = {}
+        self.__error = None
+        self.__done = 0
+        self.__thread = None
+
+        # The milliseconds each job took, in the order they finished
+        self.times = []
+
+    def start(self):
+        """This method accepts no parameters, and starts running the jobs if
+        they have not been started."""
+        if self.__thread is None:
+            self.__thread = threading.Thread(target = self.__run)
+            self.__thread.daemon = True
+            self.__thread.start()
+
+    def get_progress(self):
+        """This method accepts no parameters, and returns the number of jobs
+        done and the number of jobs."""
+        return self.__done, len(self.__jobs)
+
+    def is_done(self):
+        """This method accepts no parameters, and returns whether every job
+        has finished."""
+        return self.__thread is not None and not self.__thread.is_alive()
+
+    def wait(self, callback = None, interval = 0.05):
+        """This method accepts a function that is given the progress, and the
+        seconds between its calls as parameters. It starts the jobs if
+        needed and waits for all of them, calling the function while it
+        waits. An error raised by a job is raised again here."""
+        self.start()
+        while self.__thread.is_alive():
+            self.__thread.join(interval)
+            if callback is not None:
+                callback(*self.get_progress())
+        if self.__error is not None:
+            raise self.__error
+
+    def get(self, name):
+        """This method accepts the name of a job as a parameter. It waits for
+        the jobs and returns what the job returned."""
+        self.wait()
+        return self.__results[name]
+
+    def __run(self):
+        """This method accepts no parameters. It runs every job and stores
+        their results, stopping at the first job that fails."""
+        for name, function, args in self.__jobs:
+            start = time.perf_counter()
+            try:
+                self.__results[name] = function(*args)
+            except Exception as error:
+                self.__error = error
+                return
+            self.times.append((name, (time.perf_counter() - start) * 1000.0))
+            self.__done += 1
@@ -4,7 +4,7 @@ Date: June 6, 2012
 Description: This is the main file for the game.
 
 Game Description:  Land Raider is a single player, side scrolling game. 
-The player controls a tank called the Land Raider, and is equipped with 
+The player controls a tank called the "Land Raider", and is equipped with 
 armour, and weapons. The tank can be controlled using the arrow keys, and 
 the weapons can be controlled using the A, and D keys. The Space Bar can 
 be used to fire weapons and the C key can be used to change the missile types. 
@@ -29,25 +29,93 @@ using the keyboard
 
 """
 # I - IMPORT AND INITIALIZE
-import pygame, sprites, random
-pygame.init()
-pygame.mixer.init()
-screen = pygame.display.set_mode((800, 600))
+import time
 
-def game():
-    """This is the main-line logic for the Land Raider game. It accepts no 
-    variables and returns nothing."""
-    # ENTITIES
-    background = pygame.Surface(screen.get_size()) 
-    background.fill((255, 255, 255)) 
-    screen.blit(background, (0, 0))
-    
-    #LOAD MUSIC
-    pygame.mixer.music.load("./music/Two Steps From Hell - Invincible.wav")
-    pygame.mixer.music.set_volume(0.4)
-    pygame.mixer.music.play(-1)
-    
-    #LOAD ALL SOUND EFFECTS AND SET VOLUME
+# When the game was started, used to measure the time to the first frame
+START_TIME = time.perf_counter()
+
+import os, argparse, pygame
+import sprites, assets, render, battle, projectiles, runtime, controls, profiler, replay, parallax, waves, governor, \
+       audio, loader, autopilot, viewport
+
+# The screen, made by setup()
+screen = None
+
+# The loader of the sounds, fonts and images kept between games, made by
+# load_resources()
+resources = None
+
+# Layers of terrain from back to front, each an image and the pixels it
+# scrolls each tick
+TERRAIN = (("./pictures/background/mountains.jpg", 2), \
+           ("./pictures/background/ground_large.jpg", 10))
+
+# Ticks simulated and frames drawn each second, and the most ticks run in a
+# row without drawing when the game falls behind
+SIM_RATE = 30
+RENDER_RATE = 30
+MAX_SKIP = 5
+
+# Milliseconds the game's clock moves each tick
+TICK_TIME = 1000.0 / SIM_RATE
+
+# Milliseconds between each point of armour and turret ammo regained, and
+# between each kilometre travelled
+ARMOUR_TIME = 350
+TURRET_TIME = 250
+DISTANCE_TIME = 2500
+
+# Mixer channels kept for each kind of sound effect
+SOUND_CHANNELS = (("player", 1), ("shots", 2), ("impacts", 2), ("explosions", 3))
+
+# Buttons of the menu screens, the areas that can be clicked
+PLAY_BUTTON = pygame.Rect(281, 401, 264, 64)
+EXIT_BUTTON = pygame.Rect(281, 491, 264, 64)
+
+# Milliseconds the menu sleeps waiting for an event, shorter while the
+# loading bar is moving
+MENU_WAIT = 1000
+LOADING_WAIT = 100
+
+# Images every game draws, with their colorkeys, loaded before the first game
+IMAGES = (("./pictures/player/land_raider_base.gif", assets.MAGENTA), \
+          ("./pictures/background/HUD.gif", assets.MAGENTA), \
+          ("./pictures/enemies/enemy_jet.gif", assets.WHITE), \
+          ("./pictures/enemies/enemy_chopper.gif", assets.WHITE), \
+          ("./pictures/enemies/enemy_hover_chopper.gif", assets.WHITE), \
+          ("./pictures/enemies/enemy_helicopter.gif", assets.WHITE), \
+          ("./pictures/enemies/enemy_gunner.gif", assets.WHITE))
+
+# Images every game rotates. The projectiles are small, so every angle of
+# them is made before the first game.
+ROTATED = ("./pictures/player/land_raider_side.gif", "./pictures/player/turret.gif")
+PROJECTILES = ("./pictures/bullet/plasma_bullet.gif", "./pictures/bullet/plasma_shot.gif", \
+               "./pictures/bullet/bomb.gif", "./pictures/bullet/bullet.gif", \
+               "./pictures/bullet/homing_missile.gif")
+
+def setup(headless = False, seed = None, size = viewport.SIZE, mode = viewport.WINDOW, scale = 1, \
+          native_hud = False):
+    """This function takes whether to run without a window or sound card, a
+    seed for the random numbers, the logical resolution, the way of showing
+    the game, the whole number to scale a window by and whether to draw the
+    heads-up display at the window's resolution as parameters. It
+    initializes pygame, makes the screen and sets the game's clock. A
+    headless game runs on a virtual clock, so it plays out the same way for
+    the same seed and controls."""
+    global screen
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    # Only what the first frame needs, the sound card is started by load_resources()
+    pygame.display.init()
+    pygame.font.init()
+    screen = viewport.configure(size, mode, scale, native_hud)
+    assets.open_archive()
+    runtime.configure(seed, headless)
+
+def load_sounds():
+    """This function takes no parameters. It loads every sound effect, sets
+    its volume and returns the sound manager that plays them."""
     explosion_sound = []
     death_sound = pygame.mixer.Sound("./sound/explosions/death.wav")    
     hit_sound = pygame.mixer.Sound("./sound/explosions/explosion5.wav")
@@ -61,6 +129,112 @@ def game():
     hit_sound.set_volume(0.1)
     death_sound.set_volume(1.0)
     turret_sound.set_volume(0.05)
+    
+    # Each kind of sound plays on its own channels
+    sounds = audio.SoundManager(SOUND_CHANNELS)
+    sounds.add("death", death_sound, "player", audio.ALWAYS)
+    sounds.add("hit", hit_sound, "impacts", audio.NORMAL, 80)
+    sounds.add("plasma", plasma_sound, "shots", audio.NORMAL, 100)
+    sounds.add("turret", turret_sound, "shots", audio.LOW, 100)
+    for i in range(5):
+        sounds.add("explosion" + str(i), explosion_sound[i], "explosions", audio.HIGH, 60)
+    return sounds
+
+def load_images():
+    """This function takes no parameters. It decodes the images every game
+    draws into the image cache, and makes their rotated copies, so the first
+    game does not stall on them."""
+    assets.preload_clips()
+    for image, colorkey in IMAGES:
+        assets.images.load(image, colorkey)
+    for image, speed in TERRAIN:
+        assets.images.wrapped(image, screen.get_width())
+    for image in ROTATED:
+        assets.load_rotations(image, assets.MAGENTA)
+    for image in PROJECTILES:
+        assets.load_rotations(image, assets.MAGENTA).fill()
+
+def load_resources():
+    """This function takes no parameters. It starts the sound card and starts
+    loading the sounds, fonts and images on a background thread, unless
+    they are loaded already, and returns the loader. What it loads is kept
+    for every later game. The statskeeper's font is sized for the window's
+    heads-up display, which is set up before this is first called."""
+    global resources
+    if resources is None:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        resources = loader.Loader([("sounds", load_sounds, ()), \
+                                   ("font", pygame.font.Font, ("./fonts/digital.TTF", 40)), \
+                                   ("hud font", pygame.font.Font, ("./fonts/digital.TTF", 20 * viewport.get_hud_scale())), \
+                                   ("images", load_images, ())])
+        resources.start()
+    return resources
+
+def show_progress(done, total):
+    """This function takes the number of resources loaded and the number to
+    load as parameters. It draws a loading bar at the bottom of the screen,
+    and keeps the window responding while the game waits for them."""
+    pygame.event.pump()
+    bar = pygame.Rect(0, screen.get_height() - 6, screen.get_width(), 6)
+    screen.fill((0, 0, 0), bar)
+    bar.width = bar.width * done // max(total, 1)
+    screen.fill((0, 255, 0), bar)
+    viewport.update([pygame.Rect(0, screen.get_height() - 6, screen.get_width(), 6)])
+
+def results(outcome, stats_keeper, frames, peaks, end_ticks, renderer):
+    """This function takes how the game ended, the statskeeper, the number
+    of frames played, the most sprites alive in each group, the time the
+    game was won, lost or quit and the renderer as parameters, and returns
+    the results of the game. The time the game ended leaves out the
+    countdown back to the menu. The renderer's counts of the pixels pushed
+    to the display are kept under "render"."""
+    outcome = {"outcome": outcome, "score": stats_keeper.get_score(), \
+               "distance": stats_keeper.get_distance(), "health": stats_keeper.get_health(), \
+               "armour": stats_keeper.get_armour(), "frames": frames, "ticks": runtime.get_ticks(), \
+               "end_ticks": end_ticks}
+    for name in peaks:
+        outcome["peak_" + name] = peaks[name]
+    outcome["render"] = renderer.get_stats()
+    return outcome
+
+def game(inputs = None, throttle = True, render_rate = RENDER_RATE, max_skip = MAX_SKIP, timer = None, \
+         wave_settings = None, quality = None):
+    """This is the main-line logic for the Land Raider game. It accepts the 
+    controls to read, which default to the keyboard, whether to hold the game
+    to real time, the frames to draw each second, the most ticks to run
+    without drawing, the profiler that times each phase of the loop, the
+    settings of the enemy waves, which default to the waves file, and the
+    governor that lowers the quality when the game runs slow. A render rate
+    of 0 draws nothing. The game always simulates SIM_RATE ticks a second,
+    and every tick moves the game's clock by the same amount, so a slow frame
+    never changes the game. A game held to real time that draws more frames
+    than ticks draws the sprites part of the way between the last two ticks.
+    It returns the results of the game."""
+    if inputs is None:
+        inputs = controls.Keyboard()
+    if timer is None:
+        timer = profiler.Profiler()
+    if wave_settings is None:
+        wave_settings = waves.load()
+    runtime.start_game_clock()
+    # ENTITIES
+    background = pygame.Surface(screen.get_size()) 
+    background.fill((255, 255, 255)) 
+    screen.blit(background, (0, 0))
+    
+    #LOAD SOUND EFFECTS AND FONT - loaded once and kept between games
+    load_resources().wait(show_progress)
+    sounds = resources.get("sounds")
+    sounds.reset()
+    font = resources.get("font")
+    hud_font = resources.get("hud font")
+    
+    #LOAD MUSIC
+    pygame.mixer.music.load("./music/Two Steps From Hell - Invincible.wav")
+    pygame.mixer.music.set_volume(0.4)
+    pygame.mixer.music.play(-1)
+    
 
              
     #LOAD PLAYER
@@ -73,266 +247,351 @@ def game():
     gun_group = pygame.sprite.Group(gun, turret)
     
     #LOAD TERRAIN
-    ground = sprites.Terrain(screen,"./pictures/background/ground_large.jpg",10)
-    mountain = sprites.Terrain(screen, "./pictures/background/mountains.jpg", 2)
+    terrain = parallax.Parallax(screen, background, TERRAIN)
+    
+    #LOAD EXPLOSION ANIMATIONS
+    assets.preload_clips()
     
-    #LOAD STATSKEEPER
-    stats_keeper = sprites.StatsKeeper() 
+    #LOAD POOLS - make the short lived sprites before the game starts
+    sprites.bullet_pool.reserve(100, "./pictures/bullet/bullet.gif", 0, 0, 0, 7, screen, 1, 5, "bullet", 5)
+    sprites.explosion_pool.reserve(30, "death/explosion", 16, 0, 0)
+    
+    #LOAD BULLET ENGINE - moves straight bullets together when numpy is installed
+    bullet_engine = None
+    if projectiles.numpy is not None:
+        bullet_engine = projectiles.BulletEngine(screen)
+    sprites.bullet_engine = bullet_engine
+    
+    #LOAD MISSILE GUIDANCE - steers every homing missile together once a tick,
+    #in arrays when numpy is installed
+    if projectiles.numpy is not None:
+        missile_guidance = projectiles.MissileEngine(screen)
+    else:
+        missile_guidance = projectiles.HomingGuidance(screen)
+    sprites.missile_guidance = missile_guidance
+    
+    #LOAD STATSKEEPER - drawn at the window's resolution when the world is scaled up
+    hud_scale = viewport.get_hud_scale()
+    stats_keeper = sprites.StatsKeeper(hud_font, hud_scale) 
      
     #LOAD SPRITE GROUPS
     player_bullets = pygame.sprite.Group()
     enemy_projectiles = pygame.sprite.Group()
     enemies = pygame.sprite.Group() 
     explosions = pygame.sprite.Group() 
-    allSprites = pygame.sprite.OrderedUpdates(mountain, ground, player_group, \
-                                              enemies, player_bullets, enemy_projectiles, gun_group, explosions, stats_keeper)
     
-    #LOAD FONT
-    font = pygame.font.Font("./fonts/digital.TTF", 40)
+    #LOAD RENDERER - keeps every sprite on its layer between frames, and
+    #where they were on the last tick when frames are drawn between ticks
+    interpolate = throttle and render_rate > SIM_RATE
+    renderer = render.Renderer(screen, background, interpolate = interpolate)
+    renderer.add(render.TERRAIN, *terrain.get_sprites())
+    viewport.clear_hud()
+    if hud_scale > 1:
+        viewport.current.add_hud(stats_keeper)
+    else:
+        renderer.add(render.HUD, stats_keeper)
+    renderer.track(render.PLAYER, player_group)
+    renderer.track(render.ENEMIES, enemies)
+    # The bullet engine and the missile guidance move every projectile
+    renderer.track(render.PROJECTILES, player_bullets, enemy_projectiles, update = bullet_engine is None)
+    renderer.track(render.GUNS, gun_group)
+    renderer.track(render.EXPLOSIONS, explosions)
+    
+    #LOAD BATTLE - the fighting and moving done in every tick, shared with the
+    #scenario benchmarks
+    combat = battle.Battle(player, player_group, stats_keeper, player_bullets, enemy_projectiles, enemies, \
+                           explosions, sounds)
     
     # ASSIGN  
-    clock = pygame.time.Clock() 
     keepGoing = True
+    frames = 0
+    
+    # Loop variables - used for deciding when to simulate and when to draw
+    tick_time = TICK_TIME
+    render_time = 0
+    if interpolate:
+        render_time = 1000.0 / render_rate
+    elif render_rate:
+        render_time = 1000.0 / min(render_rate, SIM_RATE)
+    accumulator = 0.0
+    since_render = render_time
+    last_time = time.perf_counter()
     
     # Gun variables - used for tracking cooldown and which gun is used
     las_gun = True
-    cool_down = pygame.time.get_ticks()
+    cool_down = runtime.get_ticks()
     
     # Statskeeper variables - used for tracking time and game state
     distance_timer = 0
     armour_timer = 0
     turret_timer = 0
-    distance_track = 100
     game_over = False
     death = False
+    ending = "quit"
+    labels = None
+    peaks = {"enemies": 0, "projectiles": 0, "bullets": 0, "explosions": 0}
+    
+    # Quality variables - lowered by the governor when the game runs slow
+    sprites.explosion_step = 1
+    projectile_cap = None
     
-    #Spawn - used for spawning enemies
-    spawn_factor = 0
+    #Spawn - used for spawning enemies a few at a time as the waves grow
+    scheduler = waves.WaveScheduler(screen, wave_settings)
+    
+    #Autopilot - controls that play by themselves are shown the game every tick
+    observe = getattr(inputs, "observe", None)
+    if observe is not None:
+        snapshot = autopilot.Snapshot(screen, player, gun, turret, stats_keeper, enemies, enemy_projectiles)
             
     # LOOP 
+    timer.skip()
     while keepGoing: 
       
-        # TIME 
-        clock.tick(30)
+        # TIME - add up the real time passed, but never fall further behind
+        # than the most ticks that can be simulated without drawing
+        if throttle:
+            now = time.perf_counter()
+            elapsed = (now - last_time) * 1000.0
+            last_time = now
+        else:
+            elapsed = tick_time
+        accumulator = min(accumulator + elapsed, tick_time * (max_skip + 1))
+        since_render = min(since_render + elapsed, render_time + tick_time)
+        if accumulator < tick_time and not (interpolate and since_render >= render_time):
+            wait = tick_time - accumulator
+            if interpolate:
+                wait = min(wait, render_time - since_render)
+            pygame.time.wait(int(wait))
+            timer.skip()
+            continue
         
-        # EVENT HANDLING
+        # SIMULATE - run every tick that is due, each one moving the game's
+        # clock by the same amount
+        work_start = time.perf_counter()
+        ticks = 0
+        while accumulator >= tick_time:
+            accumulator -= tick_time
+            ticks += 1
+            runtime.clock.advance(tick_time)
+            frames += 1
         
-        # Get all keys pressed
-        pressedkeys = pygame.key.get_pressed()
+            # EVENT HANDLING
+        
+            # Get all keys pressed and events from the controls. The time an
+            # autopilot takes to decide is left out of the tick's timings.
+            if observe is not None:
+                decide_start = time.perf_counter()
+                observe(snapshot.update(las_gun, frames))
+                pressedkeys, events = inputs.poll()
+                work_start += time.perf_counter() - decide_start
+                timer.skip()
+            else:
+                pressedkeys, events = inputs.poll()
         
-        for event in pygame.event.get(): 
+            for event in events: 
             
-            # If quit button pressed, stop music and return to menu
-            if event.type == pygame.QUIT: 
-                pygame.mixer.music.stop 
-                screen.fill((255, 255, 255))
-                return
-            if event.type == pygame.KEYDOWN:                       
-                #Switch weapons
-                if event.key == pygame.K_c:
-                    if las_gun:
-                        las_gun = False
-                    else:
-                        las_gun = True
+                # If quit button pressed, stop music and return to menu
+                if event.type == pygame.QUIT: 
+                    pygame.mixer.music.stop 
+                    screen.fill((255, 255, 255))
+                    # A game quit after it was won or lost keeps how it ended
+                    if game_over:
+                        return results(ending, stats_keeper, frames, peaks, over_timer, renderer)
+                    return results(ending, stats_keeper, frames, peaks, runtime.get_ticks(), renderer)
+                if event.type == pygame.KEYDOWN:                       
+                    #Switch weapons
+                    if event.key == pygame.K_c:
+                        if las_gun:
+                            las_gun = False
+                        else:
+                            las_gun = True
+                    #Show or hide the profiler's overlay
+                    elif event.key == pygame.K_F3:
+                        timer.toggle_overlay()
+                        renderer.redraw()
+            timer.mark("input")
                         
-        if not death: 
-            #Moves player left or right
-            if pressedkeys[pygame.K_LEFT]:
-                player.change_direction(False)  
-            if pressedkeys[pygame.K_RIGHT]:
-                player.change_direction(True)
+            if not death: 
+                #Moves player left or right
+                if pressedkeys[pygame.K_LEFT]:
+                    player.change_direction(False)  
+                if pressedkeys[pygame.K_RIGHT]:
+                    player.change_direction(True)
             
-            #Changes gun angle
-            if pressedkeys[pygame.K_a]:
-                if las_gun:
-                    if gun.get_angle() > 179:
-                        pass
-                    else:
-                        gun.change_angle(True)
-                else:
-                    if turret.get_angle() > 179:
-                        pass
+                #Changes gun angle
+                if pressedkeys[pygame.K_a]:
+                    if las_gun:
+                        if gun.get_angle() > 179:
+                            pass
+                        else:
+                            gun.change_angle(True)
                     else:
-                        turret.change_angle(True)
+                        if turret.get_angle() > 179:
+                            pass
+                        else:
+                            turret.change_angle(True)
                         
-            if pressedkeys[pygame.K_d]:
-                if las_gun:
-                    if gun.get_angle() < 1:
-                        pass
-                    else:
-                        gun.change_angle(False) 
-                else:
-                    if turret.get_angle() < 1:
-                        pass
+                if pressedkeys[pygame.K_d]:
+                    if las_gun:
+                        if gun.get_angle() < 1:
+                            pass
+                        else:
+                            gun.change_angle(False) 
                     else:
-                        turret.change_angle(False)
+                        if turret.get_angle() < 1:
+                            pass
+                        else:
+                            turret.change_angle(False)
                         
-            #If space bar pressed, shoot bullet according to gun and cooldown  
-            if pressedkeys[pygame.K_SPACE]:
-                if not las_gun and pygame.time.get_ticks() - cool_down > 120 \
-                   and stats_keeper.get_turret() > 0:
-                    #Add random factor into shots
-                    rand_factor = random.randrange(-1,2)
-                    rand_factor *= random.random() * 7
-                    #Add bullet into bullet group
-                    bullet = sprites.Bullet("./pictures/bullet/plasma_bullet.gif",player.rect.centerx-26, \
-                                            player.rect.centery-30,turret.get_angle()+rand_factor,15,screen,40,None,None,None,3)
-                    player_bullets.add(bullet)   
-                    #Adjust cooldown, statskeeper, and play sound
-                    cool_down = pygame.time.get_ticks()
-                    stats_keeper.set_turret(-1)
-                    turret_sound.play()
-                elif las_gun and pygame.time.get_ticks() - cool_down > 500:
-                    #Add bullet to bullet group
-                    bullet = sprites.Bullet("./pictures/bullet/plasma_shot.gif",player.rect.centerx+11, \
-                                            player.rect.centery+6,gun.get_angle(),20,screen,90,None,None,None,5)
-                    player_bullets.add(bullet) 
-                    #Adjust cooldown, and play sound
-                    cool_down = pygame.time.get_ticks()
-                    plasma_sound.play()
+                #If space bar pressed, shoot bullet according to gun and cooldown  
+                if pressedkeys[pygame.K_SPACE]:
+                    if not las_gun and runtime.get_ticks() - cool_down > 120 \
+                       and stats_keeper.get_turret() > 0:
+                        #Add random factor into shots
+                        rand_factor = runtime.rng.randrange(-1,2)
+                        rand_factor *= runtime.rng.random() * 7
+                        #Add bullet into bullet group
+                        bullet = sprites.bullet_pool.acquire("./pictures/bullet/plasma_bullet.gif",player.rect.centerx-26, \
+                                                             player.rect.centery-30,turret.get_angle()+rand_factor,15,screen,40,None,None,None,3)
+                        player_bullets.add(bullet)   
+                        #Adjust cooldown, statskeeper, and play sound
+                        cool_down = runtime.get_ticks()
+                        stats_keeper.set_turret(-1)
+                        sounds.play("turret")
+                    elif las_gun and runtime.get_ticks() - cool_down > 500:
+                        #Add bullet to bullet group
+                        bullet = sprites.bullet_pool.acquire("./pictures/bullet/plasma_shot.gif",player.rect.centerx+11, \
+                                                             player.rect.centery+6,gun.get_angle(),20,screen,90,None,None,None,5)
+                        player_bullets.add(bullet) 
+                        #Adjust cooldown, and play sound
+                        cool_down = runtime.get_ticks()
+                        sounds.play("plasma")
                                                    
-            #Adjust the gun location according to player
-            gun.adjust_xy(player.rect.centerx + 11, player.rect.centery + 6)
-            turret.adjust_xy(player.rect.centerx - 26, player.rect.centery - 30)
+                #Adjust the gun location according to player
+                gun.adjust_xy(player.rect.centerx + 11, player.rect.centery + 6)
+                turret.adjust_xy(player.rect.centerx - 26, player.rect.centery - 30)
+            timer.mark("player")
                      
-        if not game_over:            
-            #Spawn enemies
-            if len(enemies) < spawn_factor:
-                enemy1 = sprites.Enemy_Jet(screen)
-                enemy2 = sprites.Enemy_Chopper(screen)
-                enemy3 = sprites.Enemy_Hover_Chopper(screen)
-                enemy4 = sprites.Enemy_Helicopter(screen)
-                enemy5 = sprites.Enemy_Gunner(screen)
-                enemies.add(enemy1,enemy2,enemy3,enemy4,enemy5)            
+            if not game_over:            
+                #Spawn enemies
+                enemies.add(*scheduler.update(stats_keeper.get_distance(), enemies))
+                timer.mark("spawn")
                                      
-            #Enemies actions
-            for enemy in enemies:
-                #Get player x and y
-                enemy.store_player_xy(player.rect.centerx, player.rect.centery)
-                
-                #Enemy shooting
-                if enemy.is_shooting():
-                    bullet = enemy.get_bullet()
-                    enemy_projectiles.add(bullet)
-                                                 
-                #Enemy collisions     
-                for bullet in pygame.sprite.spritecollide(enemy, player_bullets, True):
-                    #Adjust enemy health, if below 0, kill sprite and add explosion
-                    enemy.take_damage(bullet.get_damage())               
-                    if enemy.get_health() < 0:
-                        stats_keeper.set_statistics(score = enemy.get_points())   
-                        enemy.kill()
-                        explosion = sprites.Explosion("death/explosion",16, enemy.rect.centerx,enemy.rect.bottom)
-                        explosions.add(explosion)
-                        sound = random.randrange(0,5)
-                        explosion_sound[sound].play()
-            
-            #Adjust all projectiles
-            for projectile in enemy_projectiles:
-                explosion = None
-                #If projectile is a missile, pass the coordinates of player.
-                if isinstance(projectile, sprites.Missile):
-                    projectile.store_player_xy(player.rect.centerx, \
-                                               player.rect.centery)
-                #If projectile hits player, adjust damage on player and 
-                #instantiate explosion for projectile
-                if pygame.sprite.spritecollide(projectile, player_group, False):
-                    stats_keeper.take_damage(projectile.get_damage())
-                    explosion = sprites.Explosion(projectile.get_death()+"/explosion",\
-                                                  projectile.get_frames(),projectile.rect.centerx, projectile.rect.centery + 40)
-                    hit_sound.play()
-                #If projectile is exploding due to hitting ground, instantiate 
-                #explosion for projectile
-                if projectile.is_exploding():
-                    explosion = sprites.Explosion(projectile.get_death()+"/explosion",\
-                                                  projectile.get_frames(),projectile.rect.centerx, projectile.rect.centery)
-                #If there is explosions, add to explosions group
-                if explosion:
-                    explosions.add(explosion)
-                    projectile.kill()
-                    
-            #Checks if enemy projectiles hits player's bullets, adjust score
-            #and the bullet's health for the player
-            for projectile in pygame.sprite.groupcollide(enemy_projectiles, player_bullets, False, False):
-                stats_keeper.set_statistics(projectile.get_points())
-                for bullet in pygame.sprite.groupcollide(player_bullets, enemy_projectiles, False, True):
-                    bullet.set_health()
-                                                   
-            #ADJUST SPAWN FACTORS
-            if stats_keeper.get_distance() < distance_track and not game_over:
-                spawn_factor += 1
-                distance_track -= 3
+                #Enemies actions and collisions
+                combat.fight(timer, projectile_cap)
                        
-        #ADJUST STATSKEEPER
-            #Increase the amount of armour
-            if (pygame.time.get_ticks() - armour_timer) > 350 and \
-               stats_keeper.get_armour() < 100:
-                stats_keeper.set_statistics(armour = 1)
-                armour_timer = pygame.time.get_ticks()
-            #Increase the amount of turret ammo based on cooldown, and 
-            #whether turret is still being pressed
-            if (pygame.time.get_ticks() - turret_timer) > 250 and \
-               stats_keeper.get_turret() < 300 and not pressedkeys[pygame.K_SPACE]:
-                stats_keeper.set_turret(1)
-                turret_timer = pygame.time.get_ticks()
-            elif las_gun and (pygame.time.get_ticks() - turret_timer) > 250 \
-                 and stats_keeper.get_turret() < 300:
-                stats_keeper.set_turret(1)
-                turret_timer = pygame.time.get_ticks()
-            #Decrease the amount of distance
-            if (pygame.time.get_ticks() - distance_timer) > 2500:
-                stats_keeper.set_statistics(distance = -1)
-                distance_timer = pygame.time.get_ticks()
+            #ADJUST STATSKEEPER
+                #Increase the amount of armour
+                if (runtime.get_ticks() - armour_timer) > ARMOUR_TIME and \
+                   stats_keeper.get_armour() < 100:
+                    stats_keeper.set_statistics(armour = 1)
+                    armour_timer = runtime.get_ticks()
+                #Increase the amount of turret ammo based on cooldown, and 
+                #whether turret is still being pressed
+                if (runtime.get_ticks() - turret_timer) > TURRET_TIME and \
+                   stats_keeper.get_turret() < 300 and not pressedkeys[pygame.K_SPACE]:
+                    stats_keeper.set_turret(1)
+                    turret_timer = runtime.get_ticks()
+                elif las_gun and (runtime.get_ticks() - turret_timer) > TURRET_TIME \
+                     and stats_keeper.get_turret() < 300:
+                    stats_keeper.set_turret(1)
+                    turret_timer = runtime.get_ticks()
+                #Decrease the amount of distance
+                if (runtime.get_ticks() - distance_timer) > DISTANCE_TIME:
+                    stats_keeper.set_statistics(distance = -1)
+                    distance_timer = runtime.get_ticks()
                 
-            #CHECKS IF PLAYER WON
-            if stats_keeper.get_distance() < 1:           
-                game_over = True
-                over_timer = pygame.time.get_ticks()
-                message = "YOU WIN!"
-            #CHECKS IF PLAYER LOST - empty all sprites if true and play death 
-            #animation
-            if stats_keeper.get_health() == 0:
-                explosion = sprites.Explosion("player/explosion",15,player.rect.centerx,player.rect.bottom)
-                explosions.add(explosion)
-                player_group.empty()
-                gun_group.empty()
-                game_over = True 
-                over_timer = pygame.time.get_ticks()
-                message = "YOU LOSE!"
-                death_sound.play()
-                death = True
-        else:
-            #If game is over, set all background to 0 speed, and explode all enemies. Return to menu in 10 seconds
-            ground.set_speed(0)
-            mountain.set_speed(0)
-            enemy_projectiles.empty()
-            for enemy in enemies:
-                explosion = sprites.Explosion("end/explosion",5,enemy.rect.centerx,enemy.rect.bottom)
-                explosions.add(explosion)
-                enemy.kill()        
-            if pygame.time.get_ticks() - over_timer > 10000:
-                pygame.mixer.music.stop 
-                screen.fill((255, 255, 255))
-                return
+                #CHECKS IF PLAYER WON
+                if stats_keeper.get_distance() < 1:           
+                    game_over = True
+                    over_timer = runtime.get_ticks()
+                    message = "YOU WIN!"
+                    ending = "win"
+                #CHECKS IF PLAYER LOST - empty all sprites if true and play death 
+                #animation
+                if stats_keeper.get_health() == 0:
+                    explosion = sprites.explosion_pool.acquire("player/explosion",15,player.rect.centerx,player.rect.bottom)
+                    explosions.add(explosion)
+                    player_group.empty()
+                    gun_group.empty()
+                    game_over = True 
+                    over_timer = runtime.get_ticks()
+                    message = "YOU LOSE!"
+                    sounds.play("death")
+                    death = True
+                    ending = "lose"
+            else:
+                #If game is over, set all background to 0 speed, and explode all enemies. Return to menu in 10 seconds
+                terrain.stop()
+                enemy_projectiles.empty()
+                for enemy in enemies:
+                    explosion = sprites.explosion_pool.acquire("end/explosion",5,enemy.rect.centerx,enemy.rect.bottom)
+                    explosions.add(explosion)
+                    enemy.kill()        
+                if runtime.get_ticks() - over_timer > 10000:
+                    pygame.mixer.music.stop 
+                    screen.fill((255, 255, 255))
+                    return results(ending, stats_keeper, frames, peaks, over_timer, renderer)
                 
                                                                                            
-        # REFRESH SCREEN
-        allSprites = pygame.sprite.OrderedUpdates(mountain, ground, player_group, enemies, player_bullets, \
-                                                  enemy_projectiles, gun_group, explosions, stats_keeper)
-        allSprites.clear(screen, background) 
-        allSprites.update() 
-        allSprites.draw(screen) 
-        # Display game state on screen if game is over
-        if game_over:
-            label = font.render(message,1,(0,0,0))
-            label2 = font.render("Your Score: "+str(stats_keeper.get_score()),1,(0,0,0))
-            screen.blit(label,(50,150))   
-            screen.blit(label2,(50,250))   
-        pygame.display.flip() 
+            timer.mark("stats")
+                                                                                           
+            # UPDATE SPRITES
+            combat.move(renderer)
+            if hud_scale > 1:
+                stats_keeper.update()
+            timer.mark("update")
+            
+            # Keep the most sprites alive in each group
+            peaks["enemies"] = max(peaks["enemies"], len(enemies))
+            peaks["projectiles"] = max(peaks["projectiles"], len(enemy_projectiles))
+            peaks["bullets"] = max(peaks["bullets"], len(player_bullets))
+            peaks["explosions"] = max(peaks["explosions"], len(explosions))
+            
+        # REFRESH SCREEN - skipped when the ticks are falling behind
+        if render_rate and since_render >= render_time:
+            since_render -= render_time
+            # Frames between ticks show the part of the tick that has passed
+            renderer.draw(1.0 - accumulator / tick_time)
+            timer.mark("draw")
+            # Display game state on screen if game is over
+            if game_over:
+                # Render the messages once, the score no longer changes
+                if not labels:
+                    labels = (font.render(message,1,(0,0,0)), \
+                              font.render("Your Score: "+str(stats_keeper.get_score()),1,(0,0,0)))
+                renderer.blit(labels[0],(50,150))   
+                renderer.blit(labels[1],(50,250))   
+            # Display the profiler's timings and the sprites in each group
+            if timer.overlay:
+                renderer.blit(timer.render({"enemies": len(enemies), "player bullets": len(player_bullets), \
+                                            "enemy projectiles": len(enemy_projectiles), \
+                                            "explosions": len(explosions), \
+                                            "sounds dropped": sounds.get_dropped()}), (10, 40))
+            timer.mark("hud")
+            renderer.present() 
+            timer.mark("present")
+        timer.frame()
+        
+        # QUALITY - shed work while the ticks take longer than their budget
+        if quality and ticks and quality.record((time.perf_counter() - work_start) * 1000.0 / ticks):
+            sprites.explosion_step = quality.get("explosion_step")
+            projectile_cap = quality.get("projectile_cap")
+            sounds.set_enabled(quality.get("sounds"))
+            terrain.set_quality(quality.get("parallax"))
+            renderer.redraw()
     
-def menu():
-    """This function is the mainline logic for the game's menu. It accepts no variables
-    and returns nothing."""
+def menu(render_rate = RENDER_RATE, timer = None, record = None, seed = None, govern = True, \
+         startup = False, idle = None):
+    """This function is the mainline logic for the game's menu. It accepts the
+    frames to draw each second in the game, the profiler for the game, a file
+    to record each game to with the seed to record it with, whether to lower
+    the quality when the game runs slow, whether to only measure the startup,
+    and the seconds to measure the menu's use of the processor for before
+    leaving, or None to stay until the player leaves. The menu is drawn before
+    anything else is loaded, and the game's resources load behind it. The
+    menu sleeps until there is an event and draws only what changed. It
+    returns nothing."""
     # DISPLAY
     pygame.display.set_caption("Land Raider")
     
@@ -341,14 +600,9 @@ def menu():
     background.fill((255, 255, 255)) 
     screen.blit(background, (0, 0)) 
     
-    #LOAD MUSIC
-    pygame.mixer.music.load("./music/Two Steps From Hell - Moving Mountains.wav")
-    pygame.mixer.music.set_volume(0.7)
-    pygame.mixer.music.play(-1)
-    
     # Load menu and instruction picture
-    menu = pygame.image.load("./pictures/menus/game_menu.gif").convert()
-    instructions = pygame.image.load("./pictures/menus/instructions_menu.gif").convert()
+    menu = assets.load_picture("./pictures/menus/game_menu.gif")
+    instructions = assets.load_picture("./pictures/menus/instructions_menu.gif")
     
     # Load font and messages
     font = pygame.font.Font("./fonts/biondi.ttf", 30)
@@ -359,83 +613,283 @@ def menu():
     label1_hover = font.render("play", 1, (0, 255, 0))
     label2_hover = font.render("exit", 1, (0, 255, 0))
     label3_hover = font.render("continue", 1, (0, 255, 0))
+    
+    # Show the first frame, then load everything else behind the menu
+    screen.blit(menu, (0, 0))
+    screen.blit(label1, (375, 430))
+    screen.blit(label2, (380, 517))
+    viewport.flip()
+    first_frame = time.perf_counter()
+    load_resources()
+    if startup:
+        resources.wait()
+        loaded = time.perf_counter()
+        print("first frame %.1f ms" % ((first_frame - START_TIME) * 1000.0))
+        for name, ms in resources.times:
+            print("  %-8s %.1f ms" % (name, ms))
+        print("loaded      %.1f ms" % ((loaded - START_TIME) * 1000.0))
+        pygame.quit()
+        return
+    
+    #LOAD MUSIC
+    pygame.mixer.music.load("./music/Two Steps From Hell - Moving Mountains.wav")
+    pygame.mixer.music.set_volume(0.7)
+    pygame.mixer.music.play(-1)
            
     # ASSIGN  
-    clock = pygame.time.Clock() 
     keepGoing = True
     
-    # Keep track of screens
-    menu_screen = True
-    instructions_screen = False
-    game_playing = False
+    # The buttons of each screen, as the button, its label, its label when
+    # the mouse is over it and where the label is drawn
+    buttons = {"menu": [("play", PLAY_BUTTON, label1, label1_hover, (375, 430)), \
+                        ("exit", EXIT_BUTTON, label2, label2_hover, (380, 517))], \
+               "instructions": [("continue", EXIT_BUTTON, label3, label3_hover, (338, 516))]}
+    pictures = {"menu": menu, "instructions": instructions}
+    
+    # Keep track of the screen shown, the button under the mouse and
+    # whether the whole screen must be drawn again
+    current = "menu"
+    hovered = None
+    redraw = True
+    
+    # Measure the processor time used while the menu is idle
+    if idle is not None:
+        resources.wait()
+        idle_start = time.perf_counter()
+        cpu_start = time.process_time()
+        wakes = 0
+        draws = 0
             
     # LOOP 
     while keepGoing: 
       
-        # TIME 
-        clock.tick(30)
-        
-        # Get mouse position
-        x, y = pygame.mouse.get_pos()
-       
-        for event in pygame.event.get(): 
+        # EVENTS - sleep until something happens
+        wait = MENU_WAIT
+        if not resources.is_done():
+            wait = LOADING_WAIT
+        events = [pygame.event.wait(wait)] + pygame.event.get()
+        clicked = None
+        for event in events: 
             #If player presses quit button, exit the game
             if event.type == pygame.QUIT: 
                 keepGoing = False
             #Check if mouse button is pressed and whether it is within buttons
-            if pygame.mouse.get_pressed()[0]:
-                if menu_screen:
-                    if x > 280 and x < 545 and y < 465 and y > 400:
-                        #Loads instruction screen
-                        menu_screen = False
-                        instructions_screen = True
-                        screen.fill((255, 255, 255)) 
-                    elif x > 280 and x < 545 and y < 555 and y > 490:
-                        #Exits the game
-                        keepGoing = False
-                elif instructions_screen:
-                    if x > 280 and x < 545 and y < 555 and y > 490:
-                        #Loads sets screen, and loads the game
-                        instructions_screen = False
-                        menu_screen = True
-                        game_playing = True
-                        pygame.mixer.music.stop 
-                        screen.fill((255, 255, 255))
-                        game()
-                                                 
-        if menu_screen:
-            #Blit the menu screen
-            screen.blit(menu, (0, 0))
-            #Check if mouse is hovering over buttons
-            if x > 280 and x < 545 and y < 465 and y > 400:
-                screen.blit(label1_hover, (375, 430))
-            else:
-                screen.blit(label1, (375, 430))                
-            if x > 280 and x < 545 and y < 555 and y > 490:
-                screen.blit(label2_hover, (380, 517))
-            else:
-                screen.blit(label2, (380, 517))              
-        elif instructions_screen:
-            #Blit the instructions screen
-            screen.blit(instructions, (0, 0))
-            #Check if mouse is hovering over buttons
-            if x > 280 and x < 545 and y < 555 and y > 490:
-                screen.blit(label3_hover, (338, 516))
-            else:
-                screen.blit(label3, (338, 516))
-         
-        #Resets the music after game
-        if game_playing:
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                for name, button, label, hover, position in buttons[current]:
+                    if button.collidepoint(viewport.to_logical(event.pos)):
+                        clicked = name
+        
+        if clicked == "play":
+            #Loads instruction screen
+            current = "instructions"
+            redraw = True
+        elif clicked == "exit":
+            #Exits the game
+            keepGoing = False
+        elif clicked == "continue":
+            #Loads sets screen, and loads the game
+            current = "menu"
+            redraw = True
+            screen.fill((255, 255, 255))
+            inputs = None
+            if record:
+                inputs = replay.Recorder(controls.Keyboard(), seed)
+            quality = None
+            if govern:
+                # A recorded game only sheds work that does not change its replay
+                levels = governor.LEVELS
+                if record:
+                    levels = governor.cosmetic()
+                quality = governor.Governor(TICK_TIME, levels, log = print)
+            outcome = game(inputs, True, render_rate, MAX_SKIP, timer, None, quality)
+            viewport.clear_hud()
+            if record:
+                inputs.save(record, outcome["score"])
+            #Resets the music after game
             pygame.mixer.music.load("./music/Two Steps From Hell - Moving Mountains.wav")
             pygame.mixer.music.set_volume(0.7)
             pygame.mixer.music.play(-1)
-            game_playing = False
-                                         
-        # REFRESH SCREEN    
-        pygame.display.flip() 
+        
+        #Find the button the mouse is over
+        over = None
+        mouse = viewport.to_logical(pygame.mouse.get_pos())
+        for name, button, label, hover, position in buttons[current]:
+            if button.collidepoint(mouse):
+                over = name
+        
+        # REFRESH SCREEN - the whole screen, or only the labels that changed
+        if redraw:
+            screen.blit(pictures[current], (0, 0))
+        changed = []
+        for name, button, label, hover, position in buttons[current]:
+            if redraw or name in (hovered, over) and hovered != over:
+                if name == over:
+                    label = hover
+                area = label.get_rect(topleft = position)
+                screen.blit(pictures[current], area, area)
+                screen.blit(label, position)
+                changed.append(area)
+        if redraw:
+            viewport.flip()
+        elif changed:
+            viewport.update(changed)
+        if idle is not None:
+            wakes += 1
+            draws += bool(redraw or changed)
+        hovered = over
+        redraw = False
+        
+        #Show how much of the game is loaded
+        if not resources.is_done():
+            show_progress(*resources.get_progress())
+        
+        #Stop measuring once the time is up
+        if idle is not None and time.perf_counter() - idle_start >= idle:
+            elapsed = time.perf_counter() - idle_start
+            print("menu idle %.1f s: %.2f%% of a processor, %i wakes, %i draws" % \
+                  (elapsed, (time.process_time() - cpu_start) * 100.0 / elapsed, wakes, draws))
+            keepGoing = False
           
-    # Close the game window 
+    # Close the game window once the loader is not using it
+    resources.wait()
     pygame.quit()      
           
+def headless(script, seed = None, render_rate = RENDER_RATE, timer = None, record = None, \
+             quality = None, pilot = None, display = ()):
+    """This function takes a script of controls, a seed, the frames to draw
+    for every 30 ticks, a profiler, a file to record the game to, the
+    governor that lowers the quality, an autopilot to play instead of the
+    script and the resolution, way of showing the game, scale and heads-up
+    display to give setup() as parameters. It plays one game without a
+    window, sound card or frame limit, and returns the results of the
+    game."""
+    setup(True, seed, *display)
+    if pilot is not None:
+        inputs = pilot
+    else:
+        inputs = controls.ScriptedInput(script)
+    if record:
+        inputs = replay.Recorder(inputs, seed)
+    outcome = game(inputs, False, render_rate, MAX_SKIP, timer, None, quality)
+    if record:
+        inputs.save(record, outcome["score"])
+    return outcome
+
+def play_replay(filename, render_rate = RENDER_RATE, timer = None):
+    """This function takes the name of a replay file, the frames to draw for
+    every 30 ticks and a profiler as parameters. It plays the recorded game
+    again without a window, sound card or frame limit, and returns the
+    results of the game and the score that was recorded."""
+    recording = replay.Replay(filename)
+    setup(True)
+    outcome = game(recording.get_inputs(), False, render_rate, MAX_SKIP, timer)
+    return outcome, recording.score
+
+def report(outcome, elapsed, timer, pilot = None):
+    """This function takes the results of a game, the seconds it took, the
+    profiler and the autopilot that played as parameters, and prints them.
+    The autopilot's time is left out of the frames per second. Each phase's
+    time is totalled over the whole game, not only the last frames, and the
+    sprite pools' counters are printed to size them."""
+    print(" ".join(["%s=%s" % (key, outcome[key]) for key in sorted(outcome) if key != "render"]))
+    if pilot is not None:
+        elapsed -= pilot.decide_time
+        print("autopilot: %i decisions, %.3f ms each, %.3f ms at most" % \
+              (pilot.decisions, pilot.get_average(), pilot.longest * 1000.0))
+    print("%.1f frames per second" % (outcome["frames"] / elapsed))
+    render_stats = outcome["render"]
+    if render_stats["frames"]:
+        print("pushed %i pixels a frame, %.1f%% of a full flip, %i of %i frames flipped" % \
+              (render_stats["average"], render_stats["average"] * 100.0 / render_stats["screen"], \
+               render_stats["flips"], render_stats["frames"]))
+    for pool in (sprites.bullet_pool, sprites.missile_pool, sprites.explosion_pool):
+        pool_stats = pool.get_stats()
+        print("%-9s pool: %6i created, %7i reused, %4i in use, %4i at most, %4i free of %i" % \
+              (pool_stats["class"], pool_stats["created"], pool_stats["reused"], pool_stats["in_use"], \
+               pool_stats["high_water"], pool_stats["free"], pool_stats["limit"]))
+    for phase, total, count in timer.get_totals():
+        print("%-28s %10.1f ms in %6i frames, %.3f ms each" % (phase, total, count, total / count))
+
 # Call the main function 
-menu()
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Land Raider")
+    parser.add_argument("--headless", action = "store_true", \
+                        help = "play one game without a window as fast as possible")
+    parser.add_argument("--seed", type = int, help = "seed for the random numbers")
+    parser.add_argument("--frames", type = int, default = 3000, \
+                        help = "frames to play in a headless game without a script")
+    parser.add_argument("--script", help = "file of controls for a headless game")
+    parser.add_argument("--autopilot", choices = sorted(autopilot.POLICIES), \
+                        help = "policy that plays a headless game instead of a script")
+    parser.add_argument("--render-rate", type = int, default = RENDER_RATE, \
+                        help = "frames drawn each second, 0 to draw nothing")
+    parser.add_argument("--profile", action = "store_true", \
+                        help = "show the profiler's overlay from the start, F3 shows or hides it")
+    parser.add_argument("--profile-classes", action = "store_true", \
+                        help = "time the update of each kind of sprite")
+    parser.add_argument("--trace", help = "file to save a Chrome trace of the loop's phases to")
+    parser.add_argument("--record", help = "file to record the game's keys and seed to")
+    parser.add_argument("--replay", help = "replay file to play back without a window as fast as possible")
+    parser.add_argument("--startup", action = "store_true", \
+                        help = "show the menu, print the time to the first frame and to load the game, and exit")
+    parser.add_argument("--menu-idle", type = float, \
+                        help = "leave the menu alone for this many seconds, print its processor use and exit")
+    parser.add_argument("--display", choices = viewport.MODES, default = viewport.WINDOW, \
+                        help = "show the game in a window, a window the graphics card scales, or the whole screen")
+    parser.add_argument("--resolution", default = "%ix%i" % viewport.SIZE, \
+                        help = "logical resolution the game is drawn at, such as 800x600")
+    parser.add_argument("--scale", type = int, default = 1, \
+                        help = "whole number to scale a window by, drawing the game at its resolution")
+    parser.add_argument("--native-hud", action = "store_true", \
+                        help = "draw the heads-up display at the window's resolution when the game is scaled up")
+    parser.add_argument("--governor", choices = ("auto", "on", "off"), default = "auto", \
+                        help = "lower the quality when frames run long, auto is on except in headless games")
+    args = parser.parse_args()
+    try:
+        size = tuple([int(part) for part in args.resolution.lower().split("x")])
+    except ValueError:
+        size = ()
+    if len(size) != 2 or min(size) < 1:
+        parser.error("--resolution must be WIDTHxHEIGHT, such as 800x600")
+    if args.scale < 1:
+        parser.error("--scale must be 1 or more")
+    # Headless games and replays print the phase averages, and timing the
+    # sprite classes needs the profiler on, so they time from the start
+    timer = profiler.Profiler(args.headless or bool(args.replay) or args.profile_classes, bool(args.trace))
+    if args.profile:
+        timer.toggle_overlay()
+    if args.profile_classes:
+        timer.instrument(sprites.Player, sprites.Terrain, sprites.Gun, sprites.Bullet, \
+                         sprites.Missile, sprites.Enemy_Jet, sprites.Enemy_Chopper, \
+                         sprites.Enemy_Hover_Chopper, sprites.Enemy_Helicopter, \
+                         sprites.Enemy_Gunner, sprites.Explosion, sprites.StatsKeeper)
+    if args.replay:
+        start = time.perf_counter()
+        outcome, score = play_replay(args.replay, args.render_rate, timer)
+        report(outcome, time.perf_counter() - start, timer)
+        if outcome["score"] != score:
+            print("The replay scored %i, the recorded game scored %i" % (outcome["score"], score))
+    elif args.headless:
+        if args.script:
+            script = controls.load_script(args.script)
+        else:
+            script = controls.idle_script(args.frames)
+        pilot = None
+        if args.autopilot:
+            pilot = autopilot.make_autopilot(args.autopilot, args.frames, args.seed)
+        start = time.perf_counter()
+        quality = None
+        if args.governor == "on":
+            levels = governor.LEVELS
+            if args.record:
+                levels = governor.cosmetic()
+            quality = governor.Governor(levels = levels, log = print)
+        outcome = headless(script, args.seed, args.render_rate, timer, args.record, quality, pilot, \
+                           (size, args.display, args.scale, args.native_hud))
+        report(outcome, time.perf_counter() - start, timer, pilot)
+    else:
+        setup(False, args.seed, size, args.display, args.scale, args.native_hud)
+        menu(args.render_rate, timer, args.record, args.seed, args.governor != "off", args.startup, \
+             args.menu_idle)
+    if args.trace:
+        timer.export(args.trace)
\ No newline at end of file
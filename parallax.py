@@ -0,0 +1,63 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for the scrolling layers of terrain behind
+the game. Each moving layer is a terrain sprite that draws only the part of
+its image on screen. Layers that do not move can be drawn once into the
+background instead, so they cost nothing after the first frame.
+"""
+import assets, sprites
+
+class Parallax(object):
+    """This class defines the terrain layers of the game, from back to
+    front."""
+    def __init__(self, screen, background, layers, cache_static = True):
+        """This initializer takes the screen, the background surface, a list
+        of layers and whether to draw still layers into the background as
+        parameters. Each layer is an image name and a speed, with an optional
+        y coordinate for its bottom. Makes a terrain sprite for each layer
+        that is not drawn into the background."""
+        self.__sprites = []
+        self.__speeds = []
+        for layer in layers:
+            image, speed = layer[0], layer[1]
+            bottom = screen.get_height()
+            if len(layer) > 2:
+                bottom = layer[2]
+            if cache_static and not speed and not self.__sprites:
+                # Nothing moves behind this layer, so it never has to be drawn again
+                surface = assets.images.load(image)
+                background.blit(surface, (0, bottom - surface.get_height()))
+            else:
+                self.__sprites.append(sprites.Terrain(screen, image, speed, bottom))
+                self.__speeds.append(speed)
+
+        # Terrain that covers the screen's width hides the bottom of the
+        # layers behind it, so those parts are never drawn
+        cover = screen.get_height()
+        for terrain in reversed(self.__sprites):
+            terrain.hide_below(cover)
+            if terrain.is_opaque() and terrain.rect.bottom >= cover:
+                cover = min(cover, terrain.rect.top)
+
+    def get_sprites(self):
+        """This method accepts no parameters, and returns the terrain sprites
+        from back to front."""
+        return list(self.__sprites)
+
+    def set_speed(self, scale):
+        """This method accepts a number as a parameter, and sets the speed of
+        each layer to its own speed times the number."""
+        for index in range(len(self.__sprites)):
+            self.__sprites[index].set_speed(self.__speeds[index] * scale)
+
+    def set_quality(self, full):
+        """This method accepts whether to draw every layer as a parameter. At
+        low quality only the front layer is drawn, over the background."""
+        for terrain in self.__sprites[:-1]:
+            terrain.visible = full
+            terrain.dirty = 1
+
+    def stop(self):
+        """This method accepts no parameters, and stops every layer."""
+        self.set_speed(0)
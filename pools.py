@@ -0,0 +1,110 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for reusing short lived sprites. Bullets,
+missiles and explosions are taken from a pool when they are made and go
+back to it when they leave their last group, instead of being thrown away.
+"""
+
+class Pooled(object):
+    """This class defines the mixin for sprites that can be reused. The
+    sprite goes back to its pool as soon as it is no longer in any group.
+    The number of times it was taken from a pool tells each use of the
+    sprite apart."""
+    __pool = None
+    acquired = 0
+
+    def set_pool(self, pool):
+        """This method accepts the pool that owns the sprite as a parameter,
+        and stores it."""
+        self.__pool = pool
+
+    def kill(self):
+        """This method accepts no parameters. It removes the sprite from all
+        its groups and gives it back to its pool."""
+        super(Pooled, self).kill()
+        self.__leave()
+
+    def remove_internal(self, group):
+        """This method accepts a group as a parameter. It is called when the
+        sprite is taken out of the group, and gives the sprite back to its
+        pool if that was its last group."""
+        super(Pooled, self).remove_internal(group)
+        if not self.alive():
+            self.__leave()
+
+    def retire(self):
+        """This method accepts no parameters. It is called when the sprite
+        leaves its last group, before it goes back to its pool."""
+        pass
+
+    def __leave(self):
+        """This method accepts no parameters. It retires the sprite and gives
+        it back to its pool once."""
+        self.retire()
+        pool = self.__pool
+        if pool is not None:
+            self.__pool = None
+            pool.release(self)
+
+class SpritePool(object):
+    """This class defines a pool of sprites of one class. Sprites taken from
+    the pool are set up again with reset() instead of being made again."""
+    def __init__(self, sprite_class, limit = 2000):
+        """This initializer takes the class of the sprites and the most free
+        sprites to keep as parameters. Initializes the empty pool and its
+        counters."""
+        self.__class = sprite_class
+        self.__limit = limit
+        self.__free = []
+
+        # Counters used to size the pool
+        self.created = 0
+        self.reused = 0
+        self.in_use = 0
+        self.high_water = 0
+
+    def acquire(self, *args):
+        """This method accepts the parameters of the sprite's initializer, and
+        returns a sprite set up with them, reusing a free one if there is one."""
+        if self.__free:
+            sprite = self.__free.pop()
+            sprite.reset(*args)
+            self.reused += 1
+        else:
+            sprite = self.__class(*args)
+            self.created += 1
+        sprite.set_pool(self)
+        sprite.acquired += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return sprite
+
+    def release(self, sprite):
+        """This method accepts a sprite as a parameter, and keeps it for reuse
+        unless the pool already holds its limit of free sprites."""
+        self.in_use -= 1
+        if len(self.__free) < self.__limit:
+            self.__free.append(sprite)
+
+    def reserve(self, count, *args):
+        """This method accepts a number of sprites and the parameters of the
+        sprite's initializer. It makes sprites ahead of time until the pool
+        holds that many free sprites."""
+        while len(self.__free) < min(count, self.__limit):
+            self.__free.append(self.__class(*args))
+            self.created += 1
+
+    def set_limit(self, limit):
+        """This method accepts the most free sprites to keep as a parameter,
+        and drops the free sprites over the limit."""
+        self.__limit = limit
+        del self.__free[limit:]
+
+    def get_stats(self):
+        """This method accepts no parameters, and returns a dictionary of the
+        pool's counters."""
+        return {"class": self.__class.__name__, "created": self.created, "reused": self.reused, \
+                "in_use": self.in_use, "high_water": self.high_water, "free": len(self.__free), \
+                "limit": self.__limit}
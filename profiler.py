@@ -0,0 +1,177 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for timing the phases of the game loop. The
+loop marks the end of each phase, and the time since the last mark is added
+to that phase. The times are shown in an overlay over the game and can be
+saved as a Chrome trace file, which opens in chrome://tracing or Perfetto.
+A disabled profiler returns from every mark at once, so it costs almost
+nothing to leave the marks in the loop.
+"""
+import json, time, pygame
+from collections import deque
+
+# Frames averaged for the overlay, and frames between redraws of the overlay
+HISTORY = 30
+OVERLAY_RATE = 15
+
+# Most trace events kept, so a long game cannot fill the memory
+TRACE_LIMIT = 500000
+
+class Profiler(object):
+    """This class defines the profiler for the game loop. It keeps the time
+    of each phase in the current frame, the timings of the last frames for
+    the overlay, the totals of each phase over the whole run, and the trace
+    events when tracing."""
+    def __init__(self, enabled = False, trace = False):
+        """This initializer takes whether to time the phases and whether to
+        keep trace events as parameters. Initializes the empty timings. A
+        profiler made enabled keeps timing when the overlay is hidden."""
+        self.enabled = enabled or trace
+        self.trace = trace
+        self.__always = self.enabled
+        self.overlay = False
+        self.__start = time.perf_counter()
+        self.__last = self.__start
+        self.__frame = {}
+        self.__history = deque(maxlen = HISTORY)
+        self.__totals = {}
+        self.__counts = {}
+        self.__order = []
+        self.__events = []
+        self.__classes = {}
+        self.__class_times = {}
+        self.__font = None
+        self.__surface = None
+        self.__frames = 0
+
+    def mark(self, phase):
+        """This method accepts the name of a phase as a parameter. It adds the
+        time since the last mark to the phase."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.__frame[phase] = self.__frame.get(phase, 0.0) + now - self.__last
+        if self.trace and len(self.__events) < TRACE_LIMIT:
+            self.__events.append({"name": phase, "ph": "X", "pid": 1, "tid": 1, \
+                                  "ts": (self.__last - self.__start) * 1000000.0, \
+                                  "dur": (now - self.__last) * 1000000.0})
+        self.__last = now
+
+    def skip(self):
+        """This method accepts no parameters. The time since the last mark is
+        not added to any phase, so waiting for the next tick is not counted."""
+        if self.enabled:
+            self.__last = time.perf_counter()
+
+    def frame(self):
+        """This method accepts no parameters. It ends the current frame and
+        keeps its timings for the overlay."""
+        if not self.enabled:
+            return
+        if self.__class_times:
+            for name in self.__class_times:
+                self.__frame["update " + name] = self.__class_times[name]
+            self.__class_times = {}
+        self.__history.append(self.__frame)
+        for phase in self.__frame:
+            if phase not in self.__totals:
+                self.__totals[phase] = 0.0
+                self.__counts[phase] = 0
+                self.__order.append(phase)
+            self.__totals[phase] += self.__frame[phase]
+            self.__counts[phase] += 1
+        self.__frame = {}
+        self.__frames += 1
+
+    def toggle_overlay(self):
+        """This method accepts no parameters. It shows or hides the overlay,
+        and starts timing the phases when the overlay is shown."""
+        self.overlay = not self.overlay
+        if self.overlay:
+            self.enabled = True
+            self.__surface = None
+        elif not self.__always:
+            self.enabled = False
+            self.__history.clear()
+
+    def get_averages(self):
+        """This method accepts no parameters, and returns a list of each phase
+        and its average time in milliseconds over the last frames, which the
+        overlay shows, in the order the phases first ran."""
+        totals = {}
+        order = []
+        for frame in self.__history:
+            for phase in frame:
+                if phase not in totals:
+                    totals[phase] = 0.0
+                    order.append(phase)
+                totals[phase] += frame[phase]
+        count = max(1, len(self.__history))
+        return [(phase, totals[phase] * 1000.0 / count) for phase in order]
+
+    def get_totals(self):
+        """This method accepts no parameters, and returns a list of each phase,
+        its total time in milliseconds and the number of frames it ran in over
+        the whole run, in the order the phases first ran."""
+        return [(phase, self.__totals[phase] * 1000.0, self.__counts[phase]) for phase in self.__order]
+
+    def render(self, counts):
+        """This method accepts a dictionary of group names and the number of
+        sprites in each as parameters. It returns the overlay surface, drawing
+        it again only every few frames."""
+        if self.__surface is not None and self.__frames % OVERLAY_RATE:
+            return self.__surface
+        if self.__font is None:
+            self.__font = pygame.font.Font(None, 18)
+        averages = self.get_averages()
+        lines = ["%-18s %6.2f ms" % (phase, ms) for phase, ms in averages]
+        lines.append("%-18s %6.2f ms" % ("frame", sum([ms for phase, ms in averages \
+                                                       if not phase.startswith("update ")])))
+        lines.extend(["%-18s %6i" % (name, counts[name]) for name in sorted(counts)])
+        rendered = [self.__font.render(line, 1, (255, 255, 0)) for line in lines]
+        height = self.__font.get_linesize()
+        self.__surface = pygame.Surface((max([line.get_width() for line in rendered]) + 10, \
+                                         height * len(rendered) + 10))
+        for index in range(len(rendered)):
+            self.__surface.blit(rendered[index], (5, 5 + index * height))
+        return self.__surface
+
+    def instrument(self, *classes):
+        """This method accepts sprite classes as parameters. It wraps the
+        update method of each class so its time is added up for every frame."""
+        for sprite_class in classes:
+            if sprite_class in self.__classes:
+                continue
+            self.__classes[sprite_class] = sprite_class.__dict__.get("update")
+            sprite_class.update = self.__timed(sprite_class.__name__, sprite_class.update)
+
+    def uninstrument(self):
+        """This method accepts no parameters, and puts back the update methods
+        of the classes that were wrapped."""
+        for sprite_class, update in self.__classes.items():
+            if update is None:
+                del sprite_class.update
+            else:
+                sprite_class.update = update
+        self.__classes = {}
+
+    def export(self, filename):
+        """This method accepts a filename as a parameter, and saves the trace
+        events to it in Chrome's trace event format."""
+        with open(filename, "w") as trace_file:
+            json.dump({"traceEvents": self.__events, "displayTimeUnit": "ms"}, trace_file)
+
+    def __timed(self, name, update):
+        """This method accepts the name of a class and its update method as
+        parameters, and returns an update method that adds up its time."""
+        profiler = self
+        def timed_update(sprite, *args):
+            """This method calls the sprite's update and adds up its time."""
+            if not profiler.enabled:
+                return update(sprite, *args)
+            start = time.perf_counter()
+            update(sprite, *args)
+            profiler.__class_times[name] = profiler.__class_times.get(name, 0.0) + \
+                                           time.perf_counter() - start
+        return timed_update
@@ -0,0 +1,419 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for moving projectiles together. The
+position, velocity, health and state of every straight bullet are kept in
+numpy arrays, so each frame moves, culls and checks all of them at once.
+The bullet engine is optional and is only used when numpy is installed.
+Homing missiles are steered together in one step each frame, with vector
+math in place of inverse trig. When numpy is installed the missile engine
+steers them in arrays the same way.
+"""
+import math
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Flags kept for each row
+ALIVE = 1
+EXPLODING = 2
+
+class BulletEngine(object):
+    """This class defines the engine that moves straight bullets. Each
+    bullet in a group owns one row of the arrays, and the engine writes the
+    new position back into the bullet's rect every frame."""
+    def __init__(self, screen, capacity = 256):
+        """This initializer takes the screen surface and the starting number
+        of rows as parameters. Initializes the empty arrays."""
+        self.__width = screen.get_width()
+        self.__height = screen.get_height()
+        self.__x = numpy.zeros(capacity)
+        self.__y = numpy.zeros(capacity)
+        self.__vx = numpy.zeros(capacity)
+        self.__vy = numpy.zeros(capacity)
+        self.__health = numpy.zeros(capacity, numpy.int32)
+        self.__flags = numpy.zeros(capacity, numpy.uint8)
+        self.__sprites = [None] * capacity
+        self.__free = list(range(capacity - 1, -1, -1))
+
+    def add(self, sprite, x, y, vx, vy, health):
+        """This method accepts a bullet, its location, the distance it moves
+        each frame along x and y, and its health as parameters. It stores the
+        bullet in a free row and returns the row."""
+        if not self.__free:
+            self.__grow()
+        slot = self.__free.pop()
+        self.__x[slot] = x
+        self.__y[slot] = y
+        self.__vx[slot] = vx
+        self.__vy[slot] = vy
+        self.__health[slot] = health
+        self.__flags[slot] = ALIVE
+        self.__sprites[slot] = sprite
+        return slot
+
+    def remove(self, slot):
+        """This method accepts a row as a parameter. It frees the row and
+        returns the bullet's location, health and whether it was exploding."""
+        state = (float(self.__x[slot]), float(self.__y[slot]), int(self.__health[slot]), \
+                 bool(self.__flags[slot] & EXPLODING))
+        self.__vx[slot] = 0
+        self.__vy[slot] = 0
+        self.__flags[slot] = 0
+        self.__sprites[slot] = None
+        self.__free.append(slot)
+        return state
+
+    def is_exploding(self, slot):
+        """This method accepts a row as a parameter, and returns whether the
+        bullet has hit the ground."""
+        return bool(self.__flags[slot] & EXPLODING)
+
+    def take_health(self, slot):
+        """This method accepts a row as a parameter. It decreases the bullet's
+        health by 1 and returns the new health."""
+        self.__health[slot] -= 1
+        return int(self.__health[slot])
+
+    def get_count(self):
+        """This method accepts no parameters, and returns the number of rows in
+        use."""
+        return len(self.__sprites) - len(self.__free)
+
+    def step(self):
+        """This method accepts no parameters. It moves every bullet, kills the
+        ones that left the screen, flags the ones that hit the ground, and
+        writes the new positions into the rects of the rest."""
+        x = self.__x
+        y = self.__y
+        x += self.__vx
+        y += self.__vy
+        alive = (self.__flags & ALIVE) != 0
+
+        # Round the same way pygame does when a rect is given a float
+        centerx = numpy.copysign(numpy.floor(numpy.abs(x) + 0.5), x)
+        centery = numpy.copysign(numpy.floor(numpy.abs(y) + 0.5), y)
+
+        # Find the bullets that are offscreen or hitting the ground
+        offscreen = alive & ((centerx < -125) | (centerx > self.__width + 125) | (centery < 0))
+        onscreen = alive & ~offscreen
+        self.__flags[onscreen & (centery > self.__height - 50)] |= EXPLODING
+
+        # Move the rects of the bullets still on screen
+        sprites = self.__sprites
+        rows = numpy.flatnonzero(onscreen)
+        for slot, cx, cy in zip(rows.tolist(), centerx[rows].tolist(), centery[rows].tolist()):
+            sprites[slot].rect.center = (cx, cy)
+
+        # Kill the rest, which frees their rows
+        for slot in numpy.flatnonzero(offscreen).tolist():
+            sprites[slot].kill()
+
+    def __grow(self):
+        """This method accepts no parameters, and doubles the number of rows."""
+        size = len(self.__sprites)
+        self.__x = numpy.concatenate((self.__x, numpy.zeros(size)))
+        self.__y = numpy.concatenate((self.__y, numpy.zeros(size)))
+        self.__vx = numpy.concatenate((self.__vx, numpy.zeros(size)))
+        self.__vy = numpy.concatenate((self.__vy, numpy.zeros(size)))
+        self.__health = numpy.concatenate((self.__health, numpy.zeros(size, numpy.int32)))
+        self.__flags = numpy.concatenate((self.__flags, numpy.zeros(size, numpy.uint8)))
+        self.__sprites.extend([None] * size)
+        self.__free.extend(range(size * 2 - 1, size - 1, -1))
+
+class HomingGuidance(object):
+    """This class defines the guidance that steers homing missiles. Each
+    missile keeps its position, direction and launch time here, and every
+    frame all of them turn towards the player and move together."""
+    def __init__(self, screen, homing_time = 2800, max_turn = None, retarget = 1):
+        """This initializer takes the screen surface, the milliseconds a
+        missile homes for, the most degrees it may turn in a frame, or None
+        to turn straight at the player, and the frames between new aims as
+        parameters. Initializes the empty guidance."""
+        self.__width = screen.get_width()
+        self.__height = screen.get_height()
+        self.__homing_time = homing_time
+        self.__retarget = max(1, retarget)
+        self.__frame = 0
+        self.__missiles = {}
+
+        # The sine and cosine of the largest turn, worked out once
+        self.__max_turn = max_turn
+        if max_turn is not None:
+            self.__cos_turn = math.cos(math.radians(max_turn))
+            self.__sin_turn = math.sin(math.radians(max_turn))
+
+    def add(self, sprite, x, y, dx, dy, speed, rotations, launch):
+        """This method accepts a missile, its location, the x and y parts of
+        its direction with y pointing up, its speed, its rotation table and
+        the time it was launched as parameters, and starts steering it."""
+        self.__missiles[sprite] = [x, y, dx, dy, speed, rotations, launch, \
+                                   rotations.find_index(dx, dy), False]
+
+    def remove(self, sprite):
+        """This method accepts a missile as a parameter. It stops steering the
+        missile and returns its location, direction and whether it was
+        exploding."""
+        x, y, dx, dy, speed, rotations, launch, index, exploding = self.__missiles.pop(sprite)
+        return x, y, dx, dy, exploding
+
+    def is_exploding(self, sprite):
+        """This method accepts a missile as a parameter, and returns whether
+        it has hit the ground."""
+        return self.__missiles[sprite][8]
+
+    def get_count(self):
+        """This method accepts no parameters, and returns the number of
+        missiles being steered."""
+        return len(self.__missiles)
+
+    def step(self, px, py, now):
+        """This method accepts the player's x and y coordinates and the time
+        as parameters. It turns every missile still homing towards the
+        player, moves them all, kills the ones that left the screen and flags
+        the ones that hit the ground."""
+        self.__frame += 1
+        retarget = self.__frame % self.__retarget == 0
+        max_turn = self.__max_turn
+        offscreen = []
+        for sprite, state in self.__missiles.items():
+            x, y, dx, dy, speed, rotations, launch, index, exploding = state
+            if now - launch > self.__homing_time:
+                # The missile has run out of time and falls straight down
+                dx = 0
+                dy = -1
+            elif retarget:
+                # Aim at the player, with y pointing up
+                tx = px - x
+                ty = y - py
+                distance = math.sqrt(tx * tx + ty * ty)
+                if distance:
+                    tx /= distance
+                    ty /= distance
+                    if max_turn is not None and dx * tx + dy * ty < self.__cos_turn:
+                        # Turn by the largest turn towards the player's side
+                        if dx * ty - dy * tx >= 0:
+                            tx, ty = dx * self.__cos_turn - dy * self.__sin_turn, \
+                                     dx * self.__sin_turn + dy * self.__cos_turn
+                        else:
+                            tx, ty = dx * self.__cos_turn + dy * self.__sin_turn, \
+                                     dy * self.__cos_turn - dx * self.__sin_turn
+                    dx = tx
+                    dy = ty
+                    # Change the image only when the nearest step changes
+                    new_index = rotations.find_nearest(dx, dy, index)
+                    if new_index != index:
+                        index = new_index
+                        sprite.image = rotations.get_frame(index)
+                        center = sprite.rect.center
+                        sprite.rect = sprite.image.get_rect()
+                        sprite.rect.center = center
+            x += dx * speed
+            y -= dy * speed
+            sprite.rect.center = (x, y)
+            if sprite.rect.centerx < -125 or sprite.rect.centerx > self.__width + 125:
+                offscreen.append(sprite)
+            elif sprite.rect.centery > self.__height - 50:
+                exploding = True
+            state[0:4] = [x, y, dx, dy]
+            state[7] = index
+            state[8] = exploding
+
+        # Kill the missiles that left, which stops steering them
+        for sprite in offscreen:
+            sprite.kill()
+
+class MissileEngine(object):
+    """This class defines the engine that steers homing missiles with numpy.
+    Each missile owns one row of the arrays, like a bullet in the bullet
+    engine, and every frame all of them turn towards the player and move
+    together, the same way the homing guidance steers them. Only the
+    missiles that turn past the edge of the step they are drawn at change
+    their image."""
+    def __init__(self, screen, homing_time = 2800, max_turn = None, retarget = 1, capacity = 64):
+        """This initializer takes the screen surface, the milliseconds a
+        missile homes for, the most degrees it may turn in a frame, or None
+        to turn straight at the player, the frames between new aims and the
+        starting number of rows as parameters. Initializes the empty
+        arrays."""
+        self.__width = screen.get_width()
+        self.__height = screen.get_height()
+        self.__homing_time = homing_time
+        self.__retarget = max(1, retarget)
+        self.__frame = 0
+        self.__x = numpy.zeros(capacity)
+        self.__y = numpy.zeros(capacity)
+        self.__dx = numpy.zeros(capacity)
+        self.__dy = numpy.zeros(capacity)
+        self.__speed = numpy.zeros(capacity)
+        self.__launch = numpy.zeros(capacity)
+        self.__flags = numpy.zeros(capacity, numpy.uint8)
+
+        # The step each missile is drawn at, and the cosine and sine of the
+        # step's lower and upper edges
+        self.__index = numpy.zeros(capacity, numpy.int64)
+        self.__low_x = numpy.zeros(capacity)
+        self.__low_y = numpy.zeros(capacity)
+        self.__high_x = numpy.zeros(capacity)
+        self.__high_y = numpy.zeros(capacity)
+
+        self.__sprites = [None] * capacity
+        self.__tables = [None] * capacity
+        self.__slots = {}
+        self.__free = list(range(capacity - 1, -1, -1))
+
+        # The sine and cosine of the largest turn, worked out once
+        self.__max_turn = max_turn
+        if max_turn is not None:
+            self.__cos_turn = math.cos(math.radians(max_turn))
+            self.__sin_turn = math.sin(math.radians(max_turn))
+
+    def add(self, sprite, x, y, dx, dy, speed, rotations, launch):
+        """This method accepts a missile, its location, the x and y parts of
+        its direction with y pointing up, its speed, its rotation table and
+        the time it was launched as parameters, and starts steering it."""
+        if not self.__free:
+            self.__grow()
+        slot = self.__free.pop()
+        self.__x[slot] = x
+        self.__y[slot] = y
+        self.__dx[slot] = dx
+        self.__dy[slot] = dy
+        self.__speed[slot] = speed
+        self.__launch[slot] = launch
+        self.__flags[slot] = ALIVE
+        self.__sprites[slot] = sprite
+        self.__tables[slot] = rotations
+        self.__slots[sprite] = slot
+        self.__set_index(slot, rotations.find_index(dx, dy))
+
+    def remove(self, sprite):
+        """This method accepts a missile as a parameter. It stops steering the
+        missile and returns its location, direction and whether it was
+        exploding."""
+        slot = self.__slots.pop(sprite)
+        state = (float(self.__x[slot]), float(self.__y[slot]), float(self.__dx[slot]), float(self.__dy[slot]), \
+                 bool(self.__flags[slot] & EXPLODING))
+        self.__dx[slot] = 0
+        self.__dy[slot] = 0
+        self.__speed[slot] = 0
+        self.__flags[slot] = 0
+        self.__sprites[slot] = None
+        self.__tables[slot] = None
+        self.__free.append(slot)
+        return state
+
+    def is_exploding(self, sprite):
+        """This method accepts a missile as a parameter, and returns whether
+        it has hit the ground."""
+        return bool(self.__flags[self.__slots[sprite]] & EXPLODING)
+
+    def get_count(self):
+        """This method accepts no parameters, and returns the number of
+        missiles being steered."""
+        return len(self.__slots)
+
+    def step(self, px, py, now):
+        """This method accepts the player's x and y coordinates and the time
+        as parameters. It turns every missile still homing towards the
+        player, moves them all, kills the ones that left the screen and flags
+        the ones that hit the ground."""
+        self.__frame += 1
+        x = self.__x
+        y = self.__y
+        dx = self.__dx
+        dy = self.__dy
+        alive = (self.__flags & ALIVE) != 0
+
+        # Missiles that have run out of time fall straight down
+        falling = alive & (now - self.__launch > self.__homing_time)
+        dx[falling] = 0
+        dy[falling] = -1
+
+        if self.__frame % self.__retarget == 0:
+            # Aim at the player, with y pointing up
+            tx = px - x
+            ty = y - py
+            distance = numpy.sqrt(tx * tx + ty * ty)
+            rows = numpy.flatnonzero(alive & ~falling & (distance != 0))
+            tx = tx[rows] / distance[rows]
+            ty = ty[rows] / distance[rows]
+            if self.__max_turn is not None:
+                # Turn by the largest turn towards the player's side
+                old_x = dx[rows]
+                old_y = dy[rows]
+                turn = old_x * tx + old_y * ty < self.__cos_turn
+                left = old_x * ty - old_y * tx >= 0
+                cos_turn = self.__cos_turn
+                sin_turn = self.__sin_turn
+                turned_x = numpy.where(left, old_x * cos_turn - old_y * sin_turn, old_x * cos_turn + old_y * sin_turn)
+                turned_y = numpy.where(left, old_x * sin_turn + old_y * cos_turn, old_y * cos_turn - old_x * sin_turn)
+                tx = numpy.where(turn, turned_x, tx)
+                ty = numpy.where(turn, turned_y, ty)
+            dx[rows] = tx
+            dy[rows] = ty
+
+            # Change the image only of the missiles that turned past an edge
+            # of the step they are drawn at
+            outside = (self.__low_x[rows] * ty - self.__low_y[rows] * tx < 0) | \
+                      (tx * self.__high_y[rows] - ty * self.__high_x[rows] <= 0)
+            for slot in rows[outside].tolist():
+                rotations = self.__tables[slot]
+                index = rotations.find_nearest(float(dx[slot]), float(dy[slot]), int(self.__index[slot]))
+                if index != self.__index[slot]:
+                    self.__set_index(slot, index)
+                    sprite = self.__sprites[slot]
+                    sprite.image = rotations.get_frame(index)
+                    center = sprite.rect.center
+                    sprite.rect = sprite.image.get_rect()
+                    sprite.rect.center = center
+
+        x += dx * self.__speed
+        y -= dy * self.__speed
+
+        # Round the same way pygame does when a rect is given a float
+        centerx = numpy.copysign(numpy.floor(numpy.abs(x) + 0.5), x)
+        centery = numpy.copysign(numpy.floor(numpy.abs(y) + 0.5), y)
+
+        # Find the missiles that are offscreen or hitting the ground
+        offscreen = alive & ((centerx < -125) | (centerx > self.__width + 125))
+        onscreen = alive & ~offscreen
+        self.__flags[onscreen & (centery > self.__height - 50)] |= EXPLODING
+
+        # Move the rects of the missiles still on screen
+        sprites = self.__sprites
+        rows = numpy.flatnonzero(onscreen)
+        for slot, cx, cy in zip(rows.tolist(), centerx[rows].tolist(), centery[rows].tolist()):
+            sprites[slot].rect.center = (cx, cy)
+
+        # Kill the rest, which stops steering them
+        for slot in numpy.flatnonzero(offscreen).tolist():
+            sprites[slot].kill()
+
+    def __set_index(self, slot, index):
+        """This method accepts a row and the index of a step as parameters,
+        and stores the step and its edges."""
+        low, high = self.__tables[slot].get_edges(index)
+        self.__index[slot] = index
+        self.__low_x[slot], self.__low_y[slot] = low
+        self.__high_x[slot], self.__high_y[slot] = high
+
+    def __grow(self):
+        """This method accepts no parameters, and doubles the number of rows."""
+        size = len(self.__sprites)
+        self.__x = numpy.concatenate((self.__x, numpy.zeros(size)))
+        self.__y = numpy.concatenate((self.__y, numpy.zeros(size)))
+        self.__dx = numpy.concatenate((self.__dx, numpy.zeros(size)))
+        self.__dy = numpy.concatenate((self.__dy, numpy.zeros(size)))
+        self.__speed = numpy.concatenate((self.__speed, numpy.zeros(size)))
+        self.__launch = numpy.concatenate((self.__launch, numpy.zeros(size)))
+        self.__low_x = numpy.concatenate((self.__low_x, numpy.zeros(size)))
+        self.__low_y = numpy.concatenate((self.__low_y, numpy.zeros(size)))
+        self.__high_x = numpy.concatenate((self.__high_x, numpy.zeros(size)))
+        self.__high_y = numpy.concatenate((self.__high_y, numpy.zeros(size)))
+        self.__index = numpy.concatenate((self.__index, numpy.zeros(size, numpy.int64)))
+        self.__flags = numpy.concatenate((self.__flags, numpy.zeros(size, numpy.uint8)))
+        self.__sprites.extend([None] * size)
+        self.__tables.extend([None] * size)
+        self.__free.extend(range(size * 2 - 1, size - 1, -1))
@@ -0,0 +1,236 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for drawing the game. Sprites are kept in
+one layered group between frames, and only the parts of the screen that
+changed are pushed to the display. Frames drawn between ticks can show the
+sprites part of the way between where they were on the last two ticks.
+"""
+import pygame, viewport
+
+# Layers of the game, drawn from back to front. The terrain's own layers
+# are drawn in the order they are added.
+TERRAIN, PLAYER, ENEMIES, PROJECTILES, GUNS, EXPLOSIONS, HUD = range(7)
+
+class Renderer(object):
+    """This class defines the renderer for the game. It keeps every sprite in
+    a layered dirty group, and updates only the changed areas of the display
+    unless most of the screen has changed, in which case it flips."""
+    def __init__(self, screen, background, threshold = 0.5, interpolate = False):
+        """This initializer takes the screen, the background surface, the
+        part of the screen that must change before the whole display is
+        flipped and whether frames are drawn between ticks as parameters.
+        Initializes the layered group and counters."""
+        self.__screen = screen
+        self.__background = background
+        self.__area = screen.get_width() * screen.get_height()
+        self.__threshold = threshold
+        self.__group = pygame.sprite.LayeredDirty()
+        self.__group.clear(screen, background)
+        # The renderer chooses when to draw everything, so the group must
+        # never switch to flipping on its own because a frame was slow
+        self.__group.set_timing_threshold(float("inf"))
+
+        # Sprites added to each layer, and groups that are copied into each
+        # layer before drawing
+        self.__added = {}
+        self.__tracked = {}
+
+        # Groups whose sprites are moved by something else, so the renderer
+        # does not update them
+        self.__still = set()
+
+        # Areas blitted straight onto the screen this frame
+        self.__overlays = []
+        self.__rects = []
+
+        # Where each sprite was on the last two ticks, kept when frames are
+        # drawn between ticks, and the sprites drawn away from their rects.
+        # Pooled sprites are kept with the number of times they were taken
+        # from their pool, so a sprite reused in the same tick starts afresh.
+        self.__interpolate = interpolate
+        self.__previous = {}
+        self.__current = {}
+        self.__shifted = []
+
+        # Draw the whole screen on the first frame
+        self.__redraw = True
+        self.__full = True
+
+        # Counters used to measure how much of the screen is pushed
+        self.pixels = 0
+        self.total_pixels = 0
+        self.frames = 0
+        self.flips = 0
+
+    def add(self, layer, *sprites):
+        """This method accepts a layer and sprites as parameters, and adds the
+        sprites to the layer until they are killed."""
+        self.__group.add(*sprites, layer = layer)
+        self.__added.setdefault(layer, pygame.sprite.Group()).add(*sprites)
+
+    def track(self, layer, *groups, update = True):
+        """This method accepts a layer, groups and whether the renderer updates
+        their sprites as parameters. The sprites in the groups are kept on the
+        layer, and sprites that leave the groups are taken off it. Groups
+        whose sprites are all moved by something else, such as the bullet
+        engine, are not updated, so their sprites are not called each frame
+        only to return."""
+        self.__tracked.setdefault(layer, []).extend(groups)
+        if not update:
+            self.__still.update(groups)
+
+    def sync(self):
+        """This method accepts no parameters. It brings the tracked layers up
+        to date with their groups."""
+        for layer, groups in self.__tracked.items():
+            current = set(self.__group.get_sprites_from_layer(layer))
+            wanted = []
+            for group in groups:
+                wanted.extend(group.sprites())
+            wanted_set = set(wanted)
+            old = [sprite for sprite in current if sprite not in wanted_set]
+            if old:
+                self.__group.remove(*old)
+            new = [sprite for sprite in wanted if sprite not in current]
+            if new:
+                self.__group.add(*new, layer = layer)
+
+    def update(self):
+        """This method accepts no parameters, and updates every sprite from the
+        back layer to the front, except in the groups that are not updated.
+        It is called once at the end of every tick."""
+        if not self.__still:
+            self.__group.update()
+        else:
+            for layer in sorted(set(self.__added) | set(self.__tracked)):
+                if layer in self.__added:
+                    self.__added[layer].update()
+                for group in self.__tracked.get(layer, ()):
+                    if group not in self.__still:
+                        group.update()
+        if self.__interpolate:
+            self.__previous = self.__current
+            self.__current = dict([(sprite, (sprite.rect.left, sprite.rect.top, getattr(sprite, "acquired", 0))) \
+                                   for sprite in self.__group.sprites()])
+
+    def draw(self, behind = 0.0):
+        """This method accepts the part of a tick to draw the sprites behind
+        where they are as a parameter, which is only used when frames are
+        drawn between ticks. It draws the sprites onto the screen, redrawing
+        everything if the terrain has moved."""
+        moved = []
+        if self.__interpolate:
+            moved = self.__shift(behind)
+        full = self.__redraw or self.__changed_area() > self.__area * self.__threshold
+        self.__redraw = False
+        if full:
+            # Only clear the part of the screen the terrain does not cover,
+            # then have the group draw every sprite without clearing
+            exposed = self.__exposed_area()
+            if exposed.height:
+                self.__screen.blit(self.__background, exposed, exposed)
+            self.__group.clear(self.__screen, None)
+            self.__group.repaint_rect(self.__screen.get_rect())
+            self.__group.draw(self.__screen)
+            self.__group.clear(self.__screen, self.__background)
+            self.__rects = [self.__screen.get_rect()]
+        else:
+            self.__rects = self.__group.draw(self.__screen)
+        self.__full = full
+        self.__overlays = []
+
+        # Put the sprites back where they are for the next tick
+        for sprite, rect in moved:
+            sprite.rect = rect
+        if self.__interpolate:
+            for terrain in self.__added.get(TERRAIN, ()):
+                terrain.rewind(0)
+
+    def blit(self, surface, position):
+        """This method accepts a surface and position as parameters. It blits
+        the surface onto the screen above the sprites for this frame."""
+        self.__overlays.append(self.__screen.blit(surface, position))
+
+    def present(self):
+        """This method accepts no parameters. It pushes the changed areas to
+        the display, or flips the display if most of it has changed."""
+        rects = self.__rects + self.__overlays
+        pixels = sum([rect.width * rect.height for rect in rects])
+        if self.__full or pixels > self.__area * self.__threshold:
+            viewport.flip()
+            pixels = self.__area
+            self.flips += 1
+        elif rects:
+            viewport.update(rects)
+        self.pixels = min(pixels, self.__area)
+        self.total_pixels += self.pixels
+        self.frames += 1
+
+    def redraw(self):
+        """This method accepts no parameters, and makes the next frame draw
+        the whole screen."""
+        self.__redraw = True
+
+    def get_stats(self):
+        """This method accepts no parameters, and returns a dictionary with the
+        pixels pushed last frame, the average per frame and number of flips."""
+        average = 0
+        if self.frames:
+            average = self.total_pixels / float(self.frames)
+        return {"pixels": self.pixels, "average": average, "frames": self.frames, \
+                "flips": self.flips, "screen": self.__area}
+
+    def __shift(self, behind):
+        """This method accepts a part of a tick as a parameter. It moves each
+        sprite that part of the way back to where it was on the tick before,
+        and returns the sprites it moved with their own rects. Sprites taken
+        from their pool again since that tick are drawn where they are."""
+        moved = []
+        previous = self.__previous
+        for sprite in self.__group.sprites():
+            start = previous.get(sprite)
+            if start is None or start[2] != getattr(sprite, "acquired", 0):
+                continue
+            rect = sprite.rect
+            x = int(round((start[0] - rect.left) * behind))
+            y = int(round((start[1] - rect.top) * behind))
+            if x or y:
+                sprite.rect = rect.move(x, y)
+                moved.append((sprite, rect))
+        # Sprites drawn away from their rects last frame must be drawn again
+        for sprite in self.__shifted + [sprite for sprite, rect in moved]:
+            if not sprite.dirty:
+                sprite.dirty = 1
+        self.__shifted = [sprite for sprite, rect in moved]
+        for terrain in self.__added.get(TERRAIN, ()):
+            terrain.rewind(behind)
+        return moved
+
+    def __exposed_area(self):
+        """This method accepts no parameters, and returns the part of the
+        screen above the terrain layers that cover its whole width without
+        any see-through pixels."""
+        width, top = self.__screen.get_size()
+        covering = []
+        for sprite in self.__added.get(TERRAIN, ()):
+            image = sprite.image
+            if sprite.visible and sprite.rect.left <= 0 and sprite.rect.right >= width and \
+               image.get_colorkey() is None and not image.get_flags() & pygame.SRCALPHA:
+                covering.append(sprite.rect)
+        covering.sort(key = lambda rect: rect.bottom, reverse = True)
+        for rect in covering:
+            if rect.top < top <= rect.bottom:
+                top = rect.top
+        return pygame.Rect(0, 0, width, max(0, top))
+
+    def __changed_area(self):
+        """This method accepts no parameters, and returns the area of the
+        terrain that has moved since the last frame."""
+        area = 0
+        clip = self.__screen.get_rect()
+        for sprite in self.__added.get(TERRAIN, ()):
+            if sprite.dirty:
+                rect = sprite.rect.clip(clip)
+                area += rect.width * rect.height
+        return area
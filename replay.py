@@ -0,0 +1,122 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for recording and replaying games. The keys
+the game reads on each tick are packed into one byte, runs of the same byte
+are stored once with their length, and the seed of the random numbers is
+kept with them. Since every tick moves the game's clock by the same amount,
+playing the keys back with the same seed plays the same game again.
+"""
+import struct, random, pygame
+import controls, runtime
+
+# Start of every replay file, and the version of the layout that follows it
+MAGIC = b"LRRP"
+VERSION = 1
+
+# Magic, version, seed, ticks, score and number of runs
+HEADER = struct.Struct("<4sBqIiI")
+
+# Length and keys of each run of ticks
+RUN = struct.Struct("<HB")
+MOST_RUN = 65535
+
+# Keys held down, one bit each from the lowest, then the keys pressed
+HELD = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_a, pygame.K_d, pygame.K_SPACE)
+PRESSED = (pygame.K_c,)
+
+def pack(held, events):
+    """This function takes the keys held down and the events of one tick as
+    parameters, and returns the keys the game reads packed into a byte."""
+    keys = 0
+    for bit in range(len(HELD)):
+        if held[HELD[bit]]:
+            keys |= 1 << bit
+    for event in events:
+        if event.type == pygame.KEYDOWN and event.key in PRESSED:
+            keys |= 1 << (len(HELD) + PRESSED.index(event.key))
+    return keys
+
+def unpack(keys):
+    """This function takes the keys of one tick packed into a byte as a
+    parameter, and returns them as a frame of a script."""
+    held = [HELD[bit] for bit in range(len(HELD)) if keys & (1 << bit)]
+    pressed = [PRESSED[bit] for bit in range(len(PRESSED)) if keys & (1 << (len(HELD) + bit))]
+    return held, pressed
+
+class Recorder(object):
+    """This class defines controls that record the keys read from other
+    controls on every tick, so the game can be replayed later."""
+    def __init__(self, inputs, seed = None):
+        """This initializer takes the controls to record and the seed for the
+        random numbers as parameters. A seed is picked if none is given, and
+        the random numbers are seeded with it."""
+        if seed is None:
+            seed = random.randrange(1 << 31)
+        self.seed = seed
+        runtime.rng.seed(seed)
+        self.__inputs = inputs
+        self.__runs = []
+
+    def poll(self):
+        """This method accepts no parameters. It returns the keys held down
+        and the events of this tick from the recorded controls, and records
+        the keys the game reads."""
+        held, events = self.__inputs.poll()
+        for event in events:
+            # The quit ends the recording, and the replay quits when it runs out
+            if event.type == pygame.QUIT:
+                return held, events
+        keys = pack(held, events)
+        runs = self.__runs
+        if runs and runs[-1][1] == keys and runs[-1][0] < MOST_RUN:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, keys])
+        return held, events
+
+    def observe(self, snapshot):
+        """This method accepts a snapshot of the game as a parameter, and
+        passes it on to the recorded controls if they play by themselves."""
+        observe = getattr(self.__inputs, "observe", None)
+        if observe is not None:
+            observe(snapshot)
+
+    def get_ticks(self):
+        """This method accepts no parameters, and returns the number of ticks
+        recorded."""
+        return sum([length for length, keys in self.__runs])
+
+    def save(self, filename, score = 0):
+        """This method accepts a filename and the final score as parameters,
+        and writes the recording to the file."""
+        with open(filename, "wb") as replay_file:
+            replay_file.write(HEADER.pack(MAGIC, VERSION, self.seed, self.get_ticks(), score, \
+                                          len(self.__runs)))
+            for length, keys in self.__runs:
+                replay_file.write(RUN.pack(length, keys))
+
+class Replay(object):
+    """This class defines a recorded game loaded from a replay file."""
+    def __init__(self, filename):
+        """This initializer takes the name of a replay file as a parameter,
+        and loads the seed, the final score and the keys of every tick."""
+        data = open(filename, "rb").read()
+        magic, version, self.seed, self.ticks, self.score, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("%s is not a version %i replay file" % (filename, VERSION))
+        self.__runs = [RUN.unpack_from(data, HEADER.size + index * RUN.size) for index in range(count)]
+
+    def get_script(self):
+        """This method accepts no parameters, and returns the recorded keys
+        as a script with one frame for each tick."""
+        script = []
+        for length, keys in self.__runs:
+            script.extend([unpack(keys)] * length)
+        return script
+
+    def get_inputs(self):
+        """This method accepts no parameters. It seeds the random numbers with
+        the recorded seed and returns controls that play back the keys."""
+        runtime.rng.seed(self.seed)
+        return controls.ScriptedInput(self.get_script())
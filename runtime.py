@@ -0,0 +1,72 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for the game's clock and random numbers.
+Sprites and the game loop read the time and draw random numbers from here,
+so a game can be run on a virtual clock with a fixed seed and play out the
+same way every time.
+"""
+import random, time
+
+# The random numbers used by the game
+rng = random.Random()
+
+class RealClock(object):
+    """This class defines the clock that reads the time from the system. It
+    does not need pygame's timer, which is only started by pygame.init()."""
+    def __init__(self):
+        """This initializer takes no parameters, and stores the time the clock
+        was made."""
+        self.__start = time.perf_counter()
+
+    def get_ticks(self):
+        """This method accepts no parameters, and returns the milliseconds
+        since the clock was made."""
+        return int((time.perf_counter() - self.__start) * 1000)
+
+    def advance(self, amount):
+        """This method accepts an amount of milliseconds as a parameter. The
+        real clock moves on its own, so it does nothing."""
+        pass
+
+class VirtualClock(object):
+    """This class defines a clock that only moves when it is told to."""
+    def __init__(self, ticks = 0):
+        """This initializer takes the starting time in milliseconds as a
+        parameter, and stores it."""
+        self.__ticks = ticks
+
+    def get_ticks(self):
+        """This method accepts no parameters, and returns the current time in
+        whole milliseconds. The clock can be moved by parts of a millisecond,
+        so it keeps the same time as a real clock."""
+        return int(self.__ticks)
+
+    def advance(self, amount):
+        """This method accepts an amount of milliseconds as a parameter, and
+        moves the clock forward by it."""
+        self.__ticks += amount
+
+# The clock used by the game
+clock = RealClock()
+
+def get_ticks():
+    """This function takes no parameters, and returns the time of the game's
+    clock in milliseconds."""
+    return clock.get_ticks()
+
+def configure(seed = None, virtual = False):
+    """This function takes a seed and whether to use a virtual clock as
+    parameters. It seeds the random numbers and sets the game's clock."""
+    global clock
+    rng.seed(seed)
+    if virtual:
+        clock = VirtualClock()
+    else:
+        clock = RealClock()
+
+def start_game_clock():
+    """This function takes no parameters. It starts a virtual clock for a new
+    game, which only moves when the game simulates a tick."""
+    global clock
+    clock = VirtualClock()
@@ -3,20 +3,74 @@ Author: Kent Chow
 Date: June 6, 2012
 Description: This is the module for sprites.
 """
-import pygame, math, random
+import pygame, math, assets, pools, runtime
 
-class Player(pygame.sprite.Sprite):   
+# The engine that moves straight bullets, set by the game when numpy is installed
+bullet_engine = None
+
+# The guidance that steers homing missiles together, set by the game
+missile_guidance = None
+
+# Frames an explosion moves on each tick, raised to skip frames when the game is slow
+explosion_step = 1
+
+class Archetype(object):
+    """This class defines the values shared by every projectile of one kind:
+    its image, speed, screen, damage, points, death animation and starting
+    health. Projectiles keep only their own state and point to one of these."""
+    __slots__ = ("image", "speed", "screen", "damage", "points", "death", "frames", "health")
+
+    def __init__(self, image, speed, screen, damage, points, death, frames, health = 0):
+        """This initializer takes the values of the kind as parameters, and
+        stores them."""
+        self.image = image
+        self.speed = speed
+        self.screen = screen
+        self.damage = damage
+        self.points = points
+        self.death = death
+        self.frames = frames
+        self.health = health
+
+class EnemyArchetype(object):
+    """This class defines the values shared by every enemy of one kind: its
+    image, speed, starting health and ammo, cooldown, points and the kind of
+    projectile it fires."""
+    __slots__ = ("image", "speed", "health", "ammo", "cooldown", "points", "bullet")
+
+    def __init__(self, image, speed, health, ammo, cooldown, points, bullet):
+        """This initializer takes the values of the kind as parameters, and
+        stores them."""
+        self.image = image
+        self.speed = speed
+        self.health = health
+        self.ammo = ammo
+        self.cooldown = cooldown
+        self.points = points
+        self.bullet = bullet
+
+# The archetypes made so far, one for each set of values
+archetypes = {}
+
+def get_archetype(archetype_class, *values):
+    """This function takes an archetype class and its values as parameters,
+    and returns the archetype shared by everything made with those values."""
+    key = (archetype_class,) + values
+    kind = archetypes.get(key)
+    if kind is None:
+        kind = archetypes[key] = archetype_class(*values)
+    return kind
+
+class Player(pygame.sprite.DirtySprite):   
     """This class defines the sprite for the player."""
     def __init__(self, screen):
         """This initializer takes a screen surface as a parameter, initializes
         the image and rect attributes, and x, y direction of the player."""
         # Call the parent __init__() method
-        pygame.sprite.Sprite.__init__(self)
+        pygame.sprite.DirtySprite.__init__(self)
         
         # Define the image attributes for the player.
-        self.image = pygame.image.load("./pictures/player/land_raider_base.gif")
-        self.image.set_colorkey((255,0,255))    
-        self.image = self.image.convert() 
+        self.image = assets.images.load("./pictures/player/land_raider_base.gif", assets.MAGENTA)
         self.rect = self.image.get_rect()
         self.rect.center = (screen.get_width()/2,screen.get_height() - 75)
         
@@ -37,60 +91,96 @@ class Player(pygame.sprite.Sprite):
         # If rect is offscreen, assign back to old rect
         if self.rect.left < -self.__dx or self.rect.right > self.__screen.get_width() + self.__dx:
             self.rect.centerx = self.__centerx_copy
+        # Redraw the player if it moved
+        if self.rect.centerx != self.__centerx_copy:
+            self.dirty = 1
             
-class Terrain(pygame.sprite.Sprite):  
-    """This class defines the sprite for the terrain."""
-    def __init__(self, screen, image, speed):
-        """This initializer takes a screen surface, image name, and value
-        of speed as parameters. Initializes the image and rect attributes, 
-        and x, y coordinates of the terrain."""
+class Terrain(pygame.sprite.DirtySprite):  
+    """This class defines the sprite for the terrain. Only the part of the
+    image that is on screen is drawn, and the image wraps around without a
+    jump."""
+    def __init__(self, screen, image, speed, bottom = None):
+        """This initializer takes a screen surface, image name, value of speed
+        and the y coordinate of the terrain's bottom, which defaults to the
+        bottom of the screen, as parameters. Initializes the image, rect and
+        source rect attributes, and the scrolled distance of the terrain."""
         # Call the parent __init__() method
-        pygame.sprite.Sprite.__init__(self)
-        
-        # Define the image attributes for the terrain.
-        self.image = pygame.image.load(image)
-        self.image = self.image.convert() 
-        self.rect = self.image.get_rect() 
-        self.rect.left = 0
-        self.rect.bottom = screen.get_height()
-        
-        # Save the screen and store the speed of terrain
+        pygame.sprite.DirtySprite.__init__(self)
+        
+        # Define the image attributes for the terrain. The image is followed
+        # by a copy of its start, so any part of the screen's width can be
+        # drawn in one piece.
+        self.image = assets.images.wrapped(image, screen.get_width())
+        self.__width = assets.images.load(image).get_width()
+        self.rect = pygame.Rect(0, 0, min(screen.get_width(), self.__width), self.image.get_height())
+        if bottom is None:
+            bottom = screen.get_height()
+        self.rect.bottom = bottom
+        self.source_rect = pygame.Rect(0, 0, self.rect.width, self.rect.height)
+        
+        # Store the speed of terrain, how far it has scrolled and the screen's width
         self.__dx = speed
-        self.__screen = screen
+        self.__offset = 0.0
+        self.__screen_width = screen.get_width()
         
     def set_speed(self, amount):
         """This method takes the amount of speed as parameters and stores it
         in a variable."""
         self.__dx = amount
         
+    def get_speed(self):
+        """This method accepts no parameters, and returns the speed."""
+        return self.__dx
+        
+    def hide_below(self, y):
+        """This method accepts a y coordinate as a parameter. The part of the
+        terrain below it is hidden by other terrain, so it is not drawn."""
+        height = max(0, min(self.rect.height, y - self.rect.top))
+        self.rect.height = height
+        self.source_rect.height = height
+        
+    def is_opaque(self):
+        """This method accepts no parameters, and returns whether the terrain
+        covers the screen's width with no see-through pixels."""
+        return self.rect.left <= 0 and self.rect.width >= self.__screen_width and \
+               self.image.get_colorkey() is None and not self.image.get_flags() & pygame.SRCALPHA
+        
+    def rewind(self, part):
+        """This method accepts a part of a tick as a parameter. It draws the
+        terrain that part of a tick behind where it has scrolled to, for
+        frames drawn between ticks, and 0 draws it where it is."""
+        left = int((self.__offset - self.__dx * part) % self.__width)
+        if left != self.source_rect.left:
+            self.source_rect.left = left
+            self.dirty = 1
         
     def update(self):
-        """This method will be called automatically to reposition the
-        terrain on the screen."""    
-        # If image reaches to its right, move image to start back at left
-        if self.rect.right < self.__screen.get_width() + self.__dx:
-            self.rect.left = 0
-        else:
-            self.rect.left -= self.__dx
+        """This method will be called automatically to scroll the terrain
+        on the screen."""    
+        # Move the part of the image that is drawn, wrapping back to the start
+        self.__offset = (self.__offset + self.__dx) % self.__width
+        self.source_rect.left = int(self.__offset)
+        # Redraw the terrain only while it is moving
+        if self.__dx:
+            self.dirty = 1
             
-class Gun(pygame.sprite.Sprite):
+class Gun(pygame.sprite.DirtySprite):
     """This class defines the sprite for the guns."""
     def __init__(self, screen, image, x, y, angle):
         """This initializer takes a screen surface, image name, and value
         of x and y and an angle as parameters. Initializes the image and rect 
         attributes, angle, and x and y coordinates of the gun sprite."""
         # Call the parent __init__() method
-        pygame.sprite.Sprite.__init__(self)
+        pygame.sprite.DirtySprite.__init__(self)
+        # Redraw the sprite on every frame
+        self.dirty = 2
         
         # Define the image attributes for the terrain.
-        self.image = pygame.image.load(image)
-        self.image = self.image.convert() 
-        self.image.set_colorkey((255,0,255))
-        self.image = pygame.transform.rotate(self.image, angle)              
+        self.__rotations = assets.load_rotations(image, assets.MAGENTA)
+        self.image = self.__rotations.get(angle)
         self.rect = self.image.get_rect() 
         
-        # Store copy of image, x and y coordinates, and angle of gun
-        self.__image_copy = self.image
+        # Store x and y coordinates, and angle of gun
         self.__x = x
         self.__y = y
         self.__angle = angle
@@ -105,17 +195,14 @@ class Gun(pygame.sprite.Sprite):
         """This method accepts either True or False value as a parameter. If
         True, it increases the angle of the image and transforms it. If False,
         it decreases the angle of the image, and transforms it."""
-        # Save the old rect of image
-        self.__old_rect = self.image.get_rect()
         # Change the angle of the image
         if higher:
             self.__angle += 1
         else:
             self.__angle -= 1
-        # Transform the image based on angle
-        self.image = pygame.transform.rotate(self.__image_copy, self.__angle)
-        # Set rect back to original
-        self.rect = self.__old_rect
+        # Look up the rotated image and keep it centered
+        self.image = self.__rotations.get(self.__angle)
+        self.rect = self.__rotations.get_rect(self.__angle, self.rect.center)
         
     def get_angle(self):
         """This method accepts no parameters, and returns the value of angle."""
@@ -126,162 +213,212 @@ class Gun(pygame.sprite.Sprite):
         gun on the screen."""   
         self.rect.center = (self.__x, self.__y)
         
-class Bullet(pygame.sprite.Sprite):
+class Bullet(pools.Pooled, pygame.sprite.DirtySprite):
     """This class defines the sprite for the bullets."""
+    __slots__ = ("__kind", "__x", "__y", "__dx", "__dy", "__health", "__exploding", "__engine", "__slot")
+    
     def __init__(self, image, x, y, angle, speed, screen, damage, points, death, frames, health = 0):
         """This initializer takes a screen surface, image name, values for
         speed, angle, x, y, points, death images, frames, and health as parameters. 
         Initializes the image and rect  attributes, angle, and x and y coordinates 
         of the bullet sprite."""
         # Call the parent __init__() method
-        pygame.sprite.Sprite.__init__(self)
+        pygame.sprite.DirtySprite.__init__(self)
+        self.reset(image, x, y, angle, speed, screen, damage, points, death, frames, health)
+        
+    def reset(self, image, x, y, angle, speed, screen, damage, points, death, frames, health = 0):
+        """This method accepts the same parameters as the initializer. It sets
+        up the bullet again, so it can be reused from a pool."""
+        # Redraw the sprite on every frame
+        self.dirty = 2
         
         # Define the image attributes for the terrain.
-        self.image = pygame.image.load(image)
-        self.image.set_colorkey((255,0,255))
-        self.image = pygame.transform.rotate(self.image, angle)
-        self.image = self.image.convert()         
+        self.image = assets.load_rotations(image, assets.MAGENTA).get(angle)
         self.rect = self.image.get_rect() 
         self.rect.center = (x, y)
         
-        # Store x and y location of sprite
+        # Share the values of every bullet of this kind
+        self.__kind = get_archetype(Archetype, image, speed, screen, damage, points, death, frames, health)
+        
+        # Store x and y location and health of sprite
         self.__x = x
         self.__y = y
-        
-        # Store speed of sprite
-        self.__speed = speed
-        
-        # Store information for death of sprite
-        self.__points = points
-        self.__death = death
-        self.__frames = frames
-        self.__damage = damage
         self.__health = health
-        
-        # Store the screen
-        self.__screen = screen
        
         # Calculate the direction of x and y bullet is travelling
         self.__dx = math.cos(float(angle) / 180 * math.pi)
         self.__dy = math.sin(float(angle) / 180 * math.pi)
         
-        # Track if bullet is exploding
+        # Track if bullet is exploding, and its row in the bullet engine
         self.__exploding = False
+        self.__engine = None
+        self.__slot = None
+        
+    def add_internal(self, group):
+        """This method accepts a group as a parameter. It is called when the
+        bullet is added to a group, and hands the bullet to the bullet engine
+        if the game is using one."""
+        pygame.sprite.DirtySprite.add_internal(self, group)
+        if self.__slot is None and bullet_engine is not None:
+            self.__engine = bullet_engine
+            self.__slot = bullet_engine.add(self, self.__x, self.__y, self.__dx * self.__kind.speed, \
+                                            -self.__dy * self.__kind.speed, self.__health)
+            
+    def retire(self):
+        """This method accepts no parameters. It is called when the bullet
+        leaves its last group, and takes its state back from the engine."""
+        if self.__slot is not None:
+            self.__x, self.__y, self.__health, self.__exploding = self.__engine.remove(self.__slot)
+            self.__slot = None
         
     def is_exploding(self):
         """This method accepts no parameters, and returns whether sprite is 
         exploding."""
+        if self.__slot is not None:
+            return self.__engine.is_exploding(self.__slot)
         return self.__exploding
     
     def get_damage(self):
         """This method accepts no parameters, and returns the value of damage."""
-        return self.__damage
+        return self.__kind.damage
     
     def get_points(self):
         """This method accepts no parameters, and returns the value of sprite's
         points."""
-        return self.__points
+        return self.__kind.points
     
     def get_death(self):
         """This method accepts no parameters, and returns the pathname for 
         sprite's death image."""
-        return self.__death
+        return self.__kind.death
     
     def get_frames(self):
         """This method accepts no parameters, and returns the amount of 
         frames in death animation."""
-        return self.__frames
+        return self.__kind.frames
         
     def set_health(self):
         """This method accepts no parameters. It decreases the bullet's health
         by 1 and kills it if it reaches below 0."""
-        self.__health -= 1
-        if self.__health < 0:
+        if self.__slot is not None:
+            health = self.__engine.take_health(self.__slot)
+        else:
+            self.__health -= 1
+            health = self.__health
+        if health < 0:
             self.kill()
                     
     def update(self):
         """This method will be called automatically to reposition the
         bullet on the screen.""" 
+        # The bullet engine moves the bullet if it has a row
+        if self.__slot is not None:
+            return
         # Move rect of bullet
-        self.__x += self.__dx * self.__speed
-        self.__y -= self.__dy * self.__speed
+        self.__x += self.__dx * self.__kind.speed
+        self.__y -= self.__dy * self.__kind.speed
         self.rect.center = (self.__x, self.__y)
         # If bullet offscreen, kill sprite
-        if self.rect.centerx < - 125 or self.rect.centerx > self.__screen.get_width() + 125 or self.rect.centery < 0:
+        screen = self.__kind.screen
+        if self.rect.centerx < - 125 or self.rect.centerx > screen.get_width() + 125 or self.rect.centery < 0:
             self.kill()
         # If bullet hits the ground, explode sprite
-        elif self.rect.centery > self.__screen.get_height() - 50:
+        elif self.rect.centery > screen.get_height() - 50:
             self.__exploding = True
             
-class Missile(pygame.sprite.Sprite):
+class Missile(pools.Pooled, pygame.sprite.DirtySprite):
     """This class defines the sprite for the missiles."""
+    __slots__ = ("__kind", "__x", "__y", "__dx", "__dy", "__init_time", "__exploding", "__guidance", \
+                 "__player_x", "__player_y")
+    
     def __init__(self, screen, image, angle, speed, x, y, px, py, damage, points, death, frames):
         """This initializer takes a screen surface, image name, values for
         speed, angle, x, y, points, death images, frames, and health as parameters. 
         Initializes the image and rect  attributes, angle, and x and y coordinates 
         of the missile sprite."""
         # Call the parent __init__() method
-        pygame.sprite.Sprite.__init__(self)
+        pygame.sprite.DirtySprite.__init__(self)
+        self.reset(screen, image, angle, speed, x, y, px, py, damage, points, death, frames)
+        
+    def reset(self, screen, image, angle, speed, x, y, px, py, damage, points, death, frames):
+        """This method accepts the same parameters as the initializer. It sets
+        up the missile again, so it can be reused from a pool."""
+        # Redraw the sprite on every frame
+        self.dirty = 2
+        
+        # Share the values of every missile of this kind, with the rotated
+        # copies of its image
+        self.__kind = get_archetype(Archetype, assets.load_rotations(image, assets.MAGENTA), speed, screen, \
+                                    damage, points, death, frames)
         
         # Define the image attributes for the terrain.
-        self.image = pygame.image.load(image)
-        self.image.set_colorkey((255,0,255))
-        self.__image_copy = self.image     
+        self.image = self.__kind.image.get(angle)
+        self.rect = self.image.get_rect()
         # Change the angle of the image
         self.change_angle(angle)
-        self.image = self.image.convert()                
         self.rect.center = (x, y)
              
-        # Define the missile's location, speed, and direction
+        # Define the missile's location and direction
         self.__x = x
         self.__y = y
-        self.__speed = speed      
         self.__dx = math.cos(float(angle) / 180 * math.pi)
         self.__dy = math.sin(float(angle) / 180 * math.pi)
         
-        # Set missile life
-        self.__init_time = pygame.time.get_ticks()
+        # Set missile life, and track the guidance steering it
+        self.__init_time = runtime.get_ticks()
         self.__exploding = False
-        
-        # Set death and damage
-        self.__points = points
-        self.__death = death
-        self.__frames = frames
-        self.__damage = damage
-        
-        # Save the screen
-        self.__screen = screen
+        self.__guidance = None
+        self.__player_x = px
+        self.__player_y = py
+        
+    def add_internal(self, group):
+        """This method accepts a group as a parameter. It is called when the
+        missile is added to a group, and hands the missile to the guidance if
+        the game is using one."""
+        pygame.sprite.DirtySprite.add_internal(self, group)
+        if self.__guidance is None and missile_guidance is not None:
+            self.__guidance = missile_guidance
+            missile_guidance.add(self, self.__x, self.__y, self.__dx, self.__dy, self.__kind.speed, \
+                                 self.__kind.image, self.__init_time)
+            
+    def retire(self):
+        """This method accepts no parameters. It is called when the missile
+        leaves its last group, and takes its state back from the guidance."""
+        if self.__guidance is not None:
+            self.__x, self.__y, self.__dx, self.__dy, self.__exploding = self.__guidance.remove(self)
+            self.__guidance = None
         
     def is_exploding(self):
         """This method accepts no parameters, and returns whether sprite is 
         exploding."""
+        if self.__guidance is not None:
+            return self.__guidance.is_exploding(self)
         return self.__exploding
     
     def get_damage(self):
         """This method accepts no parameters, and returns the value of damage."""
-        return self.__damage
+        return self.__kind.damage
     
     def get_points(self):
         """This method accepts no parameters, and returns the value of sprite's
         points."""
-        return self.__points
+        return self.__kind.points
     
     def get_death(self):
         """This method accepts no parameters, and returns the pathname for 
         sprite's death image."""
-        return self.__death
+        return self.__kind.death
     
     def get_frames(self):
         """This method accepts no parameters, and returns the amount of 
         frames in death animation."""
-        return self.__frames
+        return self.__kind.frames
               
     def change_angle(self, angle):
         """This method accepts an angle as a parameter. It transforms the 
         sprite's image according to angle."""
-        self.__old_rect = self.image.get_rect()
-        self.image = pygame.transform.rotate(self.__image_copy, angle)
-        self.rect = self.__old_rect
+        self.image = self.__kind.image.get(angle)
+        self.rect = self.__kind.image.get_rect(angle, self.rect.center)
                
     def store_player_xy(self, x, y):
         """This method accepts the player's x and y coordinates as parameters
@@ -291,45 +428,54 @@ class Missile(pygame.sprite.Sprite):
         
     def find_direction(self, px, py, x, y):
         """This method accepts the player's coordinates and missile's
-        coordinates as parameters. It calculates the angle the missile must 
-        travel to reach player."""
-        # Find distance between player and missile
-        # Calculate angle using cos, uses distance from the ground and
-        # distance from player.
-        self.__distance = math.sqrt((float(x) - px)**2 + (float(py) - y)**2)
-        self.__angle = math.acos((py - y)/self.__distance) * 180 / math.pi 
-        if px < x:
-            self.__angle = -90 - self.__angle
-        elif px > x:
-            self.__angle = -90 + self.__angle
-        else: self.__angle = -90
-        # Sets the new path for missile
-        self.__dx = math.cos(float(self.__angle) / 180 * math.pi)
-        self.__dy = math.sin(float(self.__angle) / 180 * math.pi)
+        coordinates as parameters. It points the missile straight at the
+        player, and keeps its direction if it is on top of the player."""
+        # Find the direction to the player, with y pointing up
+        dx = float(px) - x
+        dy = float(y) - py
+        distance = math.sqrt(dx * dx + dy * dy)
+        if distance:
+            self.__dx = dx / distance
+            self.__dy = dy / distance
                                                                             
     def update(self):
         """This method will be called automatically to reposition the
-        missile on the screen.""" 
+        missile on the screen. Missiles steered by the guidance are moved
+        there instead.""" 
+        if self.__guidance is not None:
+            return
         # Times when missile should die off
-        if pygame.time.get_ticks() - self.__init_time > 2800:
+        if runtime.get_ticks() - self.__init_time > 2800:
             self.__dx = 0
             self.__dy = -1
-        # If missile has time, find angle between player, and move rect
+        # If missile has time, find direction to the player, and move rect
         else:  
             self.find_direction(self.__player_x, self.__player_y, self.__x, self.__y)    
-            self.change_angle(self.__angle)    
-        self.__x += self.__dx * self.__speed
-        self.__y -= self.__dy * self.__speed  
+            rotations = self.__kind.image
+            index = rotations.find_index(self.__dx, self.__dy)
+            self.image = rotations.get_frame(index)
+            self.rect = rotations.get_rect(index * rotations.get_step(), self.rect.center)
+        self.__x += self.__dx * self.__kind.speed
+        self.__y -= self.__dy * self.__kind.speed  
         self.rect.center = (self.__x, self.__y)
         # If missile offscreen, kill sprite
-        if self.rect.centerx < - 125 or self.rect.centerx > self.__screen.get_width() + 125:
+        screen = self.__kind.screen
+        if self.rect.centerx < - 125 or self.rect.centerx > screen.get_width() + 125:
             self.kill()
-        elif self.rect.centery > self.__screen.get_height() - 50:
+        elif self.rect.centery > screen.get_height() - 50:
             self.__exploding = True     
             
                        
-class Enemy(pygame.sprite.Sprite):
+# Names of the values in each kind of enemy's STATS, in the order they are
+# given to Enemy.__init__()
+ENEMY_STATS = ("image", "speed", "health", "ammo", "cooldown", "bullet_image", "bullet_speed", \
+               "bullet_angle", "points", "bullet_damage", "bullet_points", "bullet_death", "bullet_frames")
+
+class Enemy(pygame.sprite.DirtySprite):
     """This class defines the sprite for all the enemies."""
+    __slots__ = ("kind", "screen", "direction", "x", "y", "health", "ammo", "init_time", "shooting", \
+                 "bullet_angle", "player_x", "player_y")
+    
     def __init__(self, screen, img, spd, hp, ammo, cooldown, bulletimg, bulletspd, \
                  bulletangle, points, bulletdmg, bulletpoints, bulletdeath, bulletframes):
         """This initializer takes a screen surface, image name, values for
@@ -338,46 +484,42 @@ class Enemy(pygame.sprite.Sprite):
         attributes, x and y coordinates, direction, shooting states, and ammo 
         for the enemy sprite."""       
         # Call the parent __init__() method
-        pygame.sprite.Sprite.__init__(self)
+        pygame.sprite.DirtySprite.__init__(self)
+        # Redraw the sprite on every frame
+        self.dirty = 2
+        
+        # Share the values of every enemy of this kind, and of its bullets
+        bullet = get_archetype(Archetype, bulletimg, bulletspd, screen, bulletdmg, bulletpoints, \
+                               bulletdeath, bulletframes, 0)
+        self.kind = get_archetype(EnemyArchetype, img, spd, hp, ammo, cooldown, points, bullet)
         
         # Define the image attributes for the enemy.
-        self.image = pygame.image.load(img)
-        self.image.set_colorkey((255,255,255))
-        self.image = self.image.convert()         
+        self.image = assets.images.load(img, assets.WHITE)
         self.rect = self.image.get_rect()
        
         # Save the screen
         self.screen = screen
         
         # Set random altitude and direction
-        self.direction = random.randrange(-1, 2)
+        self.direction = runtime.rng.randrange(-1, 2)
         while self.direction == 0:
-            self.direction = random.randrange(-1, 2)
+            self.direction = runtime.rng.randrange(-1, 2)
              
         if self.direction < 0:
             self.x = self.screen.get_width() + 100
-            self.image = pygame.transform.flip(self.image, True, False)
+            self.image = assets.images.flipped(img, assets.WHITE)
         else:
             self.x = -100           
-        self.y = random.randrange(92, 226)
+        self.y = runtime.rng.randrange(92, 226)
         
-        # Set speed, health, ammo, cooldown and points
-        self.speed = spd
+        # Set health, ammo and cooldown timer
         self.health = hp
         self.ammo = ammo
         self.init_time = 0
-        self.cooldown = cooldown
-        self.points = points
         
-        # Set gun and bullet information, track if sprite is shooting
+        # Set the angle of the gun, track if sprite is shooting
         self.shooting = False
-        self.bullet_image = bulletimg
-        self.bullet_speed = bulletspd
         self.bullet_angle = bulletangle
-        self.bullet_death = bulletdeath
-        self.bullet_frames = bulletframes
-        self.bullet_points = bulletpoints
-        self.bullet_damage = bulletdmg
         
     def store_player_xy(self, x, y):
         """This method accepts players coordinates a parameters and stores 
@@ -395,13 +537,14 @@ class Enemy(pygame.sprite.Sprite):
         information for sprite."""
         self.ammo -= 1
         self.shooting = False
-        return Bullet(self.bullet_image, self.rect.centerx, self.rect.centery, self.bullet_angle, \
-                      self.bullet_speed, self.screen, self.bullet_damage, self.bullet_points, self.bullet_death, self.bullet_frames)     
+        bullet = self.kind.bullet
+        return bullet_pool.acquire(bullet.image, self.rect.centerx, self.rect.centery, self.bullet_angle, \
+                                   bullet.speed, self.screen, bullet.damage, bullet.points, bullet.death, bullet.frames)     
     
     def get_points(self):
         """This method accepts no parameters, and returns the points from
         sprite."""
-        return self.points
+        return self.kind.points
     
     def take_damage(self, amount):
         """This method accepts the amount of damage as parameters, and 
@@ -415,26 +558,29 @@ class Enemy(pygame.sprite.Sprite):
                 
 class Enemy_Jet(Enemy):
     """This class defines the sprite for the enemy jets."""
+    __slots__ = ()
+    STATS = ("./pictures/enemies/enemy_jet.gif",10,10,1, 0, \
+             "./pictures/bullet/bomb.gif",5,-90, 200, 30, 20,"drop",23)
+    
     def __init__(self, screen):
         """This initializer takes a screen surface as parameters. Initializes
         the Enemy class."""
-        Enemy.__init__(self, screen,"./pictures/enemies/enemy_jet.gif",10,10,1,\
-                       0,"./pictures/bullet/bomb.gif",5,-90, 200, 30, 20,"drop",23)
+        Enemy.__init__(self, screen, *self.STATS)
                         
     def update(self):
         """This method will be called automatically to reposition the
         sprite on the screen.""" 
         #MOVE SPRITE
-        self.x += (self.direction * self.speed)
+        self.x += (self.direction * self.kind.speed)
         self.rect.center = (self.x, self.y)
         
         #CHECK SHOOTING
         if self.rect.centerx > self.player_x - 25 and self.rect.centerx < \
            self.player_x + 25 and self.ammo > 0:
             #Adjust shooting based on cooldown
-            if (pygame.time.get_ticks() - self.init_time) > self.cooldown:
+            if (runtime.get_ticks() - self.init_time) > self.kind.cooldown:
                 self.shooting = True
-                self.init_time = pygame.time.get_ticks()
+                self.init_time = runtime.get_ticks()
          
         #CHECK IF SPRITE OFFSCREEN
         if self.rect.centerx > self.screen.get_width() + 100 or self.rect.centerx < -100:
@@ -442,11 +588,14 @@ class Enemy_Jet(Enemy):
             
 class Enemy_Chopper(Enemy):
     """This class defines the sprite for the enemy choppers."""
+    __slots__ = ()
+    STATS = ("./pictures/enemies/enemy_chopper.gif", 6,50,5,40, \
+             "./pictures/bullet/bullet.gif",7,0, 100, 1,5,"bullet",5)
+    
     def __init__(self, screen):
         """This initializer takes a screen surface as parameters. Initializes
         the Enemy class. Sets angle based on direction of sprite."""
-        Enemy.__init__(self, screen,"./pictures/enemies/enemy_chopper.gif",\
-                       6,50,5,40,"./pictures/bullet/bullet.gif",7,0, 100, 1,5,"bullet",5)
+        Enemy.__init__(self, screen, *self.STATS)
         
         # Adjust the angle of bullets based on direction
         if self.direction == 1:
@@ -458,16 +607,16 @@ class Enemy_Chopper(Enemy):
         """This method will be called automatically to reposition the
         sprite on the screen.""" 
         #MOVE SPRITE
-        self.x += (self.direction * self.speed)
+        self.x += (self.direction * self.kind.speed)
         self.rect.center = (self.x, self.y)
         
         #CHECK SHOOTING
         if self.rect.centerx > self.player_x - 300 and self.rect.centerx < \
            self.player_x + 300 and self.ammo > 0:
             #Adjust shooting based on cooldown
-            if (pygame.time.get_ticks() - self.init_time) > self.cooldown:
+            if (runtime.get_ticks() - self.init_time) > self.kind.cooldown:
                 self.shooting = True
-                self.init_time = pygame.time.get_ticks()
+                self.init_time = runtime.get_ticks()
          
         #CHECK IF SPRITE OFFSCREEN
         if self.rect.centerx > self.screen.get_width() + 100 or self.rect.centerx < -100:
@@ -475,11 +624,14 @@ class Enemy_Chopper(Enemy):
             
 class Enemy_Hover_Chopper(Enemy):
     """This class defines the sprite for the enemy hovering choppers."""
+    __slots__ = ()
+    STATS = ("./pictures/enemies/enemy_hover_chopper.gif", 7,100,15,40, \
+             "./pictures/bullet/bullet.gif",7,0, 250,2,5,"bullet",5)
+    
     def __init__(self, screen):        
         """This initializer takes a screen surface as parameters. Initializes
         the Enemy class."""
-        Enemy.__init__(self, screen,"./pictures/enemies/enemy_hover_chopper.gif",\
-                       7,100,15,40,"./pictures/bullet/bullet.gif",7,0, 250,2,5,"bullet",5)
+        Enemy.__init__(self, screen, *self.STATS)
         
         # Adjust the angle of bullets based on direction
         if self.direction == -1:
@@ -494,8 +646,9 @@ class Enemy_Hover_Chopper(Enemy):
         self.bullet_angle += 10 * self.direction
         if self.ammo < 0:
             self.shooting = False
-        return Bullet(self.bullet_image, self.rect.centerx, self.rect.centery, self.bullet_angle, \
-                      self.bullet_speed, self.screen, self.bullet_damage, self.bullet_points, self.bullet_death, self.bullet_frames)     
+        bullet = self.kind.bullet
+        return bullet_pool.acquire(bullet.image, self.rect.centerx, self.rect.centery, self.bullet_angle, \
+                                   bullet.speed, self.screen, bullet.damage, bullet.points, bullet.death, bullet.frames)     
            
     def update(self):
         """This method will be called automatically to reposition the
@@ -504,7 +657,7 @@ class Enemy_Hover_Chopper(Enemy):
         if self.shooting == True:
             self.rect.center = (self.x, self.y)
         else:
-            self.x += (self.direction * self.speed)
+            self.x += (self.direction * self.kind.speed)
             self.rect.center = (self.x, self.y)
         
         #CHECK SHOOTING
@@ -517,11 +670,14 @@ class Enemy_Hover_Chopper(Enemy):
             
 class Enemy_Helicopter(Enemy):
     """This class defines the sprite for the enemy helicopters."""
+    __slots__ = ()
+    STATS = ("./pictures/enemies/enemy_helicopter.gif", 5,80,2,500, \
+             "./pictures/bullet/homing_missile.gif",5,-90, 300,20,10,"bomb",21)
+    
     def __init__(self, screen):  
         """This initializer takes a screen surface as parameters. Initializes
         the Enemy class."""
-        Enemy.__init__(self, screen,"./pictures/enemies/enemy_helicopter.gif",\
-                       5,80,2,500,"./pictures/bullet/homing_missile.gif",5,-90, 300,20,10,"bomb",21)
+        Enemy.__init__(self, screen, *self.STATS)
                  
     def get_bullet(self):
         """This method accepts no parameters and returns the bullet 
@@ -529,30 +685,31 @@ class Enemy_Helicopter(Enemy):
         self.ammo -= 1
         self.shooting = False
         if self.ammo % 2 == 0:
-            self.__adjust = 15
+            adjust = 15
         else:
-            self.__adjust = -15
-        return Missile(self.screen, self.bullet_image, self.bullet_angle, \
-                       self.bullet_speed, self.rect.centerx + self.__adjust, \
-                       self.rect.centery, self.player_x, self.player_y,\
-                       self.bullet_damage, self.bullet_points, self.bullet_death, self.bullet_frames) 
+            adjust = -15
+        bullet = self.kind.bullet
+        return missile_pool.acquire(self.screen, bullet.image, self.bullet_angle, \
+                                    bullet.speed, self.rect.centerx + adjust, \
+                                    self.rect.centery, self.player_x, self.player_y,\
+                                    bullet.damage, bullet.points, bullet.death, bullet.frames) 
         
     def update(self):
         """This method will be called automatically to reposition the
         sprite on the screen.""" 
         #MOVE SPRITE
         # Pause sprite if shooting, else continue moving
-        if self.shooting == True or pygame.time.get_ticks() - self.init_time < 1000:
+        if self.shooting == True or runtime.get_ticks() - self.init_time < 1000:
             self.rect.center = (self.x, self.y)
         else:
-            self.x += (self.direction * self.speed)
+            self.x += (self.direction * self.kind.speed)
             self.rect.center = (self.x, self.y)
         
         #CHECK SHOOTING
         if self.rect.centerx < self.player_x + 10 and self.rect.centerx > self.player_x - 10 and self.ammo > 0:
-            if (pygame.time.get_ticks() - self.init_time) > self.cooldown:
+            if (runtime.get_ticks() - self.init_time) > self.kind.cooldown:
                 self.shooting = True
-                self.init_time = pygame.time.get_ticks()
+                self.init_time = runtime.get_ticks()
                 
         #CHECK IF SPRITE OFFSCREEN
         if self.rect.centerx > self.screen.get_width() + 100 or self.rect.centerx < -100:                     
@@ -560,11 +717,14 @@ class Enemy_Helicopter(Enemy):
             
 class Enemy_Gunner(Enemy):
     """This class defines the sprite for the enemy gunners."""
+    __slots__ = ()
+    STATS = ("./pictures/enemies/enemy_gunner.gif", 6,100,5,100, \
+             "./pictures/bullet/bullet.gif",10,0, 600,1,5,"bullet",5)
+    
     def __init__(self, screen):       
         """This initializer takes a screen surface as parameters. Initializes
         the Enemy class."""
-        Enemy.__init__(self, screen,"./pictures/enemies/enemy_gunner.gif",\
-                       6,100,5,100,"./pictures/bullet/bullet.gif",10,0, 600,1,5,"bullet",5)
+        Enemy.__init__(self, screen, *self.STATS)
                 
     def find_direction(self, px, py, x, y):
         """This method accepts the player's coordinates and missile's
@@ -574,10 +734,10 @@ class Enemy_Gunner(Enemy):
         # Calculate angle using cos, uses distance from the ground and
         # distance from player.
         # Add random factor to shots
-        self.__rand_factor = random.randrange(-1,2)
-        self.__rand_factor *= random.random() * 5
-        self.__distance = math.sqrt((float(x) - px)**2 + (float(py) - y)**2)
-        self.bullet_angle = (math.acos((py - y)/self.__distance) * 180 / math.pi) + self.__rand_factor
+        rand_factor = runtime.rng.randrange(-1,2)
+        rand_factor *= runtime.rng.random() * 5
+        distance = math.sqrt((float(x) - px)**2 + (float(py) - y)**2)
+        self.bullet_angle = (math.acos((py - y)/distance) * 180 / math.pi) + rand_factor
         if px < x:
             self.bullet_angle = -90 - self.bullet_angle
         elif px > x:
@@ -591,64 +751,89 @@ class Enemy_Gunner(Enemy):
         # Find direction of player
         self.find_direction(self.player_x, self.player_y, self.x, self.y)
         # Pause sprite if shooting, else continue moving
-        if self.shooting == True or pygame.time.get_ticks() - self.init_time < 1000:           
+        if self.shooting == True or runtime.get_ticks() - self.init_time < 1000:           
             self.rect.center = (self.x, self.y)
         else:
-            self.x += (self.direction * self.speed)
+            self.x += (self.direction * self.kind.speed)
             self.rect.center = (self.x, self.y)
         
         #CHECK SHOOTING
         if self.rect.centerx > 50 and self.rect.centerx < self.screen.get_width() - 50 and self.ammo > 0:
-            if (pygame.time.get_ticks() - self.init_time) > self.cooldown:
+            if (runtime.get_ticks() - self.init_time) > self.kind.cooldown:
                 self.shooting = True
-                self.init_time = pygame.time.get_ticks()
+                self.init_time = runtime.get_ticks()
                 
         #CHECK IF SPRITE OFFSCREEN
         if self.rect.centerx > self.screen.get_width() + 100 or self.rect.centerx < -100:                     
             self.kill()   
          
-class Explosion(pygame.sprite.Sprite):
+class Explosion(pools.Pooled, pygame.sprite.DirtySprite):
     """This class defines the sprite for explosions."""
+    __slots__ = ("__frames", "__frame")
+    
     def __init__(self, image, number, x, y):
         """This initializer takes a image name, number of frames
         and x and y locations as parameters. Initializes the rect and image
         attributes and store the number of frames for explosion."""       
         # Call the parent __init__() method
-        pygame.sprite.Sprite.__init__(self)
-        
-        # Load first frame and set attributes for rect
-        self.image = pygame.image.load("./pictures/explosion/"+image+"1.gif").convert()
+        pygame.sprite.DirtySprite.__init__(self)
+        self.reset(image, number, x, y)
+        
+    def reset(self, image, number, x, y):
+        """This method accepts the same parameters as the initializer. It sets
+        up the explosion again, so it can be reused from a pool."""
+        # Redraw the sprite on every frame
+        self.dirty = 2
+        
+        # Get the shared frames of the animation and set attributes for rect
+        self.__frames = assets.load_clip(image, number)
+        self.image = self.__frames[0]
         self.rect = self.image.get_rect()
         self.rect.bottom = y
         self.rect.centerx = x
         
-        #Store number of images and pathname
-        self.__image = "./pictures/explosion/"+image
-        self.__frame = 1
-        self.__number = number
+        #Store the current frame
+        self.__frame = 0
 
             
     def update(self):
         """This method will be called automatically to reposition the
         sprite on the screen and change explosion's image.""" 
-        self.__frame += 1
-        if self.__frame < self.__number:
-            self.image = pygame.image.load(self.__image + str(self.__frame)+".gif")
-            self.image = self.image.convert()
+        self.__frame += explosion_step
+        if self.__frame < len(self.__frames):
+            self.image = self.__frames[self.__frame]
         else:
             self.kill()
             
-class StatsKeeper(pygame.sprite.Sprite): 
+class StatsKeeper(pygame.sprite.DirtySprite): 
     """This class defines the sprite for keeping statistics."""
-    def __init__(self): 
-        """This initializer takes no parameters. Initializes the amount of 
-        score, distance, health, armour, and ammo for the player. Also
-        intializes font, and tracks state of the game."""
+    def __init__(self, font, scale = 1): 
+        """This initializer takes the font, already sized for the scale, and
+        the number to scale the display by as parameters. Initializes the
+        amount of score, distance, health, armour, and ammo for the player,
+        and tracks state of the game."""
         # Call the parent __init__() method 
-        pygame.sprite.Sprite.__init__(self) 
+        pygame.sprite.DirtySprite.__init__(self) 
   
-        # Load our custom font and background
-        self.__font = pygame.font.Font("./fonts/digital.TTF", 20)
+        # Keep our custom font and load the background, sized for the scale
+        # so the text is drawn sharp rather than scaled up
+        self.__scale = scale
+        self.__font = font
+        self.__background = assets.images.load("./pictures/background/HUD.gif", assets.MAGENTA)
+        if scale != 1:
+            self.__background = pygame.transform.scale(self.__background, \
+                                                       (self.__background.get_width() * scale, \
+                                                        self.__background.get_height() * scale))
+            self.__background.set_colorkey(assets.MAGENTA)
+        self.image = self.__background.copy()
+        self.rect = self.image.get_rect() 
+        self.rect.left = 0
+        self.rect.top = 0 
+        
+        # Cache the labels and digits, and track what each field shows
+        self.__text = assets.TextCache(self.__font)
+        self.__digits = assets.GlyphAtlas(self.__font, (0,255,0))
+        self.__drawn = {}
                 
         # Set starting game statistics
         self.__score = 0
@@ -709,23 +894,34 @@ class StatsKeeper(pygame.sprite.Sprite):
                                                        
     def update(self): 
         """This method will be called automatically to display  
-        the current statistics at top of window."""       
-        #Create new statskeeper image
-        self.image = pygame.image.load("./pictures/background/HUD.gif")
-        self.image.set_colorkey((255,0,255))
-        self.image = self.image.convert() 
-        self.rect = self.image.get_rect() 
-        self.rect.left = 0
-        self.rect.top = 0 
-        
-        #Blit the messages
-        message = self.__font.render("Score: %i" % (self.__score),1,(0,255,0))
-        message2 = self.__font.render("Distance: " + str(self.__distance) + "KM",1,(0,255,0))
-        message3 = self.__font.render("Health: " + str(self.__health) + "%",1,(0,255,0))
-        message4 = self.__font.render("Armour: " + str(self.__armour) + "%",1,(0,255,0))
-        message5 = self.__font.render("Turret: " + str(self.__turret),1,(0,255,0))
-        self.image.blit(message,(20,10))
-        self.image.blit(message2,(200,10))
-        self.image.blit(message3, (360,10))
-        self.image.blit(message4, (500,10))   
-        self.image.blit(message5, (630,10))  
\ No newline at end of file
+        the current statistics at top of window. Only the fields whose
+        values have changed are drawn again."""       
+        fields = (("Score: ", self.__score, "", 20), \
+                  ("Distance: ", self.__distance, "KM", 200), \
+                  ("Health: ", self.__health, "%", 360), \
+                  ("Armour: ", self.__armour, "%", 500), \
+                  ("Turret: ", self.__turret, "", 630))
+        for label, value, suffix, x in fields:
+            x *= self.__scale
+            drawn = self.__drawn.get(label)
+            if drawn and drawn[0] == value:
+                continue
+            #Erase the old message and blit the new one
+            if drawn:
+                self.image.blit(self.__background, drawn[1], drawn[1])
+            self.__drawn[label] = (value, self.__draw_field(label, value, suffix, x))
+            self.dirty = 1
+            
+    def __draw_field(self, label, value, suffix, x):
+        """This method accepts a label, value, suffix and x coordinate as
+        parameters. It blits the field onto the image and returns its rect."""
+        rect = self.image.blit(self.__text.render(label, (0,255,0)), (x, 10 * self.__scale))
+        rect.union_ip(self.__digits.render_to(self.image, str(value), rect.topright))
+        if suffix:
+            rect.union_ip(self.image.blit(self.__text.render(suffix, (0,255,0)), rect.topright))
+        return rect
+            
+# Pools of the short lived sprites, shared by the whole game
+bullet_pool = pools.SpritePool(Bullet)
+missile_pool = pools.SpritePool(Missile)
+explosion_pool = pools.SpritePool(Explosion)
@@ -0,0 +1,180 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for the game's window. The game is drawn
+at a logical resolution, and the viewport shows it in a window of the same
+size, in a window scaled by the graphics card, or scaled up by a whole
+number in software, with only the parts that changed scaled each frame. The
+heads-up display can be drawn at the window's own resolution, so the world
+can be drawn at a fraction of a large window's size while the text stays
+sharp.
+"""
+import pygame
+
+# Ways of showing the game: a window the size of the game, a window the
+# graphics card scales, or the whole screen
+WINDOW = "window"
+SCALED = "scaled"
+FULLSCREEN = "fullscreen"
+MODES = (WINDOW, SCALED, FULLSCREEN)
+
+# Logical resolution the game's pictures are made for
+SIZE = (800, 600)
+
+# Colour of the borders around a game that does not fill the screen
+BORDER = (0, 0, 0)
+
+class Viewport(object):
+    """This class defines the window the game is shown in, and the surface
+    the game is drawn on. When the window is not the game's size, the game
+    is drawn on its own surface and each changed area is scaled onto the
+    window with the nearest pixels."""
+    def __init__(self, size = SIZE, mode = WINDOW, scale = 1, native_hud = False):
+        """This initializer takes the logical resolution, the way of showing
+        the game, the whole number to scale a window by and whether to draw
+        the heads-up display at the window's resolution as parameters. It
+        makes the window. A fullscreen game is scaled by the largest whole
+        number that fits the screen, and a game the graphics card scales is
+        never scaled in software."""
+        if mode == SCALED:
+            self.__display = pygame.display.set_mode(size, pygame.SCALED)
+            scale = 1
+        elif mode == FULLSCREEN:
+            self.__display = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+            width, height = self.__display.get_size()
+            scale = max(1, min(width // size[0], height // size[1]))
+        else:
+            self.__display = pygame.display.set_mode((size[0] * scale, size[1] * scale))
+        self.scale = scale
+
+        # Draw straight onto the window when it is the game's size
+        self.__direct = self.__display.get_size() == tuple(size)
+        if self.__direct:
+            self.screen = self.__display
+        else:
+            self.screen = pygame.Surface(size).convert(self.__display)
+            self.__display.fill(BORDER)
+        width, height = self.__display.get_size()
+        self.__area = pygame.Rect((width - size[0] * scale) // 2, (height - size[1] * scale) // 2, \
+                                  size[0] * scale, size[1] * scale)
+
+        # Sprites of the heads-up display, drawn at the window's resolution
+        self.hud_scale = 1
+        if native_hud and not self.__direct:
+            self.hud_scale = scale
+        self.__hud = []
+
+    def flip(self):
+        """This method accepts no parameters, and shows the whole game."""
+        if self.__direct:
+            pygame.display.flip()
+            return
+        self.__scale_area(self.screen.get_rect())
+        self.__draw_hud([self.__area])
+        pygame.display.flip()
+
+    def update(self, rects):
+        """This method accepts a list of rects of the game as a parameter, and
+        shows the parts of the game inside them."""
+        if self.__direct:
+            pygame.display.update(rects)
+            return
+        changed = []
+        for rect in rects:
+            area = self.__scale_area(rect)
+            if area.width and area.height:
+                changed.append(area)
+        changed.extend(self.__draw_hud(changed))
+        pygame.display.update(changed)
+
+    def to_logical(self, position):
+        """This method accepts a position in the window as a parameter, and
+        returns the position in the game."""
+        return ((position[0] - self.__area.left) // self.scale, (position[1] - self.__area.top) // self.scale)
+
+    def add_hud(self, *sprites):
+        """This method accepts sprites as parameters. They are drawn over the
+        game at the window's resolution, their rects measured from the top
+        left of the game."""
+        self.__hud.extend(sprites)
+
+    def clear_hud(self):
+        """This method accepts no parameters, and stops drawing the heads-up
+        display's sprites."""
+        self.__hud = []
+
+    def __scale_area(self, rect):
+        """This method accepts a rect of the game as a parameter. It scales
+        that part of the game onto the window, and returns the rect of the
+        window it covers."""
+        rect = rect.clip(self.screen.get_rect())
+        scale = self.scale
+        area = pygame.Rect(self.__area.left + rect.left * scale, self.__area.top + rect.top * scale, \
+                           rect.width * scale, rect.height * scale)
+        if rect.width and rect.height:
+            if scale == 1:
+                self.__display.blit(self.screen, area, rect)
+            else:
+                pygame.transform.scale(self.screen.subsurface(rect), area.size, self.__display.subsurface(area))
+        return area
+
+    def __draw_hud(self, changed):
+        """This method accepts the rects of the window that were drawn as a
+        parameter. It draws the heads-up display's sprites that changed or
+        were drawn over, and returns the rects of the window they cover."""
+        drawn = []
+        for sprite in self.__hud:
+            area = sprite.rect.move(self.__area.topleft)
+            if sprite.dirty or area.collidelist(changed) != -1:
+                self.__display.blit(sprite.image, area)
+                if sprite.dirty == 1:
+                    sprite.dirty = 0
+                drawn.append(area)
+        return drawn
+
+# The viewport the game is shown in, made by configure()
+current = None
+
+def configure(size = SIZE, mode = WINDOW, scale = 1, native_hud = False):
+    """This function takes the logical resolution, the way of showing the
+    game, the whole number to scale a window by and whether to draw the
+    heads-up display at the window's resolution as parameters. It makes the
+    viewport, and returns the surface the game is drawn on."""
+    global current
+    current = Viewport(size, mode, scale, native_hud)
+    return current.screen
+
+def flip():
+    """This function takes no parameters, and shows the whole game."""
+    if current is None:
+        pygame.display.flip()
+    else:
+        current.flip()
+
+def update(rects):
+    """This function takes a list of rects of the game as a parameter, and
+    shows the parts of the game inside them."""
+    if current is None:
+        pygame.display.update(rects)
+    else:
+        current.update(rects)
+
+def to_logical(position):
+    """This function takes a position in the window as a parameter, and
+    returns the position in the game."""
+    if current is None:
+        return position
+    return current.to_logical(position)
+
+def get_hud_scale():
+    """This function takes no parameters, and returns the number the heads-up
+    display is scaled by to draw it at the window's resolution."""
+    if current is None:
+        return 1
+    return current.hud_scale
+
+def clear_hud():
+    """This function takes no parameters, and stops drawing the heads-up
+    display's sprites."""
+    if current is not None:
+        current.clear_hud()
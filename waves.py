@@ -0,0 +1,101 @@
+"""
+Author: Kent Chow
+Date: June 6, 2012
+Description: This is the module for spawning enemies. The waves of enemies
+are read from a data file keyed on the distance left to travel. Enemies are
+spawned a few at a time over many ticks, and the number alive of each kind
+and in total is capped, so late waves cannot grow without limit.
+"""
+import json
+import sprites
+
+# The file the waves are read from
+WAVES = "./data/waves.json"
+
+# Names of the enemies used in the waves file
+ENEMIES = {"jet": sprites.Enemy_Jet, "chopper": sprites.Enemy_Chopper, \
+           "hover_chopper": sprites.Enemy_Hover_Chopper, "helicopter": sprites.Enemy_Helicopter, \
+           "gunner": sprites.Enemy_Gunner}
+
+# Order enemies are spawned in when a wave does not give one
+MIX = ("jet", "chopper", "hover_chopper", "helicopter", "gunner")
+
+def load(filename = WAVES):
+    """This function takes the name of a waves file as a parameter, and
+    returns the settings and waves in it."""
+    with open(filename) as waves_file:
+        return json.load(waves_file)
+
+class WaveScheduler(object):
+    """This class defines the scheduler that decides when to spawn enemies
+    and which kind to spawn. Each wave gives the number of enemies to keep
+    alive from its distance onwards, and the order their kinds are spawned
+    in."""
+    def __init__(self, screen, settings):
+        """This initializer takes the screen and the settings read from a
+        waves file as parameters. The settings hold the waves, the most
+        enemies alive of each kind and in total, the most enemies spawned in
+        one tick and the ticks to wait between spawns."""
+        self.__screen = screen
+        self.__waves = sorted(settings["waves"], key = lambda wave: wave["distance"])
+        self.__total = settings.get("total", 30)
+        self.__caps = settings.get("caps", {})
+        self.__per_tick = settings.get("per_tick", 1)
+        self.__interval = settings.get("interval", 1)
+        self.__wait = 0
+        self.__turn = 0
+
+        # Counters used to check the caps are working
+        self.spawned = 0
+        self.held_back = 0
+
+    def get_wave(self, distance):
+        """This method accepts the distance left as a parameter, and returns
+        the wave for it, or None before the first wave starts."""
+        for wave in self.__waves:
+            if distance <= wave["distance"]:
+                return wave
+        return None
+
+    def set_total(self, total):
+        """This method accepts the most enemies alive at once as a parameter,
+        and stores it."""
+        self.__total = total
+
+    def update(self, distance, enemies):
+        """This method accepts the distance left and the group of enemies as
+        parameters. It returns a list of the enemies to spawn this tick, which
+        is usually empty."""
+        wave = self.get_wave(distance)
+        if wave is None:
+            return []
+        if self.__wait > 0:
+            self.__wait -= 1
+            return []
+        wanted = min(wave["target"], self.__total) - len(enemies)
+        if wanted <= 0:
+            return []
+
+        # Count the enemies alive of each kind
+        alive = {}
+        for enemy in enemies:
+            alive[type(enemy)] = alive.get(type(enemy), 0) + 1
+
+        # Take the kinds in the wave's order, skipping kinds at their cap
+        mix = wave.get("mix", MIX)
+        spawned = []
+        for attempt in range(len(mix)):
+            if len(spawned) >= min(wanted, self.__per_tick):
+                break
+            name = mix[self.__turn % len(mix)]
+            self.__turn += 1
+            enemy_class = ENEMIES[name]
+            if alive.get(enemy_class, 0) >= self.__caps.get(name, self.__total):
+                self.held_back += 1
+                continue
+            alive[enemy_class] = alive.get(enemy_class, 0) + 1
+            spawned.append(enemy_class(self.__screen))
+        self.spawned += len(spawned)
+        if spawned:
+            self.__wait = wave.get("interval", self.__interval)
+        return spawned